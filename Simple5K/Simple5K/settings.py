@@ -101,6 +101,38 @@ DATABASES = {
     }
 }
 
+# SQLite race-day mode for laptop deployments: WAL so readers never block the writer,
+# synchronous=NORMAL (one fsync per checkpoint, not per commit), a long busy timeout and
+# IMMEDIATE transactions; lap and runner writes also go through one writer at a time
+# (tracker.sqlite_writer).
+SQLITE_RACE_DAY = _db_engine == 'sqlite3' and os.environ.get('SQLITE_RACE_DAY', 'FALSE').upper() in ('1', 'TRUE', 'YES')
+if SQLITE_RACE_DAY:
+    DATABASES['default']['OPTIONS'] = {
+        'timeout': 30,
+        'transaction_mode': 'IMMEDIATE',
+        'init_command': (
+            'PRAGMA journal_mode=WAL; PRAGMA synchronous=NORMAL; PRAGMA busy_timeout=30000; '
+            'PRAGMA temp_store=MEMORY; PRAGMA cache_size=-20000'
+        ),
+    }
+
+# Optional read replica for public pages (tracker.db_router). Set DATABASE_REPLICA_HOST to
+# enable; the other replica settings default to the primary's.
+if os.environ.get('DATABASE_REPLICA_HOST'):
+    DATABASES['replica'] = {
+        'ENGINE': f'django.db.backends.{_db_engine}',
+        'NAME': os.environ.get('DATABASE_REPLICA_NAME', DATABASES['default']['NAME']),
+        'USER': os.environ.get('DATABASE_REPLICA_USERNAME', DATABASES['default']['USER']),
+        'PASSWORD': os.environ.get('DATABASE_REPLICA_PASSWORD', DATABASES['default']['PASSWORD']),
+        'HOST': os.environ.get('DATABASE_REPLICA_HOST'),
+        'PORT': os.environ.get('DATABASE_REPLICA_PORT', DATABASES['default']['PORT']),
+        'TEST': {'MIRROR': 'default'},
+    }
+    DATABASE_ROUTERS = ['tracker.db_router.ReplicaRouter']
+    MIDDLEWARE.append('tracker.db_router.ReplicaPinMiddleware')
+# After a write, the client reads from the primary for this long; set above the replica's usual lag
+DATABASE_REPLICA_PIN_SECONDS = int(os.environ.get('DATABASE_REPLICA_PIN_SECONDS', '10'))
+
 
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
@@ -121,9 +153,19 @@ AUTH_PASSWORD_VALIDATORS = [
 ]
 
 # Login rate limiting (accounts.views) requires a real cache; DummyCache does not persist.
-# In production set CACHE_BACKEND=locmem (single process) or use Redis/database cache.
+# In production set CACHE_BACKEND=sqlite (shared by all processes on the host, no extra
+# service), locmem (single process only) or configure Redis here.
 _cache_backend = os.environ.get('CACHE_BACKEND', 'dummy').lower()
-if _cache_backend == 'locmem':
+if _cache_backend == 'sqlite':
+    CACHES = {
+        'default': {
+            'BACKEND': 'tracker.sqlite_cache.SQLiteCache',
+            'LOCATION': os.environ.get('SHARED_CACHE_PATH', os.path.join(BASE_DIR, 'cache', 'shared.sqlite3')),
+            'TIMEOUT': 60,
+            'OPTIONS': {'MAX_ENTRIES': 20000},
+        }
+    }
+elif _cache_backend == 'locmem':
     CACHES = {
         'default': {
             'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
@@ -137,6 +179,14 @@ else:
             'TIMEOUT': 60,
         }
     }
+# Rendered runner report PDFs (pre-rendered when a runner finishes). File-based so every
+# gunicorn worker shares the same entries without an external cache service.
+CACHES['reports'] = {
+    'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+    'LOCATION': os.environ.get('REPORT_CACHE_DIR', os.path.join(BASE_DIR, 'cache', 'reports')),
+    'TIMEOUT': 7 * 24 * 3600,
+    'OPTIONS': {'MAX_ENTRIES': 5000},
+}
 
 # Internationalization
 # https://docs.djangoproject.com/en/4.2/topics/i18n/
@@ -188,10 +238,20 @@ CAPTCHA_FONT_SIZE = 45
 EMAIL_BACKEND = 'django.core.mail.backends.smtp.EmailBackend'
 EMAIL_HOST = os.environ.get('SMTP_HOST', 'smtp.office365.com')
 EMAIL_PORT = os.environ.get('SMTP_PORT', 587)
-EMAIL_USE_TLS = True
+# Set EMAIL_USE_TLS=FALSE only for a local test server such as `manage.py smtp_sink`
+EMAIL_USE_TLS = os.environ.get('EMAIL_USE_TLS', 'TRUE').upper() in ('1', 'TRUE', 'YES')
 EMAIL_HOST_USER = os.environ.get('EMAIL_HOST_USER')  # Your Microsoft 365 email address
 EMAIL_HOST_PASSWORD = os.environ.get('EMAIL_HOST_PASSWORD')  # Your Microsoft 365 password or app password
 DEFAULT_FROM_EMAIL = os.environ.get('DEFAULT_FROM_EMAIL')  # The email address you want to send from
+# Run the background email / signup confirmation loops inside web processes. Set to FALSE
+# and run `python manage.py run_workers` as one dedicated process to keep web workers lean.
+# Either way a database lease ensures only one instance of each loop is active.
+RUN_WORKERS_IN_WEB = os.environ.get('RUN_WORKERS_IN_WEB', 'TRUE').upper() in ('1', 'TRUE', 'YES')
+# Local UDP port (and the one after it) used to wake background workers immediately when
+# work is queued. Not used with PostgreSQL, which wakes them with LISTEN/NOTIFY.
+WORKER_WAKEUP_PORT = int(os.environ.get('WORKER_WAKEUP_PORT', 47651))
+# Cap on outgoing messages per minute across ALL processes (shared token bucket in the database).
+EMAIL_MAX_PER_MINUTE = int(os.environ.get('EMAIL_MAX_PER_MINUTE', 30))
 
 # Production security when behind HTTPS (e.g. nginx with SSL). Set SECURE_HTTPS=1 in env.
 # SECURE_SSL_REDIRECT is False so Django does not redirect (avoids "too many redirects" when
@@ -33,8 +33,11 @@ def _record_login_failure(request):
     ip = _get_client_ip(request)
     key = _login_rate_limit_key(ip)
     try:
-        count = cache.get(key, 0) + 1
-        cache.set(key, count, LOGIN_RATE_LIMIT_WINDOW)
+        # add() then incr() so failures hitting different workers at once are all counted
+        # (atomic on shared backends); touch() keeps the window sliding from the last failure
+        if not cache.add(key, 1, LOGIN_RATE_LIMIT_WINDOW):
+            cache.incr(key)
+            cache.touch(key, LOGIN_RATE_LIMIT_WINDOW)
     except Exception:
         pass
 
@@ -56,9 +59,11 @@ def register_view(request):
 def login_view(request):
     if request.method == "POST":
         if _is_login_blocked(request):
-            form = AuthenticationForm(request)
-            form.add_error(None, 'Too many failed login attempts. Please try again in 15 minutes.')
-            return render(request, "accounts/login.html", {"form": form})
+            # Unbound form: add_error() needs cleaned_data, so pass the message separately
+            return render(request, "accounts/login.html", {
+                "form": AuthenticationForm(request),
+                "error": 'Too many failed login attempts. Please try again in 15 minutes.',
+            })
         form = AuthenticationForm(request, data=request.POST)
         if form.is_valid():
             _clear_login_failures(request)
@@ -1,4 +1,9 @@
 #!/bin/sh
 python manage.py migrate
 python manage.py collectstatic --noinput
+# With RUN_WORKERS_IN_WEB=FALSE, background email loops run in one dedicated process
+case "$(echo "${RUN_WORKERS_IN_WEB:-TRUE}" | tr '[:lower:]' '[:upper:]')" in
+  1|TRUE|YES) ;;
+  *) python manage.py run_workers & ;;
+esac
 gunicorn Simple5K.wsgi --bind 0.0.0.0:8000 --timeout 60 --workers=8 --threads=2 --error-logfile "-" --access-logfile "-" --capture-output --log-level info
\ No newline at end of file
@@ -1,21 +1,28 @@
 from datetime import timedelta
 
-from django.contrib import admin
-from .models import race, runners, laps, Banner, ApiKey, RfidTag, SiteSettings, EmailSendJob
+from django.contrib import admin, messages
+from .lap_archive import runner_laps
+from .models import race, runners, laps, LapArchive, Banner, ApiKey, RfidTag, SiteSettings, EmailSendJob, EmailDelivery
 
 @admin.register(ApiKey)
 class ApiKeyAdmin(admin.ModelAdmin):
     list_display = ('name', 'key_masked', 'created_at', 'is_active')
     list_filter = ('is_active',)
-    search_fields = ('name',)
-    readonly_fields = ('created_at', 'key')
-    fields = ('name', 'key', 'created_at', 'is_active')
+    search_fields = ('name', 'key_prefix')
+    readonly_fields = ('created_at', 'key_masked')
+    fields = ('name', 'key_masked', 'created_at', 'is_active')
 
     @admin.display(description='Key')
     def key_masked(self, obj):
-        if not obj.key:
+        if not obj.key_prefix:
             return '—'
-        return obj.key[:10] + '…' if len(obj.key) > 10 else obj.key
+        return obj.key_prefix + '…'
+
+    def save_model(self, request, obj, form, change):
+        super().save_model(request, obj, form, change)
+        if not change:
+            # Only the digest is stored, so this is the one chance to see the key
+            messages.warning(request, f'API key for "{obj.name}": {obj.key} — copy it now, it will not be shown again.')
 
 
 @admin.register(RfidTag)
@@ -63,22 +70,19 @@ def _recompute_runner_times_from_laps(runner_obj):
     race_obj = runner_obj.race
     if not race_obj.start_time:
         return False
-    final_lap = (
-        laps.objects.filter(
-            runner=runner_obj,
-            attach_to_race=race_obj,
-            lap=race_obj.laps_count,
-        ).first()
-    )
+    # Through lap_archive, so runners of races whose laps were archived are recomputed too
+    by_lap = {}
+    for lap in runner_laps(runner_obj):
+        if lap.attach_to_race_id == race_obj.pk:
+            by_lap.setdefault(lap.lap, lap)
+    final_lap = by_lap.get(race_obj.laps_count)
     if not final_lap:
         return False
     finish_time = final_lap.time
     # Gun time
     runner_obj.total_race_time = finish_time - race_obj.start_time
     # Chip time
-    lap0 = laps.objects.filter(
-        runner=runner_obj, attach_to_race=race_obj, lap=0
-    ).first()
+    lap0 = by_lap.get(0)
     chip_start = lap0.time if lap0 else race_obj.start_time
     runner_obj.chip_time = finish_time - chip_start
     # Avg speed (mph) and pace (sec/mile): use chip time when available (runner's actual time over distance)
@@ -180,6 +184,19 @@ class LapsAdmin(admin.ModelAdmin):
     fields = ('runner', 'attach_to_race', 'lap', 'time', 'duration', 'average_speed', 'average_pace')
 
 
+
+@admin.register(LapArchive)
+class LapArchiveAdmin(admin.ModelAdmin):
+    """Read-only: archives are written by the archive_laps and restore_laps commands."""
+    list_display = ('race', 'lap_count', 'archived_at')
+    fields = ('race', 'lap_count', 'archived_at')
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
 @admin.register(SiteSettings)
 class SiteSettingsAdmin(admin.ModelAdmin):
     list_display = (
@@ -223,3 +240,12 @@ class EmailSendJobAdmin(admin.ModelAdmin):
             error_message='Reset: job was stuck in Sending. Re-send from the email page if needed.',
         )
         self.message_user(request, f'Reset {count} stuck job(s) to Failed.')
+
+
+@admin.register(EmailDelivery)
+class EmailDeliveryAdmin(admin.ModelAdmin):
+    list_display = ('id', 'job', 'email', 'status', 'attempts', 'next_attempt_at', 'sent_at')
+    list_filter = ('status',)
+    search_fields = ('email', 'job__subject')
+    raw_id_fields = ('job', 'runner')
+    readonly_fields = ('sent_at', 'last_error')
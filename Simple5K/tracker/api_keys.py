@@ -0,0 +1,83 @@
+"""
+API key verification from a per-process set of active key digests, so authenticating a
+timing request is a hash and a set lookup instead of a query.
+
+The set is reloaded when a key is saved or deleted in this process (signals), when another
+process bumps the version number in the shared cache (CACHE_BACKEND), and in any case after
+LOCAL_TTL_SECONDS. A deactivated or deleted key is therefore refused at once by every process
+on a shared cache, and within LOCAL_TTL_SECONDS otherwise.
+"""
+import logging
+import threading
+import time
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import ApiKey, api_key_digest
+
+logger = logging.getLogger(__name__)
+
+# Shared-cache key holding the API key version
+VERSION_KEY = 'tracker:api_key_version'
+
+# Upper bound on how long a revoked key keeps working when the version bump is not shared
+LOCAL_TTL_SECONDS = 30
+
+_lock = threading.Lock()
+_state = {'version': None, 'loaded_at': 0.0, 'digests': None}
+
+
+def _shared_version():
+    try:
+        return cache.get(VERSION_KEY)
+    except Exception:
+        logger.warning('Could not read API key version from the cache', exc_info=True)
+        return None
+
+
+def _active_digests():
+    version = _shared_version()
+    with _lock:
+        if (_state['digests'] is None or version != _state['version']
+                or time.monotonic() - _state['loaded_at'] > LOCAL_TTL_SECONDS):
+            # Version and time are taken before the query, so a change during it reloads again
+            _state.update(version=version, loaded_at=time.monotonic(), digests=None)
+        digests = _state['digests']
+    if digests is None:
+        digests = frozenset(ApiKey.objects.filter(is_active=True).values_list('key_digest', flat=True))
+        with _lock:
+            if _state['version'] == version:
+                _state['digests'] = digests
+    return digests
+
+
+def is_valid_api_key(key):
+    """True if key (plaintext, from the X-API-Key header) belongs to an active ApiKey."""
+    if not key:
+        return False
+    return api_key_digest(key) in _active_digests()
+
+
+def invalidate():
+    """Drop this process's digests and bump the shared version so other processes reload."""
+    with _lock:
+        _state.update(loaded_at=0.0, digests=None)
+    try:
+        if not cache.add(VERSION_KEY, 1, None):
+            cache.incr(VERSION_KEY)
+    except Exception:
+        logger.warning('Could not bump API key version; other processes refresh within %ss',
+                       LOCAL_TTL_SECONDS, exc_info=True)
+
+
+@receiver(post_save, sender=ApiKey)
+@receiver(post_delete, sender=ApiKey)
+def _api_keys_changed(sender, **kwargs):
+    # Drop the local set now so a revoked key stops working in this process immediately,
+    # and again after commit so no process keeps a set loaded before the change was visible
+    with _lock:
+        _state.update(loaded_at=0.0, digests=None)
+    transaction.on_commit(invalidate)
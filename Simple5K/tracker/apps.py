@@ -11,10 +11,17 @@ class TrackerConfig(AppConfig):
 
     def ready(self):
         import sys
+        from . import api_keys, race_cache, race_stats, site_cache  # noqa: F401  (connect the invalidation signals)
         if 'migrate' in sys.argv or 'makemigrations' in sys.argv:
             return
+        if 'email_benchmark' in sys.argv or 'smtp_sink' in sys.argv:
+            # Mail settings point at a local sink; real queued mail must not go there
+            return
         try:
-            from .email_queue import start_email_worker, start_signup_confirmation_worker
+            from .email_queue import start_email_worker, start_signup_confirmation_worker, web_workers_enabled
+            if not web_workers_enabled():
+                # Workers run in the dedicated `manage.py run_workers` process instead
+                return
             start_email_worker()
             start_signup_confirmation_worker()
         except Exception as e:
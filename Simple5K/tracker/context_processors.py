@@ -1,6 +1,6 @@
 import re
 
-from .models import SiteSettings
+from .site_cache import get_site_settings
 
 
 def _sanitize_css_url(url):
@@ -21,8 +21,9 @@ def _sanitize_css_url(url):
 
 
 def site_settings(request):
-    """Add SiteSettings singleton to template context so all pages can use it (e.g. background image)."""
-    settings_obj = SiteSettings.get_settings()
+    """Add SiteSettings singleton to template context so all pages can use it (e.g. background image).
+    Served from the per-process site cache, so rendering a page does not query it."""
+    settings_obj = get_site_settings()
     url = settings_obj.background_image_url
     # Use absolute URL so images load reliably (navbar logo, CSS background) from any base path or proxy.
     absolute_url = request.build_absolute_uri(url) if url and not url.startswith(('http://', 'https://')) else (url or '')
@@ -0,0 +1,94 @@
+"""
+Optional read replica for public read traffic (DATABASE_REPLICA_* settings).
+
+Only views wrapped in @replica_reads read from the replica, and only for GET/HEAD
+requests; everything else, all writes and the timing API stay on the primary. A client
+that just made a change (any successful POST/PUT/PATCH/DELETE) gets a short-lived cookie
+from ReplicaPinMiddleware and reads from the primary until it expires, so staff and
+runners see their own edits even while the replica lags behind.
+
+Without a replica configured, DATABASES has no REPLICA_ALIAS and everything here is a no-op.
+"""
+import contextvars
+from functools import wraps
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+
+REPLICA_ALIAS = 'replica'
+
+# Set by ReplicaPinMiddleware after a write; while present, reads go to the primary
+PIN_COOKIE = 'read_primary'
+
+_SAFE_METHODS = ('GET', 'HEAD')
+
+_reading_from_replica = contextvars.ContextVar('reading_from_replica', default=False)
+
+
+def replica_configured():
+    return REPLICA_ALIAS in settings.DATABASES
+
+
+def reading_from_replica():
+    """True while the current view's reads are routed to the replica (data may lag)."""
+    return _reading_from_replica.get()
+
+
+def replica_reads(view_func):
+    """Route the view's reads to the replica, unless the request is not GET/HEAD or the
+    client is pinned to the primary after a recent write."""
+    @wraps(view_func)
+    def wrapped_view(request, *args, **kwargs):
+        if (not replica_configured() or request.method not in _SAFE_METHODS
+                or PIN_COOKIE in request.COOKIES):
+            return view_func(request, *args, **kwargs)
+        # Load the session and user (both lazy) from the primary first: a session created
+        # moments ago, at login, may not have reached the replica yet
+        if hasattr(request, 'user'):
+            request.user.is_authenticated  # noqa: B018
+        token = _reading_from_replica.set(True)
+        try:
+            return view_func(request, *args, **kwargs)
+        finally:
+            _reading_from_replica.reset(token)
+    return wrapped_view
+
+
+class ReplicaRouter:
+    """Reads inside @replica_reads go to the replica; all other reads and every write use
+    the primary. Migrations only run on the primary (the replica copies its schema)."""
+
+    def db_for_read(self, model, **hints):
+        if _reading_from_replica.get():
+            return REPLICA_ALIAS
+        return DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Both aliases hold the same data
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == DEFAULT_DB_ALIAS
+
+
+class ReplicaPinMiddleware:
+    """After a successful write request, pin the client to the primary for
+    DATABASE_REPLICA_PIN_SECONDS so their next page views read their own writes."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        if request.method not in _SAFE_METHODS and response.status_code < 400:
+            response.set_cookie(
+                PIN_COOKIE, '1',
+                max_age=settings.DATABASE_REPLICA_PIN_SECONDS,
+                httponly=True,
+                samesite='Lax',
+                secure=request.is_secure(),
+            )
+        return response
@@ -2,99 +2,361 @@
 Background worker that processes EmailSendJob queue: sends one email per runner
 with throttling to stay under Microsoft SMTP limits (~30/min). Each email
 includes an unmonitored-account footer.
+
+Each job has one EmailDelivery row per recipient, created when the job is queued. The
+worker sends them in chunks and records every outcome, retrying failed recipients with
+backoff, so an interrupted or partly failed job resumes without re-mailing anyone.
+
+Every send path (this worker, the signup confirmation worker, signup/payment views
+and the management commands) draws from one token bucket stored in the database
+(EmailSendThrottle), so all processes together stay under the per-minute cap.
 """
 import logging
+import smtplib
 import threading
 import time
 
+from .wakeup import Waiter, notify, CHANNEL_EMAIL_JOBS, CHANNEL_SIGNUP_CONFIRMATIONS
+from .worker_lease import (
+    Lease, LEASE_EMAIL_JOBS, LEASE_SIGNUP_CONFIRMATIONS, LEASE_RENEW_SECONDS, LEASE_STANDBY_POLL_SECONDS,
+)
+
 logger = logging.getLogger(__name__)
 
 # Microsoft 365 SMTP (authenticated) limit is 30 messages per minute.
-# Use 2 seconds between sends to stay safely under that (30/min).
-EMAIL_SEND_INTERVAL_SECONDS = 2
+# Override with settings.EMAIL_MAX_PER_MINUTE.
 MAX_EMAILS_PER_MINUTE = 30
 
+# Token bucket size (burst). The refill rate is (cap - capacity) per minute so that no
+# 60-second window can ever see more than the cap: capacity 1 gives 29/min sustained.
+EMAIL_BUCKET_CAPACITY = 1
+
+# How long a web request waits for a send token before leaving the email to the
+# background worker instead. 0: take a token only if one is free right now, so request
+# threads never wait behind a bulk job or a signup surge.
+EMAIL_REQUEST_TOKEN_TIMEOUT_SECONDS = 0
+
 # SMTP connection timeout (seconds) so we don't hang forever
 EMAIL_TIMEOUT_SECONDS = 60
 
-# Jobs stuck in SENDING longer than this are reset to FAILED (worker may have stopped)
-STUCK_SENDING_MINUTES = 15
+# Messages handed to one open SMTP connection per batch (each still takes a send token).
+EMAIL_BATCH_SIZE = 10
+
+# Transport errors after which SmtpSession reconnects and retries the message once
+_SMTP_RECONNECT_ERRORS = (smtplib.SMTPServerDisconnected, smtplib.SMTPConnectError, ConnectionError, TimeoutError)
+
+# A failed recipient is retried after these delays (seconds), then given up on after
+# EMAIL_DELIVERY_MAX_ATTEMPTS sends in total
+EMAIL_RETRY_BACKOFF_SECONDS = (60, 5 * 60, 30 * 60)
+EMAIL_DELIVERY_MAX_ATTEMPTS = 4
+
+# Jobs in SENDING whose ledger has not moved for this long are resumed (worker may have
+# stopped). Progress is recorded after every message, so an active job never looks stuck.
+STUCK_SENDING_MINUTES = 5
+
+# The stuck-job check runs at most this often
+STUCK_CHECK_INTERVAL_SECONDS = 60
+
+# With nothing queued the email worker sleeps until woken by notify_email_jobs() (or the
+# next retry is due), re-checking the database at least this often in case a wake-up was lost
+EMAIL_WORKER_IDLE_SECONDS = 5 * 60
 
 # Footer appended to every email
 EMAIL_FOOTER = "\n\n---\nThis is an unmonitored email account. Please do not reply."
 
 
-def _process_one_job(job):
-    from django.core.mail import get_connection, EmailMessage
+def _max_emails_per_minute():
+    from django.conf import settings
+
+    return getattr(settings, "EMAIL_MAX_PER_MINUTE", None) or MAX_EMAILS_PER_MINUTE
+
+
+def _try_take_send_token():
+    """One compare-and-swap attempt on the shared bucket. Returns 0 if a token was taken,
+    otherwise the number of seconds to wait before trying again."""
+    from django.db.models import F
+    from django.utils import timezone
+
+    from .models import EmailSendThrottle
+
+    capacity = EMAIL_BUCKET_CAPACITY
+    rate = max(_max_emails_per_minute() - capacity, 1) / 60.0  # tokens per second
+    now = timezone.now()
+    row = EmailSendThrottle.objects.filter(pk=1).values("tokens", "refilled_at", "version").first()
+    if row is None:
+        EmailSendThrottle.objects.get_or_create(pk=1, defaults={"tokens": capacity, "refilled_at": now})
+        return 0.01
+    elapsed = max((now - row["refilled_at"]).total_seconds(), 0.0)
+    tokens = min(capacity, row["tokens"] + elapsed * rate)
+    if tokens < 1:
+        return (1 - tokens) / rate
+    claimed = EmailSendThrottle.objects.filter(pk=1, version=row["version"]).update(
+        tokens=tokens - 1, refilled_at=now, version=F("version") + 1,
+    )
+    # Lost the race to another sender: retry almost immediately with fresh state
+    return 0 if claimed else 0.01
+
+
+def acquire_email_send_token(timeout=None):
+    """Block until the shared bucket grants one send. Returns True, or False if timeout
+    (seconds) would be exceeded first."""
+    deadline = None if timeout is None else time.monotonic() + timeout
+    while True:
+        wait = _try_take_send_token()
+        if wait <= 0:
+            return True
+        if deadline is not None and time.monotonic() + wait > deadline:
+            return False
+        time.sleep(wait)
+
+
+class SmtpSession:
+    """One authenticated SMTP connection reused for many messages (one TCP + STARTTLS +
+    AUTH handshake per job instead of per email). If the server drops the connection or a
+    transport error occurs, the session reconnects and retries that message once.
+    Each message takes a token from the shared send bucket first."""
+
+    def __init__(self):
+        self._conn = None
+        self.handshakes = 0
+
+    def _open(self):
+        from django.core.mail import get_connection
+
+        conn = get_connection(fail_silently=False, timeout=EMAIL_TIMEOUT_SECONDS)
+        conn.open()
+        self._conn = conn
+        self.handshakes += 1
+
+    def close(self):
+        if self._conn is not None:
+            try:
+                self._conn.close()
+            except Exception as e:
+                logger.debug("SMTP close failed: %s", e)
+            self._conn = None
+
+    def send(self, message):
+        """Send one message over the open connection. Raises if it still fails after a reconnect."""
+        acquire_email_send_token()
+        for attempt in (1, 2):
+            if self._conn is None:
+                self._open()
+            try:
+                self._conn.send_messages([message])
+                return
+            except _SMTP_RECONNECT_ERRORS as e:
+                self.close()
+                if attempt == 2:
+                    raise
+                logger.info("SMTP connection lost (%s); reconnecting", e)
+
+    def send_messages(self, messages):
+        """Send a batch over the shared connection. Returns a list of (message, error) pairs;
+        error is None for messages that were accepted."""
+        results = []
+        for message in messages:
+            try:
+                self.send(message)
+                results.append((message, None))
+            except Exception as e:
+                results.append((message, e))
+        return results
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+
+def create_job_deliveries(job):
+    """Create the EmailDelivery ledger for job in bulk: one row per unpaid runner for payment
+    reminders (each gets its own pay link), otherwise one row per distinct address.
+    Returns the number of recipients."""
+    from django.db.models import Min
+
+    from .models import EmailDelivery, runners
+
+    with_email = runners.objects.filter(race_id=job.race_id).exclude(email__isnull=True).exclude(email="")
+    if job.unpaid_reminder:
+        rows = with_email.filter(paid=False).order_by("id").values_list("id", "email")
+    else:
+        rows = with_email.values("email").annotate(runner_id=Min("id")).order_by("runner_id").values_list("runner_id", "email")
+    deliveries = [EmailDelivery(job=job, runner_id=runner_id, email=email) for runner_id, email in rows]
+    EmailDelivery.objects.bulk_create(deliveries, batch_size=500)
+    return len(deliveries)
+
+
+def retry_failed_deliveries(job):
+    """Queue a finished job again for only the recipients that did not get the email."""
+    from .models import EmailDelivery, EmailSendJob
+
+    count = job.deliveries.exclude(status=EmailDelivery.STATUS_SENT).update(
+        status=EmailDelivery.STATUS_PENDING, attempts=0, next_attempt_at=None,
+    )
+    job.status = EmailSendJob.STATUS_QUEUED
+    job.error_message = ""
+    job.save(update_fields=["status", "error_message", "updated_at"])
+    return count
+
+
+def _resume_interrupted_jobs(cutoff):
+    """Requeue jobs left in SENDING by a worker that stopped (restart, crash, lost lease)
+    since cutoff. Their in-flight deliveries go back to pending, so the job resumes with
+    the recipients that were not sent yet."""
+    from .models import EmailDelivery, EmailSendJob
+
+    stuck_ids = list(
+        EmailSendJob.objects.filter(status=EmailSendJob.STATUS_SENDING, updated_at__lt=cutoff)
+        .values_list("id", flat=True)
+    )
+    if not stuck_ids:
+        return
+    EmailDelivery.objects.filter(job_id__in=stuck_ids, status=EmailDelivery.STATUS_SENDING).update(
+        status=EmailDelivery.STATUS_PENDING,
+    )
+    EmailSendJob.objects.filter(id__in=stuck_ids, status=EmailSendJob.STATUS_SENDING).update(
+        status=EmailSendJob.STATUS_QUEUED,
+    )
+    logger.info("Resuming %d interrupted email job(s): %s", len(stuck_ids), stuck_ids)
+
+
+def _due_deliveries(now):
+    from django.db.models import Q
+
+    from .models import EmailDelivery
+
+    return EmailDelivery.objects.filter(status=EmailDelivery.STATUS_PENDING).filter(
+        Q(next_attempt_at__isnull=True) | Q(next_attempt_at__lte=now)
+    )
+
+
+def _claim_delivery_chunk(job):
+    """Mark the next EMAIL_BATCH_SIZE due recipients of job as SENDING and return them."""
+    from django.utils import timezone
+
+    from .models import EmailDelivery
+
+    chunk = list(
+        _due_deliveries(timezone.now()).filter(job=job)
+        .select_related("runner__race")
+        .order_by("id")[:EMAIL_BATCH_SIZE]
+    )
+    if chunk:
+        EmailDelivery.objects.filter(id__in=[d.id for d in chunk]).update(status=EmailDelivery.STATUS_SENDING)
+    return chunk
+
+
+def _record_delivery_result(job, delivery, error):
+    """Store the outcome of one send; failures are retried with backoff until
+    EMAIL_DELIVERY_MAX_ATTEMPTS. Also refreshes job.updated_at so a long job in progress is
+    not mistaken for a stuck one."""
+    from datetime import timedelta
+
+    from django.utils import timezone
+
+    from .models import EmailDelivery, EmailSendJob
+
+    now = timezone.now()
+    attempts = delivery.attempts + 1
+    if error is None:
+        EmailDelivery.objects.filter(pk=delivery.pk).update(
+            status=EmailDelivery.STATUS_SENT, attempts=attempts, sent_at=now, last_error="",
+        )
+    elif attempts >= EMAIL_DELIVERY_MAX_ATTEMPTS:
+        EmailDelivery.objects.filter(pk=delivery.pk).update(
+            status=EmailDelivery.STATUS_FAILED, attempts=attempts, last_error=str(error)[:2000],
+        )
+    else:
+        backoff = EMAIL_RETRY_BACKOFF_SECONDS[min(attempts, len(EMAIL_RETRY_BACKOFF_SECONDS)) - 1]
+        EmailDelivery.objects.filter(pk=delivery.pk).update(
+            status=EmailDelivery.STATUS_PENDING,
+            attempts=attempts,
+            next_attempt_at=now + timedelta(seconds=backoff),
+            last_error=str(error)[:2000],
+        )
+    EmailSendJob.objects.filter(pk=job.pk).update(updated_at=now)
+
+
+def _finish_job(job):
+    """Set the job status from its ledger: back to QUEUED while recipients wait for a retry,
+    FAILED if some recipients gave up, otherwise COMPLETED."""
+    from django.db.models import Count
+
+    from .models import EmailDelivery, EmailSendJob
+
+    counts = dict(job.deliveries.values_list("status").annotate(n=Count("id")))
+    total = sum(counts.values())
+    sent = counts.get(EmailDelivery.STATUS_SENT, 0)
+    waiting = counts.get(EmailDelivery.STATUS_PENDING, 0) + counts.get(EmailDelivery.STATUS_SENDING, 0)
+    failed = counts.get(EmailDelivery.STATUS_FAILED, 0)
+    last_error = ""
+    if waiting or failed:
+        last_error = (
+            job.deliveries.exclude(last_error="").exclude(status=EmailDelivery.STATUS_SENT)
+            .order_by("-id").values_list("last_error", flat=True).first()
+        ) or ""
+    if waiting:
+        job.status = EmailSendJob.STATUS_QUEUED
+        job.error_message = f"Sent {sent} of {total}; {waiting} waiting to retry. Last error: {last_error}"[:2000]
+    elif failed:
+        job.status = EmailSendJob.STATUS_FAILED
+        job.error_message = f"Sent {sent} of {total}; {failed} failed. Last error: {last_error}"[:2000]
+    else:
+        job.status = EmailSendJob.STATUS_COMPLETED
+        job.error_message = ""
+    job.save(update_fields=["status", "error_message", "updated_at"])
+
+
+def _process_one_job(job, lease=None):
+    from django.core.mail import EmailMessage
     from django.conf import settings
     from django.db import connection
 
-    from .models import EmailSendJob, runners
+    from .models import EmailDelivery, EmailSendJob
 
     try:
-        race_obj = job.race
+        if not job.deliveries.exists():
+            # Queued before the delivery ledger existed
+            create_job_deliveries(job)
         from_email = getattr(settings, "DEFAULT_FROM_EMAIL", None) or settings.EMAIL_HOST_USER
-
-        if getattr(job, "unpaid_reminder", False):
+        base_body = (job.body or "").strip()
+        if job.unpaid_reminder:
+            from .models import SiteSettings
             from .views import _pay_link_for_runner
 
-            # Only unpaid runners for this job's race (the selected race)
-            recipient_runners = list(
-                runners.objects.filter(race_id=race_obj.pk, paid=False)
-                .exclude(email__isnull=True)
-                .exclude(email="")
-                .select_related("race")
-            )
-            for runner in recipient_runners:
-                body = (job.body or "").strip()
-                pay_link = _pay_link_for_runner(runner)
-                if pay_link:
-                    body += f"\n\nIf you haven't paid yet, you can pay here: {pay_link}"
-                body += EMAIL_FOOTER
-                try:
-                    conn = get_connection(fail_silently=False, timeout=EMAIL_TIMEOUT_SECONDS)
-                    msg = EmailMessage(
-                        subject=job.subject,
-                        body=body,
-                        from_email=from_email,
-                        to=[runner.email],
-                    )
-                    conn.send_messages([msg])
-                    conn.close()
-                except Exception as e:
-                    job.status = EmailSendJob.STATUS_FAILED
-                    job.error_message = str(e)[:2000]
-                    job.save()
-                    return
-                time.sleep(EMAIL_SEND_INTERVAL_SECONDS)
-        else:
-            recipient_list = list(
-                runners.objects.filter(race=race_obj)
-                .exclude(email__isnull=True)
-                .exclude(email="")
-                .values_list("email", flat=True)
-                .distinct()
-            )
-            body = (job.body or "").strip() + EMAIL_FOOTER
-            for email in recipient_list:
-                try:
-                    conn = get_connection(fail_silently=False, timeout=EMAIL_TIMEOUT_SECONDS)
-                    msg = EmailMessage(
-                        subject=job.subject,
-                        body=body,
-                        from_email=from_email,
-                        to=[email],
-                    )
-                    conn.send_messages([msg])
-                    conn.close()
-                except Exception as e:
-                    job.status = EmailSendJob.STATUS_FAILED
-                    job.error_message = str(e)[:2000]
-                    job.save()
+            site_base_url = SiteSettings.get_settings().site_base_url
+
+        with SmtpSession() as session:
+            while True:
+                # Renew our worker lease between chunks; if another process took over, hand
+                # the job back so it resumes there
+                if lease is not None and not lease.acquire():
+                    job.deliveries.filter(status=EmailDelivery.STATUS_SENDING).update(status=EmailDelivery.STATUS_PENDING)
+                    job.status = EmailSendJob.STATUS_QUEUED
+                    job.save(update_fields=["status", "updated_at"])
                     return
-                time.sleep(EMAIL_SEND_INTERVAL_SECONDS)
-        job.status = EmailSendJob.STATUS_COMPLETED
-        job.save()
+                chunk = _claim_delivery_chunk(job)
+                if not chunk:
+                    break
+                for delivery in chunk:
+                    body = base_body
+                    if job.unpaid_reminder and delivery.runner is not None:
+                        pay_link = _pay_link_for_runner(delivery.runner, site_base_url)
+                        if pay_link:
+                            body += f"\n\nIf you haven't paid yet, you can pay here: {pay_link}"
+                    body += EMAIL_FOOTER
+                    message = EmailMessage(subject=job.subject, body=body, from_email=from_email, to=[delivery.email])
+                    try:
+                        session.send(message)
+                        error = None
+                    except Exception as e:
+                        logger.warning("Email to delivery id=%s failed: %s", delivery.pk, e)
+                        error = e
+                    _record_delivery_result(job, delivery, error)
+        _finish_job(job)
     except Exception as e:
         job.status = EmailSendJob.STATUS_FAILED
         job.error_message = str(e)[:2000]
@@ -103,46 +365,178 @@ def _process_one_job(job):
         connection.close()
 
 
+def send_signup_confirmation_batch(due, lease=None):
+    """Send signup confirmations to a claimed batch of runners (signup_confirmation_sent
+    already set by the claim; race selected). All messages are built up front with one
+    SiteSettings read and sent over one SMTP connection. Runners whose send failed, or that
+    were not reached because lease was lost, are un-claimed with a single update() so a
+    later pass retries them. Returns the number of emails sent."""
+    from django.conf import settings
+
+    from .models import runners, SiteSettings
+    from .views import build_signup_confirmation_email
+
+    site_base_url = SiteSettings.get_settings().site_base_url
+    from_email = getattr(settings, "DEFAULT_FROM_EMAIL", None) or getattr(settings, "EMAIL_HOST_USER", "noreply@example.com")
+    prepared = []
+    unsent = []
+    for runner in due:
+        try:
+            message = build_signup_confirmation_email(runner, from_email, site_base_url)
+        except Exception as e:
+            logger.exception("Building signup confirmation failed for runner id=%s: %s", runner.id, e)
+            unsent.append(runner.id)
+            continue
+        # Runners without an address have nothing to send and stay marked
+        if message is not None:
+            prepared.append((runner, message))
+
+    sent = 0
+    with SmtpSession() as session:
+        for i, (runner, message) in enumerate(prepared):
+            # Renew the lease every batch; if another process took over, leave the rest to it
+            if lease is not None and i % EMAIL_BATCH_SIZE == 0 and not lease.acquire():
+                unsent.extend(r.id for r, _m in prepared[i:])
+                break
+            try:
+                session.send(message)
+                sent += 1
+            except Exception as e:
+                logger.exception("Signup confirmation email failed for runner id=%s: %s", runner.id, e)
+                unsent.append(runner.id)
+    if unsent:
+        runners.objects.filter(id__in=unsent).update(signup_confirmation_sent=False)
+    return sent
+
+
+def notify_email_jobs():
+    """Wake the email worker after queueing a job (call inside the queueing transaction)."""
+    notify(CHANNEL_EMAIL_JOBS)
+
+
+def notify_signup_confirmations():
+    """Wake the signup confirmation worker when a confirmation was left for it to send."""
+    notify(CHANNEL_SIGNUP_CONFIRMATIONS)
+
+
+def _idle_wait(waiter, lease, seconds):
+    """Wait up to seconds for a wake-up, renewing lease meanwhile. Returns False if the lease
+    was lost (another process is now the active worker)."""
+    deadline = time.monotonic() + seconds
+    while True:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return True
+        if waiter.wait(min(remaining, LEASE_RENEW_SECONDS)):
+            return True
+        if not _hold_lease(lease):
+            return False
+
+
+def _seconds_until_next_retry():
+    """Seconds until the earliest backed-off delivery of a queued job is due (None if none)."""
+    from django.db.models import Min
+    from django.utils import timezone
+
+    from .models import EmailDelivery, EmailSendJob
+
+    next_at = EmailDelivery.objects.filter(
+        status=EmailDelivery.STATUS_PENDING,
+        job__status=EmailSendJob.STATUS_QUEUED,
+        next_attempt_at__isnull=False,
+    ).aggregate(next_at=Min("next_attempt_at"))["next_at"]
+    if next_at is None:
+        return None
+    return max((next_at - timezone.now()).total_seconds(), 0)
+
+
+def web_workers_enabled():
+    """False when settings.RUN_WORKERS_IN_WEB is off: background loops then run only in the
+    dedicated `manage.py run_workers` process."""
+    from django.conf import settings
+
+    return getattr(settings, "RUN_WORKERS_IN_WEB", True)
+
+
+def _hold_lease(lease):
+    """Take or renew lease; on standby (or a DB error) release the idle DB connection."""
+    from django.db import connection
+
+    try:
+        if lease.acquire():
+            return True
+    except Exception as e:
+        logger.exception("Worker lease %s check failed: %s", lease.name, e)
+    try:
+        connection.close()
+    except Exception as e:
+        logger.debug("Connection close on standby: %s", e)
+    return False
+
+
 def _worker_loop():
+    from django.db import connection
     from django.utils import timezone
+    from django.db.models import Exists, OuterRef
     from datetime import timedelta
 
-    from .models import EmailSendJob
+    from .models import EmailDelivery, EmailSendJob
 
+    lease = Lease(LEASE_EMAIL_JOBS)
+    waiter = None
+    last_stuck_check = None
     while True:
+        # Only the process holding the lease processes jobs; the others stay on standby
+        if not _hold_lease(lease):
+            if waiter is not None:
+                # Free the wake-up port / LISTEN connection for the new holder
+                waiter.close()
+                waiter = None
+            time.sleep(LEASE_STANDBY_POLL_SECONDS)
+            continue
+        if waiter is None:
+            waiter = Waiter(CHANNEL_EMAIL_JOBS)
         job = None
+        idle_seconds = EMAIL_WORKER_IDLE_SECONDS
         try:
-            # Reset jobs stuck in SENDING (e.g. after server restart) so they don't stay stuck
-            stuck_cutoff = timezone.now() - timedelta(minutes=STUCK_SENDING_MINUTES)
-            EmailSendJob.objects.filter(
-                status=EmailSendJob.STATUS_SENDING,
-                updated_at__lt=stuck_cutoff,
-            ).update(
-                status=EmailSendJob.STATUS_FAILED,
-                error_message="Reset: job was stuck in Sending (worker may have stopped). Re-send from the email page if needed.",
-            )
+            # Resume jobs interrupted mid-send (e.g. by a server restart) from where they stopped
+            if last_stuck_check is None or time.monotonic() - last_stuck_check >= STUCK_CHECK_INTERVAL_SECONDS:
+                _resume_interrupted_jobs(timezone.now() - timedelta(minutes=STUCK_SENDING_MINUTES))
+                last_stuck_check = time.monotonic()
 
             from django.db import transaction as db_transaction
 
+            # A queued job is ready when it has recipients due now (not all waiting on a
+            # retry backoff), or has no ledger yet (queued before the ledger existed)
+            has_due = Exists(_due_deliveries(timezone.now()).filter(job=OuterRef("pk")))
+            has_ledger = Exists(EmailDelivery.objects.filter(job=OuterRef("pk")))
             with db_transaction.atomic():
                 job = (
                     EmailSendJob.objects.select_for_update(skip_locked=True)
                     .filter(status=EmailSendJob.STATUS_QUEUED)
+                    .filter(has_due | ~has_ledger)
                     .order_by("created_at")
                     .first()
                 )
                 if job:
                     job.status = EmailSendJob.STATUS_SENDING
-                    job.save(update_fields=["status"])
+                    job.save(update_fields=["status", "updated_at"])
 
             # Process the job OUTSIDE the atomic block so that connection.close()
             # in _process_one_job's finally does not close the connection while a
             # transaction is still open (which would roll back the status updates
             # and leave the job as QUEUED, causing it to be re-sent indefinitely).
             if job:
-                _process_one_job(job)
+                _process_one_job(job, lease=lease)
+                # Look for the next job straight away
+                continue
+            next_retry = _seconds_until_next_retry()
+            if next_retry is not None:
+                idle_seconds = min(idle_seconds, next_retry + 1)
+            connection.close()
         except Exception as e:
             logger.exception("Email worker failed processing job: %s", e)
+            idle_seconds = STUCK_CHECK_INTERVAL_SECONDS
             if job is not None:
                 try:
                     job.status = EmailSendJob.STATUS_FAILED
@@ -150,10 +544,12 @@ def _worker_loop():
                     job.save(update_fields=["status", "error_message"])
                 except Exception as save_err:
                     logger.exception("Failed to save job failure state: %s", save_err)
-        time.sleep(5)
+        # Idle: no database polling until a job is queued, a retry falls due or the timeout passes
+        _idle_wait(waiter, lease, idle_seconds)
 
 
-# How often to check for runners due a signup confirmation (same process as race emails worker)
+# Longest the signup confirmation worker sleeps between checks; it wakes earlier when the
+# next unpaid signup reaches its timeout or notify_signup_confirmations() is called
 SIGNUP_CONFIRMATION_CHECK_INTERVAL_SECONDS = 5 * 60  # 5 minutes
 
 # Only send timeout confirmation to signups from the last 24 hours (ignore older ones)
@@ -161,36 +557,49 @@ SIGNUP_CONFIRMATION_MAX_AGE_HOURS = 24
 
 
 def _signup_confirmation_loop():
-    """Background loop: every SIGNUP_CONFIRMATION_CHECK_INTERVAL_SECONDS, send signup
-    confirmations to runners who have not received one and are either paid or older than
-    signup_confirmation_timeout_minutes (from Site Settings). Ignores signups older than
-    24 hours. Stays under Microsoft SMTP limit (30/min) and claims runners in the same
-    transaction so only one process sends to each runner (no duplicate emails).
+    """Background loop: when woken (or at the latest every SIGNUP_CONFIRMATION_CHECK_INTERVAL_SECONDS),
+    send signup confirmations to runners who have not received one and are paid, deferred by a
+    request that found the send rate limit busy, or older than signup_confirmation_timeout_minutes
+    (from Site Settings). Ignores signups older than
+    24 hours. Stays under Microsoft SMTP limit (30/min) via the shared send bucket and claims
+    runners in the same transaction so only one process sends to each runner (no duplicate emails).
     """
     from django.utils import timezone
-    from django.db.models import Q
+    from django.db.models import Min, Q
     from django.db import transaction
     from datetime import timedelta
 
     from .models import runners, SiteSettings
 
+    lease = Lease(LEASE_SIGNUP_CONFIRMATIONS)
+    waiter = None
+    wait_seconds = SIGNUP_CONFIRMATION_CHECK_INTERVAL_SECONDS
     while True:
         try:
-            time.sleep(SIGNUP_CONFIRMATION_CHECK_INTERVAL_SECONDS)
+            if not _hold_lease(lease):
+                if waiter is not None:
+                    waiter.close()
+                    waiter = None
+                time.sleep(LEASE_STANDBY_POLL_SECONDS)
+                continue
+            if waiter is None:
+                waiter = Waiter(CHANNEL_SIGNUP_CONFIRMATIONS)
+            if not _idle_wait(waiter, lease, wait_seconds):
+                continue
+            wait_seconds = SIGNUP_CONFIRMATION_CHECK_INTERVAL_SECONDS
             site_settings = SiteSettings.get_settings()
             timeout_minutes = site_settings.signup_confirmation_timeout_minutes
             cutoff = timezone.now() - timedelta(minutes=timeout_minutes)
             # Only consider signups from the last 24 hours (don't send to very old signups)
             cutoff_24h = timezone.now() - timedelta(hours=SIGNUP_CONFIRMATION_MAX_AGE_HOURS)
-            # Cap batch size so we don't exceed MAX_EMAILS_PER_MINUTE in one burst;
-            # we sleep EMAIL_SEND_INTERVAL_SECONDS between each, so 30/min is safe.
-            batch_size = min(50, MAX_EMAILS_PER_MINUTE)
+            # Claim about a minute's worth of sends at a time; each send waits for a token.
+            batch_size = min(50, _max_emails_per_minute())
             with transaction.atomic():
                 due = list(
                     runners.objects.filter(send_signup_confirmation=True)
                     .filter(signup_confirmation_sent=False)
                     .filter(created_at__gte=cutoff_24h)
-                    .filter(Q(paid=True) | Q(created_at__lte=cutoff))
+                    .filter(Q(paid=True) | Q(signup_confirmation_deferred=True) | Q(created_at__lte=cutoff))
                     .select_related('race')
                     .order_by('created_at')
                     .select_for_update(skip_locked=True)[:batch_size]
@@ -200,14 +609,20 @@ def _signup_confirmation_loop():
                     runner_ids = [r.id for r in due]
                     runners.objects.filter(id__in=runner_ids).update(signup_confirmation_sent=True)
             if due:
-                from .views import send_signup_confirmation_email
-                for runner in due:
-                    try:
-                        send_signup_confirmation_email(runner)
-                    except Exception as e:
-                        logger.exception("Signup confirmation email failed for runner id=%s: %s", runner.id, e)
-                        runners.objects.filter(id=runner.id).update(signup_confirmation_sent=False)
-                    time.sleep(EMAIL_SEND_INTERVAL_SECONDS)
+                send_signup_confirmation_batch(due, lease=lease)
+            if len(due) == batch_size:
+                # More may be waiting: go again straight away
+                wait_seconds = 0
+            else:
+                # Sleep until the oldest pending unpaid signup reaches its timeout
+                next_created = (
+                    runners.objects.filter(send_signup_confirmation=True, signup_confirmation_sent=False, paid=False)
+                    .filter(created_at__gt=cutoff, created_at__gte=cutoff_24h)
+                    .aggregate(next_created=Min('created_at'))['next_created']
+                )
+                if next_created is not None:
+                    due_in = (next_created + timedelta(minutes=timeout_minutes) - timezone.now()).total_seconds()
+                    wait_seconds = min(wait_seconds, max(due_in, 0) + 1)
         except Exception as e:
             logger.exception("Signup confirmation loop error: %s", e)
         finally:
@@ -0,0 +1,178 @@
+"""
+Cold storage for the laps of archived races.
+
+archive_race() moves every lap of a race into one LapArchive row: the lap columns as
+64-bit integer arrays (ids, runner ids and clock times delta-encoded, times and durations
+in microseconds, speeds in hundredths), zlib-compressed. restore_race() puts them back
+with their original ids. Readers use laps_by_runner() and runner_laps(), which return lap
+instances from the archive when the race has one and from the laps table otherwise;
+archived laps are unsaved instances, decoded once per process and shared: read-only.
+"""
+import struct
+import sys
+import threading
+import zlib
+from array import array
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone as dt_timezone
+from decimal import Decimal
+from itertools import accumulate
+
+from django.db import transaction
+
+from .models import LapArchive, laps
+from .race_cache import bump_race_version
+
+# Blob header: magic, format version, number of laps
+_HEADER = struct.Struct('<4sHI')
+_MAGIC = b'LAPS'
+FORMAT_VERSION = 1
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=dt_timezone.utc)
+_MICROSECOND = timedelta(microseconds=1)
+
+# Column order in the blob; DELTA_COLUMNS store the difference to the previous row
+COLUMNS = ('id', 'runner_id', 'lap', 'time', 'duration', 'average_speed', 'average_pace')
+DELTA_COLUMNS = ('id', 'runner_id', 'time')
+
+# Decoded archives kept per process (a race's laps as instances, grouped by runner)
+DECODED_CACHE_SIZE = 4
+
+_decoded = OrderedDict()  # (race_id, archived_at, lap_count) -> {runner_id: [laps]}
+_decoded_lock = threading.Lock()
+
+
+def _to_ints(lap):
+    return {
+        'id': lap.id,
+        'runner_id': lap.runner_id,
+        'lap': lap.lap,
+        'time': (lap.time - _EPOCH) // _MICROSECOND,
+        'duration': lap.duration // _MICROSECOND,
+        'average_speed': int(lap.average_speed * 100),
+        'average_pace': lap.average_pace // _MICROSECOND,
+    }
+
+
+def encode_laps(race_laps):
+    """Compressed columnar blob of race_laps (lap instances of one race)."""
+    rows = sorted((_to_ints(lap) for lap in race_laps), key=lambda row: (row['runner_id'], row['lap'], row['id']))
+    columns = []
+    for name in COLUMNS:
+        values = array('q', (row[name] for row in rows))
+        if name in DELTA_COLUMNS:
+            values = array('q', [values[0]] + [b - a for a, b in zip(values, values[1:])]) if values else values
+        if sys.byteorder == 'big':
+            values.byteswap()
+        columns.append(values.tobytes())
+    return _HEADER.pack(_MAGIC, FORMAT_VERSION, len(rows)) + zlib.compress(b''.join(columns), 9)
+
+
+def decode_laps(data, race_id):
+    """Unsaved lap instances from an encode_laps() blob, ordered by runner and lap."""
+    magic, version, count = _HEADER.unpack_from(data)
+    if magic != _MAGIC or version != FORMAT_VERSION:
+        raise ValueError(f'Not a lap archive (format {version}) this version can read')
+    raw = zlib.decompress(bytes(data[_HEADER.size:]))
+    width = array('q').itemsize * count
+    columns = {}
+    for i, name in enumerate(COLUMNS):
+        values = array('q')
+        values.frombytes(raw[i * width:(i + 1) * width])
+        if sys.byteorder == 'big':
+            values.byteswap()
+        columns[name] = array('q', accumulate(values)) if name in DELTA_COLUMNS else values
+    return [
+        laps(
+            id=columns['id'][i],
+            runner_id=columns['runner_id'][i],
+            attach_to_race_id=race_id,
+            lap=columns['lap'][i],
+            time=_EPOCH + columns['time'][i] * _MICROSECOND,
+            duration=columns['duration'][i] * _MICROSECOND,
+            average_speed=Decimal(columns['average_speed'][i]).scaleb(-2),
+            average_pace=columns['average_pace'][i] * _MICROSECOND,
+        )
+        for i in range(count)
+    ]
+
+
+def _group_by_runner(race_laps):
+    grouped = {}
+    for lap in race_laps:
+        grouped.setdefault(lap.runner_id, []).append(lap)
+    return grouped
+
+
+def _archived_by_runner(race_id):
+    """{runner_id: [laps]} of a race's LapArchive, or None if it has none. Decoded once per
+    archive and kept for the next DECODED_CACHE_SIZE races, so per-runner reports of an
+    archived race cost one small query each instead of decoding the whole race."""
+    current = LapArchive.objects.filter(pk=race_id).values_list('archived_at', 'lap_count').first()
+    if current is None:
+        return None
+    key = (race_id, *current)
+    with _decoded_lock:
+        grouped = _decoded.get(key)
+        if grouped is not None:
+            _decoded.move_to_end(key)
+            return grouped
+    data = LapArchive.objects.filter(pk=race_id).values_list('data', flat=True).first()
+    if data is None:
+        return None
+    grouped = _group_by_runner(decode_laps(data, race_id))
+    with _decoded_lock:
+        _decoded[key] = grouped
+        while len(_decoded) > DECODED_CACHE_SIZE:
+            _decoded.popitem(last=False)
+    return grouped
+
+
+def laps_by_runner(race_id):
+    """{runner_id: [laps ordered by lap]} for every runner of a race with laps (read-only)."""
+    grouped = _archived_by_runner(race_id)
+    if grouped is None:
+        grouped = _group_by_runner(laps.objects.filter(attach_to_race_id=race_id).order_by('runner_id', 'lap'))
+    return grouped
+
+
+def runner_laps(runner_obj):
+    """A runner's laps ordered by lap, from the archive if their race has one."""
+    grouped = _archived_by_runner(runner_obj.race_id)
+    if grouped is None:
+        return list(laps.objects.filter(runner=runner_obj).order_by('lap'))
+    return list(grouped.get(runner_obj.pk, ()))
+
+
+def archive_race(race_obj):
+    """Move a race's laps into its LapArchive (merged with any already archived). Returns
+    the number of laps moved. Only for races that are both completed and archived."""
+    if not race_obj.archived or race_obj.status != 'completed':
+        raise ValueError(f'Race {race_obj.pk} must be completed and archived before its laps are.')
+    with transaction.atomic():
+        live = laps.objects.select_for_update().filter(attach_to_race=race_obj)
+        live_laps = list(live)
+        if not live_laps:
+            return 0
+        archive = LapArchive.objects.select_for_update().filter(pk=race_obj.pk).first()
+        earlier = decode_laps(archive.data, race_obj.pk) if archive else []
+        LapArchive.objects.update_or_create(
+            race=race_obj,
+            defaults={'data': encode_laps(earlier + live_laps), 'lap_count': len(earlier) + len(live_laps)},
+        )
+        live.delete()
+        bump_race_version(race_obj.pk)
+    return len(live_laps)
+
+
+def restore_race(race_obj):
+    """Move a race's archived laps back into the laps table. Returns the number restored."""
+    with transaction.atomic():
+        archive = LapArchive.objects.select_for_update().filter(pk=race_obj.pk).first()
+        if archive is None:
+            return 0
+        restored = decode_laps(archive.data, race_obj.pk)
+        laps.objects.bulk_create(restored, batch_size=500)
+        archive.delete()
+        bump_race_version(race_obj.pk)
+    return len(restored)
@@ -0,0 +1,43 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from tracker.lap_archive import archive_race
+from tracker.models import race, laps
+
+
+class Command(BaseCommand):
+    help = (
+        "Move the laps of archived races out of the laps table into a compressed LapArchive "
+        "per race, keeping the table and its indexes small for race day. Results pages and "
+        "race reports keep reading them from the archive; restore_laps moves them back. "
+        "Only completed, archived races whose results emails have all been sent are archived."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--race', type=int, help='Only this race id.')
+        parser.add_argument('--dry-run', action='store_true', help='List the races without archiving them.')
+
+    def handle(self, *args, **options):
+        races = race.objects.filter(
+            archived=True, status='completed', pk__in=laps.objects.values('attach_to_race'),
+        ).order_by('date', 'pk')
+        if options['race'] is not None:
+            races = races.filter(pk=options['race'])
+            if not races.exists():
+                raise CommandError(
+                    f"Race {options['race']} has no laps to archive, or is not completed and archived."
+                )
+        moved = 0
+        for race_obj in races:
+            if not race_obj.all_emails_sent:
+                # send_race_emails finds finishers by their laps
+                self.stdout.write(f"Skipped {race_obj.name} (id {race_obj.pk}): results emails not all sent.")
+                continue
+            if options['dry_run']:
+                count = laps.objects.filter(attach_to_race=race_obj).count()
+                self.stdout.write(f"{race_obj.name} (id {race_obj.pk}): {count} laps")
+                continue
+            count = archive_race(race_obj)
+            moved += count
+            self.stdout.write(f"{race_obj.name} (id {race_obj.pk}): archived {count} laps")
+        if not options['dry_run']:
+            self.stdout.write(self.style.SUCCESS(f"Archived {moved} lap(s)."))
@@ -0,0 +1,47 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from tracker.query_plans import (
+    SUPPORTED_VENDORS, disable_seqscan_and_sort, hot_path_queries, plan_problems, seed_race,
+)
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        "Diagnostic: print which timing and results hot-path queries use indexes, against this "
+        "database. Seeds a synthetic race (rolled back afterwards), runs EXPLAIN on each query and "
+        "reports any that scans a whole table or sorts where an index should give the order. The "
+        "same checks run in the test suite (manage.py test tracker); use this to look at the plans "
+        "of a production-sized database or with --plans."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--runners', type=int, default=200, help='Runners in the seeded race.')
+        parser.add_argument('--plans', action='store_true', help='Print every query plan.')
+
+    def handle(self, *args, **options):
+        if connection.vendor not in SUPPORTED_VENDORS:
+            raise CommandError(f'Query plan checks support SQLite and PostgreSQL, not {connection.vendor}.')
+        failures = []
+        try:
+            with transaction.atomic():
+                disable_seqscan_and_sort()
+                for label, queryset, ordered in hot_path_queries(seed_race(options['runners'])):
+                    plan, problems = plan_problems(queryset, ordered)
+                    if problems:
+                        failures.append(label)
+                        self.stdout.write(self.style.ERROR(f'FAIL {label}: {"; ".join(problems)}'))
+                    else:
+                        self.stdout.write(f'ok   {label}')
+                    if options['plans'] or problems:
+                        self.stdout.write('       ' + plan.replace('\n', '\n       '))
+                raise _Rollback
+        except _Rollback:
+            pass
+        if failures:
+            raise CommandError(f'{len(failures)} quer{"y" if len(failures) == 1 else "ies"} without a usable index.')
+        self.stdout.write(self.style.SUCCESS('All checked queries use indexes.'))
@@ -0,0 +1,149 @@
+import time
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand
+from django.test.utils import override_settings
+
+from tracker.email_queue import _process_one_job, create_job_deliveries, send_signup_confirmation_batch
+from tracker.models import race, runners, EmailSendJob, EmailDelivery
+from tracker.smtp_sink import SmtpSink
+
+
+def _percentile(values, pct):
+    """Nearest-rank percentile of values (seconds); None for an empty list."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = max(int(round(pct / 100.0 * len(ordered))) - 1, 0)
+    return ordered[min(index, len(ordered) - 1)]
+
+
+def _format_seconds(value):
+    return '-' if value is None else f'{value * 1000:.0f} ms' if value < 1 else f'{value:.2f} s'
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure email throughput against a local SMTP sink: sends one bulk EmailSendJob and a "
+        "batch of signup confirmations for a synthetic race, then reports messages per minute, "
+        "SMTP handshakes and latency percentiles. Creates and deletes its own race and runners; "
+        "run it against a development database. Uses the shared send rate limiter, so pass "
+        "--rate to test faster than EMAIL_MAX_PER_MINUTE."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--recipients', type=int, default=100, help='Runners in the bulk email job.')
+        parser.add_argument('--signups', type=int, default=20, help='Signup confirmations to send.')
+        parser.add_argument('--rate', type=int, default=None, help='Override EMAIL_MAX_PER_MINUTE for the run.')
+        parser.add_argument('--latency-ms', type=float, default=0, help='Sink delay before answering each message.')
+        parser.add_argument('--fail-rate', type=float, default=0, help='Fraction of messages the sink fails (0-1).')
+        parser.add_argument('--disconnect-every', type=int, default=0, help='Sink drops the connection every Nth message.')
+
+    def handle(self, *args, **options):
+        sink = SmtpSink(
+            latency=options['latency_ms'] / 1000.0,
+            fail_rate=options['fail_rate'],
+            disconnect_every=options['disconnect_every'],
+            seed=0,
+        ).start()
+        host, port = sink.address
+        overrides = {
+            'EMAIL_BACKEND': 'django.core.mail.backends.smtp.EmailBackend',
+            'EMAIL_HOST': host,
+            'EMAIL_PORT': port,
+            'EMAIL_USE_TLS': False,
+            'EMAIL_USE_SSL': False,
+            'EMAIL_HOST_USER': '',
+            'EMAIL_HOST_PASSWORD': '',
+            'DEFAULT_FROM_EMAIL': 'benchmark@example.invalid',
+        }
+        if options['rate']:
+            overrides['EMAIL_MAX_PER_MINUTE'] = options['rate']
+        race_obj = None
+        try:
+            with override_settings(**overrides):
+                race_obj = race.objects.create(
+                    name=f'Email benchmark {int(time.time())}',
+                    status='signup_open',
+                    Entry_fee=0,
+                    date=date.today(),
+                    distance=5000,
+                    laps_count=1,
+                    min_lap_time=timedelta(minutes=1),
+                )
+                if options['recipients'] > 0:
+                    self._bench_job(sink, race_obj, options['recipients'])
+                if options['signups'] > 0:
+                    self._bench_signups(sink, race_obj, options['signups'])
+        finally:
+            sink.stop()
+            if race_obj is not None:
+                # Jobs and deliveries cascade with the race; runners protect it, so go first
+                runners.objects.filter(race=race_obj).delete()
+                race_obj.delete()
+
+    def _create_runners(self, race_obj, count, prefix):
+        runners.objects.bulk_create([
+            runners(
+                first_name='Bench',
+                last_name=f'{prefix}{i}',
+                email=f'{prefix}{i}@example.invalid',
+                age='18-34',
+                gender='female',
+                shirt_size='Medium',
+                race=race_obj,
+                send_signup_confirmation=False,  # keep the real signup worker away from them
+            )
+            for i in range(count)
+        ], batch_size=500)
+        return list(runners.objects.filter(race=race_obj, email__startswith=prefix).select_related('race'))
+
+    def _bench_job(self, sink, race_obj, count):
+        self._create_runners(race_obj, count, 'job')
+        # Created as SENDING so background workers leave it to this command
+        job = EmailSendJob.objects.create(
+            race=race_obj, subject='Benchmark', body='Benchmark message.', status=EmailSendJob.STATUS_SENDING,
+        )
+        create_job_deliveries(job)
+        first_message, connections = len(sink.messages), sink.connections
+        started = time.monotonic()
+        _process_one_job(job)
+        elapsed = time.monotonic() - started
+        job.refresh_from_db()
+        to_delivery = [
+            (sent_at - job.created_at).total_seconds()
+            for sent_at in EmailDelivery.objects.filter(job=job, sent_at__isnull=False).values_list('sent_at', flat=True)
+        ]
+        self._report(
+            f'Bulk job ({count} recipients, status {job.status})',
+            sink, first_message, connections, elapsed, to_delivery, 'queue to delivery',
+        )
+
+    def _bench_signups(self, sink, race_obj, count):
+        signups = self._create_runners(race_obj, count, 'signup')
+        # Claimed as the signup confirmation worker would, then sent the same way
+        runners.objects.filter(id__in=[r.id for r in signups]).update(signup_confirmation_sent=True)
+        first_message, connections = len(sink.messages), sink.connections
+        started = time.monotonic()
+        sent = send_signup_confirmation_batch(signups)
+        elapsed = time.monotonic() - started
+        finished = [m.finished_at for m in sink.messages[first_message:] if m.accepted]
+        gaps = [b - a for a, b in zip(finished, finished[1:])]
+        self._report(
+            f'Signup confirmations ({sent} of {count} sent)',
+            sink, first_message, connections, elapsed, gaps, 'between messages',
+        )
+
+    def _report(self, title, sink, first_message, connections, elapsed, latencies, latency_label):
+        messages = sink.messages[first_message:]
+        accepted = [m for m in messages if m.accepted]
+        smtp_times = [m.duration for m in messages]
+        rate = len(accepted) / elapsed * 60 if elapsed > 0 else 0
+        self.stdout.write(self.style.MIGRATE_HEADING(title))
+        self.stdout.write(f'  accepted {len(accepted)}, failed at sink {len(messages) - len(accepted)}, elapsed {elapsed:.1f} s')
+        self.stdout.write(f'  throughput {rate:.1f} msg/min, SMTP handshakes {sink.connections - connections}')
+        for label, values in (('SMTP transaction', smtp_times), (latency_label, latencies)):
+            self.stdout.write(
+                f'  {label}: p50 {_format_seconds(_percentile(values, 50))}, '
+                f'p95 {_format_seconds(_percentile(values, 95))}, p99 {_format_seconds(_percentile(values, 99))}'
+            )
@@ -0,0 +1,48 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from tracker.models import race, RaceStats
+from tracker.race_stats import count_race, recount_race_stats
+
+STATS_FIELDS = ('registered', 'paid', 'finishers', 'unassigned', 'email_addresses', 'unpaid_with_email',
+                'shirt_sizes', 'genders', 'ages')
+
+
+class Command(BaseCommand):
+    help = (
+        "Recount each race's RaceStats counters from its runners and fix any that drifted "
+        "(e.g. after runners were edited directly in the database). Reports every race whose "
+        "stored counters differed. Safe to run while the app is live."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--race', type=int, help='Only this race id.')
+        parser.add_argument('--dry-run', action='store_true', help='Report drift without fixing it.')
+
+    def handle(self, *args, **options):
+        races = race.objects.order_by('pk')
+        if options['race'] is not None:
+            races = races.filter(pk=options['race'])
+            if not races.exists():
+                raise CommandError(f"Race {options['race']} does not exist.")
+        stored = {st.pk: st for st in RaceStats.objects.filter(race__in=races)}
+        drifted = 0
+        for race_obj in races:
+            counts = count_race(race_obj.pk)
+            stats = stored.get(race_obj.pk)
+            if stats is None:
+                diffs = ['no stats row']
+            else:
+                diffs = [
+                    f'{field}: {getattr(stats, field)} -> {counts[field]}'
+                    for field in STATS_FIELDS
+                    if getattr(stats, field) != counts[field]
+                ]
+            if not diffs:
+                continue
+            drifted += 1
+            self.stdout.write(f"{race_obj.name} (id {race_obj.pk}): {'; '.join(diffs)}")
+            if not options['dry_run']:
+                recount_race_stats(race_obj.pk)
+        action = 'found' if options['dry_run'] else 'fixed'
+        self.stdout.write(self.style.SUCCESS(f'{drifted} race(s) with drifted stats {action}.'))
+
@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from tracker.lap_archive import restore_race
+from tracker.models import race
+
+
+class Command(BaseCommand):
+    help = (
+        "Move a race's archived laps (see archive_laps) back into the laps table with their "
+        "original ids, e.g. before editing its results or un-archiving it."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('race', type=int, help='Race id.')
+
+    def handle(self, *args, **options):
+        race_obj = race.objects.filter(pk=options['race']).first()
+        if race_obj is None:
+            raise CommandError(f"Race {options['race']} does not exist.")
+        count = restore_race(race_obj)
+        if count == 0:
+            self.stdout.write(f"{race_obj.name} has no archived laps.")
+            return
+        self.stdout.write(self.style.SUCCESS(f"Restored {count} lap(s) of {race_obj.name}."))
@@ -0,0 +1,32 @@
+import logging
+import time
+
+from django.core.management.base import BaseCommand
+
+from tracker.email_queue import start_email_worker, start_signup_confirmation_worker
+from tracker.worker_lease import Lease, LEASE_EMAIL_JOBS, LEASE_SIGNUP_CONFIRMATIONS
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = (
+        "Run the background email and signup confirmation workers in this process. "
+        "Use with RUN_WORKERS_IN_WEB=FALSE so web processes do not start them."
+    )
+
+    def handle(self, *args, **options):
+        start_email_worker()
+        start_signup_confirmation_worker()
+        self.stdout.write("Background workers running. Press Ctrl+C to stop.")
+        try:
+            while True:
+                time.sleep(60)
+        except KeyboardInterrupt:
+            # Hand the leases back so a standby process can take over right away
+            for name in (LEASE_EMAIL_JOBS, LEASE_SIGNUP_CONFIRMATIONS):
+                try:
+                    Lease(name).release()
+                except Exception as e:
+                    logger.warning("Could not release %s lease: %s", name, e)
+            self.stdout.write("Background workers stopped.")
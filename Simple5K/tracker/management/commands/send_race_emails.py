@@ -1,46 +1,102 @@
 import logging
-import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 
 from django.core.management.base import BaseCommand
+from django.db import connection
+from django.db.models import Exists, OuterRef
+from tracker.email_queue import SmtpSession
 from tracker.models import race, runners, laps
-from tracker.views import send_race_report_email
+from tracker.views import build_race_report_email
 
 logger = logging.getLogger(__name__)
 
+# Threads rendering report PDFs while the sender waits on the SMTP rate limit
+RENDER_WORKERS = 2
+
+# Rendered emails kept ready ahead of the sender (bounds memory to this many PDFs)
+RENDER_AHEAD = 8
+
+
+def _render(race_obj, runner):
+    try:
+        return build_race_report_email(race_obj, runner)
+    finally:
+        # Render threads each have their own DB connection
+        connection.close()
+
 
 class Command(BaseCommand):
     help = 'Send emails to runners after the race has completed.'
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--render-workers', type=int, default=RENDER_WORKERS,
+            help=f'Threads rendering report PDFs ahead of the sender (default {RENDER_WORKERS}).',
+        )
+        parser.add_argument(
+            '--render-ahead', type=int, default=RENDER_AHEAD,
+            help=f'Most rendered emails waiting to be sent (default {RENDER_AHEAD}).',
+        )
+
     def handle(self, *args, **options):
+        render_ahead = max(options['render_ahead'], 1)
         races_to_send = race.objects.filter(status='completed', all_emails_sent=False).order_by('date')
-        for race_obj in races_to_send:
-            runners_list = runners.objects.filter(race=race_obj, email_sent=False).order_by('place')
-            all_succeeded = True
-            if runners_list:
-                for runner in runners_list:
-                    if not laps.objects.filter(runner=runner, attach_to_race=race_obj).exists():
-                        continue
-
-                    # Atomically claim this runner — if another process already
-                    # marked email_sent=True, claimed will be 0 and we skip.
-                    claimed = runners.objects.filter(pk=runner.pk, email_sent=False).update(email_sent=True)
-                    if not claimed:
-                        logger.info("Email already claimed for runner pk=%s, skipping", runner.pk)
-                        continue
-
-                    start_time = time.time()
-                    logger.info("Sending email to runner pk=%s", runner.pk)
-                    try:
-                        send_race_report_email(runner.pk, race_obj.pk)
-                    except Exception:
-                        logger.exception("Failed to send email for runner pk=%s", runner.pk)
-                        # Revert the flag so the next run will retry
-                        runners.objects.filter(pk=runner.pk).update(email_sent=False)
-                        all_succeeded = False
-
-                    elapsed = time.time() - start_time
-                    if elapsed < 2.1:
-                        time.sleep(2.1 - elapsed)
-            if all_succeeded:
-                race_obj.all_emails_sent = True
-                race_obj.save()
+        # Pipeline: the loop below hands eligible runners to the render pool; the sender
+        # drains rendered emails in order, claiming each runner just before sending it over
+        # one SMTP connection and taking a token from the shared rate limiter for each, so
+        # the send budget is used while PDFs render.
+        with ThreadPoolExecutor(max_workers=max(options['render_workers'], 1)) as pool, SmtpSession() as session:
+            for race_obj in races_to_send:
+                if self._send_race(race_obj, pool, session, render_ahead):
+                    race_obj.all_emails_sent = True
+                    race_obj.save()
+
+    def _send_race(self, race_obj, pool, session, render_ahead):
+        """Send the results email to every finisher of race_obj not yet emailed.
+        Returns True if none failed."""
+        finished = laps.objects.filter(runner=OuterRef('pk'), attach_to_race=race_obj)
+        eligible = list(
+            runners.objects.filter(race=race_obj, email_sent=False)
+            .filter(Exists(finished))
+            .select_related('race')
+            .order_by('place')
+        )
+        all_succeeded = True
+        pending = deque()
+
+        def send_next():
+            runner, rendered = pending.popleft()
+            try:
+                message = rendered.result()
+            except Exception:
+                logger.exception("Failed to render email for runner pk=%s", runner.pk)
+                return False
+            # Claim the runner only as its message goes to SMTP, so runners still rendering
+            # when this process dies stay unclaimed and the next run sends them. If another
+            # process already marked email_sent=True, claimed is 0 and we skip.
+            claimed = runners.objects.filter(pk=runner.pk, email_sent=False).update(email_sent=True)
+            if not claimed:
+                logger.info("Email already claimed for runner pk=%s, skipping", runner.pk)
+                return True
+            sent = False
+            try:
+                session.send(message)
+                sent = True
+            except Exception:
+                logger.exception("Failed to send email for runner pk=%s", runner.pk)
+            finally:
+                if not sent:
+                    # Revert the claim so the next run will retry (also when interrupted)
+                    runners.objects.filter(pk=runner.pk).update(email_sent=False)
+            if sent:
+                logger.info("Sent email to runner pk=%s", runner.pk)
+            return sent
+
+        for runner in eligible:
+            pending.append((runner, pool.submit(_render, race_obj, runner)))
+            if len(pending) >= render_ahead:
+                all_succeeded = send_next() and all_succeeded
+        while pending:
+            all_succeeded = send_next() and all_succeeded
+        return all_succeeded
@@ -1,35 +1,39 @@
 from django.core.management.base import BaseCommand
 from django.utils import timezone
+from django.db import transaction
 from django.db.models import Q
 from datetime import timedelta
 
+from tracker.email_queue import send_signup_confirmation_batch
 from tracker.models import runners, SiteSettings
-from tracker.views import send_signup_confirmation_email
 
 
 class Command(BaseCommand):
     help = (
         'Send signup confirmation emails to runners who have not received one yet: '
-        'either they have paid (PayPal IPN) or the signup confirmation timeout has passed.'
+        'they have paid (PayPal IPN), a request could not send theirs at once (send rate limit), '
+        'or the signup confirmation timeout has passed.'
     )
 
     def handle(self, *args, **options):
         site_settings = SiteSettings.get_settings()
         timeout_minutes = site_settings.signup_confirmation_timeout_minutes
         cutoff = timezone.now() - timedelta(minutes=timeout_minutes)
-        due = runners.objects.filter(
-            send_signup_confirmation=True
-        ).filter(
-            signup_confirmation_sent=False
-        ).filter(
-            Q(paid=True) | Q(created_at__lte=cutoff)
-        ).select_related('race')
-        count = 0
-        for runner in due:
-            send_signup_confirmation_email(runner)
-            count += 1
-            self.stdout.write(f"Sent signup confirmation to {runner.email} (runner id={runner.id})")
-        if count == 0:
+        # Claim them in the same transaction (as the background worker does), skipping rows it
+        # has locked, so neither sends to a runner the other is sending to;
+        # send_signup_confirmation_batch un-claims any that fail.
+        with transaction.atomic():
+            due = list(runners.objects.filter(
+                send_signup_confirmation=True
+            ).filter(
+                signup_confirmation_sent=False
+            ).filter(
+                Q(paid=True) | Q(signup_confirmation_deferred=True) | Q(created_at__lte=cutoff)
+            ).select_related('race').select_for_update(skip_locked=True))
+            if due:
+                runners.objects.filter(id__in=[r.id for r in due]).update(signup_confirmation_sent=True)
+        if not due:
             self.stdout.write("No signup confirmations to send.")
-        else:
-            self.stdout.write(self.style.SUCCESS(f"Sent {count} signup confirmation(s)."))
+            return
+        count = send_signup_confirmation_batch(due)
+        self.stdout.write(self.style.SUCCESS(f"Sent {count} of {len(due)} signup confirmation(s)."))
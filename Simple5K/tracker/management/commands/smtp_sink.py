@@ -0,0 +1,48 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from tracker.smtp_sink import SmtpSink
+
+
+class Command(BaseCommand):
+    help = (
+        "Run a local SMTP sink that accepts and records mail (no TLS), optionally injecting "
+        "latency and failures. Point the app at it with SMTP_HOST=127.0.0.1, SMTP_PORT=<port> "
+        "and EMAIL_USE_TLS=FALSE, then watch throughput here."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--host', default='127.0.0.1')
+        parser.add_argument('--port', type=int, default=2525)
+        parser.add_argument('--latency-ms', type=float, default=0, help='Delay before answering each message.')
+        parser.add_argument('--fail-rate', type=float, default=0, help='Fraction of messages answered 451 (0-1).')
+        parser.add_argument('--disconnect-every', type=int, default=0, help='Drop the connection on every Nth message.')
+        parser.add_argument('--report-seconds', type=int, default=10, help='Interval between summary lines.')
+
+    def handle(self, *args, **options):
+        sink = SmtpSink(
+            host=options['host'],
+            port=options['port'],
+            latency=options['latency_ms'] / 1000.0,
+            fail_rate=options['fail_rate'],
+            disconnect_every=options['disconnect_every'],
+        ).start()
+        host, port = sink.address
+        self.stdout.write(f"SMTP sink listening on {host}:{port}. Press Ctrl+C to stop.")
+        started = time.monotonic()
+        last_total = 0
+        try:
+            while True:
+                time.sleep(options['report_seconds'])
+                accepted = len(sink.accepted_messages())
+                total = len(sink.messages)
+                elapsed_min = (time.monotonic() - started) / 60.0
+                self.stdout.write(
+                    f"{accepted} accepted, {total - accepted} failed, {sink.connections} connection(s), "
+                    f"+{total - last_total} since last report, {accepted / elapsed_min:.1f} msg/min overall"
+                )
+                last_total = total
+        except KeyboardInterrupt:
+            sink.stop()
+            self.stdout.write("SMTP sink stopped.")
@@ -0,0 +1,26 @@
+# Generated by Django 5.2.18 on 2026-10-18 23:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tracker', '0052_add_paypalorder'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EmailSendThrottle',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('tokens', models.FloatField(default=0)),
+                ('refilled_at', models.DateTimeField()),
+                ('version', models.PositiveBigIntegerField(default=0)),
+            ],
+            options={
+                'verbose_name': 'Email send throttle',
+                'verbose_name_plural': 'Email send throttle',
+            },
+        ),
+    ]
@@ -0,0 +1,45 @@
+# Generated manually: store RfidTag.rfid_hex uppercase and make it unique
+
+from collections import defaultdict
+
+from django.db import migrations, models
+
+
+def normalize_rfid_hex(apps, schema_editor):
+    """Uppercase and trim existing hex values. Refuses to continue if two tags only differed
+    by case or spaces, since the column becomes unique; fix or delete those tags first."""
+    RfidTag = apps.get_model('tracker', 'RfidTag')
+    by_hex = defaultdict(list)
+    for pk, tag_number, rfid_hex in RfidTag.objects.values_list('pk', 'tag_number', 'rfid_hex'):
+        by_hex[(rfid_hex or '').strip().upper()].append((pk, tag_number, rfid_hex))
+    duplicates = [sorted(n for _, n, _ in tags) for tags in by_hex.values() if len(tags) > 1]
+    if duplicates:
+        listed = '; '.join(', '.join(str(n) for n in numbers) for numbers in duplicates)
+        raise RuntimeError(
+            'Cannot make RFID hex values unique: these tag numbers share the same hex value '
+            f'(ignoring case and spaces): {listed}. Delete or correct the duplicates, then migrate again.'
+        )
+    for normalized, tags in by_hex.items():
+        pk, _, rfid_hex = tags[0]
+        if rfid_hex != normalized:
+            RfidTag.objects.filter(pk=pk).update(rfid_hex=normalized)
+
+
+def noop(apps, schema_editor):
+    pass
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tracker', '0055_emaildelivery'),
+    ]
+
+    operations = [
+        migrations.RunPython(normalize_rfid_hex, noop),
+        migrations.AlterField(
+            model_name='rfidtag',
+            name='rfid_hex',
+            field=models.CharField(help_text='Hex string from the physical RFID tag', max_length=512, unique=True),
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 5.2.18 on 2026-10-19 00:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tracker', '0056_rfidtag_rfid_hex_normalized'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='laps',
+            index=models.Index(fields=['runner', 'attach_to_race', 'lap'], name='laps_runner_race_lap_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='laps',
+            index=models.Index(fields=['runner', 'lap'], name='laps_runner_lap_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='runners',
+            index=models.Index(fields=['race', 'number'], name='runners_race_number_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='runners',
+            index=models.Index(fields=['race', 'total_race_time'], name='runners_race_time_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='runners',
+            index=models.Index(fields=['race', 'gender', 'total_race_time'], name='runners_race_gender_time_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='runners',
+            index=models.Index(fields=['race', 'gender', 'place'], name='runners_race_gender_place_idx'),
+        ),
+    ]
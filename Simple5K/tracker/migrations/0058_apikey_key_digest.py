@@ -0,0 +1,46 @@
+# Generated manually: store API keys as a SHA-256 digest instead of plaintext
+
+import hashlib
+
+from django.db import migrations, models
+
+
+def hash_existing_keys(apps, schema_editor):
+    """Keep existing keys working: store their digest and prefix before the plaintext column goes."""
+    ApiKey = apps.get_model('tracker', 'ApiKey')
+    for api_key in ApiKey.objects.all():
+        api_key.key_prefix = api_key.key[:8]
+        api_key.key_digest = hashlib.sha256(api_key.key.encode('utf-8')).hexdigest()
+        api_key.save(update_fields=['key_prefix', 'key_digest'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tracker', '0057_timing_results_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='apikey',
+            name='key_prefix',
+            field=models.CharField(default='', editable=False, help_text='First characters of the key, to tell keys apart', max_length=12),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='apikey',
+            name='key_digest',
+            field=models.CharField(editable=False, max_length=64, null=True),
+        ),
+        # Irreversible: plaintext keys cannot be recovered from their digest
+        migrations.RunPython(hash_existing_keys),
+        migrations.RemoveField(
+            model_name='apikey',
+            name='key',
+        ),
+        migrations.AlterField(
+            model_name='apikey',
+            name='key_digest',
+            field=models.CharField(editable=False, max_length=64, unique=True),
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 5.2.18 on 2026-10-19 00:26
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tracker', '0058_apikey_key_digest'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RaceStats',
+            fields=[
+                ('race', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='stats', serialize=False, to='tracker.race')),
+                ('registered', models.IntegerField(default=0)),
+                ('paid', models.IntegerField(default=0)),
+                ('finishers', models.IntegerField(default=0, help_text='Runners with a gun time')),
+                ('unassigned', models.IntegerField(default=0, help_text='Runners with neither number nor tag')),
+                ('email_addresses', models.IntegerField(default=0, help_text='Distinct runner emails (bulk email recipients)')),
+                ('unpaid_with_email', models.IntegerField(default=0, help_text='Unpaid runners with an email (payment reminders)')),
+                ('shirt_sizes', models.JSONField(default=dict, help_text='Runner count per shirt size')),
+                ('genders', models.JSONField(default=dict, help_text='Runner count per gender')),
+                ('ages', models.JSONField(default=dict, help_text='Runner count per age bracket')),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Race stats',
+                'verbose_name_plural': 'Race stats',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='runners',
+            index=models.Index(fields=['race', 'email'], name='runners_race_email_idx'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-19 00:30
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tracker', '0059_race_stats'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LapArchive',
+            fields=[
+                ('race', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='lap_archive', serialize=False, to='tracker.race')),
+                ('data', models.BinaryField()),
+                ('lap_count', models.IntegerField(help_text='Laps in the blob')),
+                ('archived_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+    ]
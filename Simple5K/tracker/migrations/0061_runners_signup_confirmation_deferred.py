@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 00:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tracker', '0060_lap_archive'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='runners',
+            name='signup_confirmation_deferred',
+            field=models.BooleanField(default=False, help_text='Set when a request could not send the confirmation at once (send rate limit); the background worker then sends it right away.'),
+        ),
+    ]
@@ -2,6 +2,7 @@ from django.db import models
 from django.db.models import Q
 from django.urls import reverse
 from django.core.validators import MinValueValidator, RegexValidator
+import hashlib
 import secrets
 
 
@@ -47,24 +48,35 @@ class race(models.Model):
 
     def runner_email_count(self):
         """Return count of distinct runner emails for this race (for bulk email)."""
-        return self.runners_set.exclude(email__isnull=True).exclude(email='').values('email').distinct().count()
+        return RaceStats.for_race(self.pk).email_addresses
 
     def unpaid_runner_email_count(self):
         """Return count of unpaid runners with email (for payment reminder bulk email)."""
-        return self.runners_set.filter(paid=False).exclude(email__isnull=True).exclude(email='').count()
+        return RaceStats.for_race(self.pk).unpaid_with_email
+
+
+def normalize_rfid_hex(value):
+    """Canonical form of a tag hex value as stored in RfidTag.rfid_hex: trimmed, uppercase.
+    Normalize reader input the same way before looking a tag up."""
+    return (value or '').strip().upper()
 
 
 class RfidTag(models.Model):
     """Reusable RFID tag: tag_number matches runner number when auto-assigned. Can be used for multiple runners over time."""
     name = models.CharField(max_length=255, blank=True, help_text="Optional label for this tag")
     tag_number = models.IntegerField(unique=True, help_text="Number used when auto-assigning (same as runner number)")
-    rfid_hex = models.CharField(max_length=512, help_text="Hex string from the physical RFID tag")
+    # Stored normalized (normalize_rfid_hex) so reads are indexed equality lookups
+    rfid_hex = models.CharField(max_length=512, unique=True, help_text="Hex string from the physical RFID tag")
 
     class Meta:
         ordering = ['tag_number']
         verbose_name = 'RFID tag'
         verbose_name_plural = 'RFID tags'
 
+    def save(self, *args, **kwargs):
+        self.rfid_hex = normalize_rfid_hex(self.rfid_hex)
+        super().save(*args, **kwargs)
+
     def __str__(self):
         if self.name:
             return f"{self.name} (#{self.tag_number})"
@@ -145,6 +157,10 @@ class runners(models.Model):
         default=True,
         help_text='If True, runner is eligible for signup confirmation email (set for signup-form signups, or when "Send confirmation email" is checked on runner page).',
     )
+    signup_confirmation_deferred = models.BooleanField(
+        default=False,
+        help_text='Set when a request could not send the confirmation at once (send rate limit); the background worker then sends it right away.',
+    )
 
     class Meta:
         constraints = [
@@ -154,6 +170,15 @@ class runners(models.Model):
                 condition=Q(tag__isnull=False),
             )
         ]
+        # Lookups by bib, results/placement queries (see check_query_plans)
+        indexes = [
+            models.Index(fields=['race', 'number'], name='runners_race_number_idx'),
+            models.Index(fields=['race', 'total_race_time'], name='runners_race_time_idx'),
+            models.Index(fields=['race', 'gender', 'total_race_time'], name='runners_race_gender_time_idx'),
+            models.Index(fields=['race', 'gender', 'place'], name='runners_race_gender_place_idx'),
+            # Distinct-address check when RaceStats.email_addresses is updated; bulk email recipients
+            models.Index(fields=['race', 'email'], name='runners_race_email_idx'),
+        ]
 
     def clean(self):
         super().clean()
@@ -181,10 +206,33 @@ class laps(models.Model):
     average_speed = models.DecimalField(max_digits=10, decimal_places=2)
     average_pace = models.DurationField()
 
+    class Meta:
+        # Last lap / lap 0 / final lap per runner during timing, and a runner's laps in order
+        indexes = [
+            models.Index(fields=['runner', 'attach_to_race', 'lap'], name='laps_runner_race_lap_idx'),
+            models.Index(fields=['runner', 'lap'], name='laps_runner_lap_idx'),
+        ]
+
     def __str__(self):
         return self.attach_to_race.name + "/" + str(self.runner.number)
 
 
+class LapArchive(models.Model):
+    """
+    Laps of an archived race, moved out of the laps table into one compressed blob
+    (tracker.lap_archive) so the table and its indexes only hold recent races. Read them
+    through tracker.lap_archive, which falls back to the laps table for live races;
+    `manage.py archive_laps` and `restore_laps` move them between the two.
+    """
+    race = models.OneToOneField(race, on_delete=models.CASCADE, primary_key=True, related_name='lap_archive')
+    data = models.BinaryField()
+    lap_count = models.IntegerField(help_text='Laps in the blob')
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f'Lap archive of race {self.race_id}'
+
+
 class BannerQuerySet(models.QuerySet):
     _page_fields = {'home': 'show_on_home', 'signup': 'show_on_signup', 'results': 'show_on_results', 'countdown': 'show_on_countdown'}
 
@@ -255,19 +303,32 @@ class Banner(models.Model):
         return ', '.join(names) if names else '—'
 
 
+def api_key_digest(value):
+    """SHA-256 hex digest of a plaintext API key, as stored in ApiKey.key_digest. Keys are
+    256-bit random tokens, so an unsalted fast hash is enough to keep them out of the table."""
+    return hashlib.sha256((value or '').encode('utf-8')).hexdigest()
+
+
 class ApiKey(models.Model):
+    """API key for timing readers and integrations. Only a digest is stored: the plaintext
+    is generated on first save, available as .key on that instance only, and never again."""
+    KEY_PREFIX_LENGTH = 8
+
     name = models.CharField(max_length=255)
-    key = models.CharField(max_length=64, unique=True)
+    key_prefix = models.CharField(max_length=12, editable=False, help_text='First characters of the key, to tell keys apart')
+    key_digest = models.CharField(max_length=64, unique=True, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
     is_active = models.BooleanField(default=True)
 
     def save(self, *args, **kwargs):
-        if not self.key:
+        if not self.key_digest:
             self.key = secrets.token_urlsafe(32)
+            self.key_prefix = self.key[:self.KEY_PREFIX_LENGTH]
+            self.key_digest = api_key_digest(self.key)
         super().save(*args, **kwargs)
 
     def __str__(self):
-        return f"{self.name} - {self.key[:10]}..."
+        return f"{self.name} - {self.key_prefix}..."
 
 
 class SiteSettings(models.Model):
@@ -320,6 +381,41 @@ class SiteSettings(models.Model):
         return obj
 
 
+class RaceStats(models.Model):
+    """
+    Runner counts for one race, kept current by every runner write (tracker.race_stats) so
+    dashboards and the email form read them in one row instead of scanning runners.
+    Use RaceStats.for_race(); `manage.py reconcile_race_stats` recounts them if they drift.
+    """
+    race = models.OneToOneField(race, on_delete=models.CASCADE, primary_key=True, related_name='stats')
+    registered = models.IntegerField(default=0)
+    paid = models.IntegerField(default=0)
+    finishers = models.IntegerField(default=0, help_text='Runners with a gun time')
+    unassigned = models.IntegerField(default=0, help_text='Runners with neither number nor tag')
+    email_addresses = models.IntegerField(default=0, help_text='Distinct runner emails (bulk email recipients)')
+    unpaid_with_email = models.IntegerField(default=0, help_text='Unpaid runners with an email (payment reminders)')
+    shirt_sizes = models.JSONField(default=dict, help_text='Runner count per shirt size')
+    genders = models.JSONField(default=dict, help_text='Runner count per gender')
+    ages = models.JSONField(default=dict, help_text='Runner count per age bracket')
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = 'Race stats'
+        verbose_name_plural = 'Race stats'
+
+    def __str__(self):
+        return f'Stats for race {self.race_id}'
+
+    @classmethod
+    def for_race(cls, race_id):
+        """The stats row of a race, counted from scratch the first time it is needed."""
+        stats = cls.objects.filter(pk=race_id).first()
+        if stats is None:
+            from .race_stats import recount_race_stats
+            stats = recount_race_stats(race_id)
+        return stats
+
+
 class EmailSendJob(models.Model):
     """Queue entry for sending one bulk email to all runners of a race. Processed by background worker."""
     STATUS_QUEUED = 'queued'
@@ -348,6 +444,74 @@ class EmailSendJob(models.Model):
         ordering = ['created_at']
 
 
+class EmailDelivery(models.Model):
+    """
+    One recipient of an EmailSendJob. Rows are created in bulk when the job is queued; the
+    worker sends them in chunks and records the outcome per recipient, so a failed or
+    interrupted job resumes where it stopped instead of mailing everyone again.
+    """
+    STATUS_PENDING = 'pending'
+    STATUS_SENDING = 'sending'
+    STATUS_SENT = 'sent'
+    STATUS_FAILED = 'failed'
+    STATUS_CHOICES = [
+        (STATUS_PENDING, 'Pending'),
+        (STATUS_SENDING, 'Sending'),
+        (STATUS_SENT, 'Sent'),
+        (STATUS_FAILED, 'Failed'),
+    ]
+    job = models.ForeignKey(EmailSendJob, on_delete=models.CASCADE, related_name='deliveries')
+    runner = models.ForeignKey(runners, on_delete=models.SET_NULL, null=True, blank=True)
+    email = models.EmailField(max_length=254)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=STATUS_PENDING)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(null=True, blank=True, help_text='Retry not before this time (backoff after a failure).')
+    last_error = models.TextField(blank=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['id']
+        indexes = [
+            models.Index(fields=['job', 'status'], name='emaildelivery_job_status_idx'),
+        ]
+        verbose_name_plural = 'Email deliveries'
+
+    def __str__(self):
+        return f"{self.email} ({self.status})"
+
+
+class EmailSendThrottle(models.Model):
+    """
+    Singleton token bucket shared by every process that sends email (web workers, background
+    workers, management commands), so together they stay under the SMTP per-minute cap.
+    Updated with compare-and-swap on version; see email_queue.acquire_email_send_token().
+    """
+    tokens = models.FloatField(default=0)
+    refilled_at = models.DateTimeField()
+    version = models.PositiveBigIntegerField(default=0)
+
+    class Meta:
+        verbose_name = 'Email send throttle'
+        verbose_name_plural = 'Email send throttle'
+
+    def __str__(self):
+        return f'Email send throttle ({self.tokens:.2f} tokens)'
+
+
+class WorkerLease(models.Model):
+    """
+    Leader-election lease for a background loop (e.g. the email job worker). Only the holder
+    of an unexpired lease runs the loop; other processes stay on standby and take over once
+    it expires. See tracker.worker_lease.
+    """
+    name = models.CharField(max_length=64, unique=True)
+    holder = models.CharField(max_length=255)
+    expires_at = models.DateTimeField()
+
+    def __str__(self):
+        return f'{self.name} held by {self.holder} until {self.expires_at}'
+
+
 class PayPalOrder(models.Model):
     """Tracks PayPal Orders v2 REST API orders for audit trail and payment verification."""
     order_id = models.CharField(max_length=64, unique=True, db_index=True, help_text='PayPal order ID')
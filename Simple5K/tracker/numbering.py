@@ -0,0 +1,112 @@
+"""
+Runner number (bib) and RFID tag assignment, done set-based so a whole race is handled
+in a few queries:
+
+- free tags: RfidTag rows at or above the starting number that no runner of the race
+  holds, in tag_number order (one query with NOT EXISTS);
+- free numbers: gaps between the race's taken numbers, found with one window-function
+  query (LAG/LEAD) instead of probing number by number;
+- assignment is saved with bulk_update.
+
+A runner who gets a tag gets its tag_number as runner number, so the two always match.
+"""
+from django.db import transaction
+from django.db.models import Exists, F, OuterRef, Q, Window
+from django.db.models.functions import Lag, Lead
+
+from .models import race, runners, RfidTag
+from .race_cache import bump_race_version
+from .race_stats import runners_updated_in_bulk
+
+
+def free_tags(race_obj, starting, limit):
+    """Up to limit unused tags for race_obj with tag_number >= starting, lowest first."""
+    if limit <= 0:
+        return []
+    held = runners.objects.filter(race=race_obj, tag=OuterRef('pk'))
+    return list(
+        RfidTag.objects
+        .filter(tag_number__gte=starting)
+        .exclude(Exists(held))
+        .order_by('tag_number')[:limit]
+    )
+
+
+def free_numbers(race_obj, starting, count, exclude=()):
+    """The count smallest runner numbers >= starting not used in race_obj (nor in exclude).
+    Finds the gaps between taken numbers in one query: a taken number whose predecessor is
+    more than one below it closes a gap, and the largest one opens the unbounded tail."""
+    if count <= 0:
+        return []
+    exclude = set(exclude)
+    edges = (
+        runners.objects.filter(race=race_obj, number__gte=starting)
+        .annotate(
+            prev_number=Window(Lag('number'), order_by=F('number').asc()),
+            next_number=Window(Lead('number'), order_by=F('number').asc()),
+        )
+        .filter(Q(prev_number__isnull=True) | Q(prev_number__lt=F('number') - 1) | Q(next_number__isnull=True))
+        .order_by('number')
+        .values_list('number', 'prev_number', 'next_number')
+    )
+    gaps = []  # (first, last) inclusive; last None = unbounded
+    tail = starting
+    for number, prev_number, next_number in edges:
+        first = starting if prev_number is None else prev_number + 1
+        if number > first:
+            gaps.append((first, number - 1))
+        if next_number is None:
+            tail = number + 1
+    gaps.append((tail, None))
+
+    numbers = []
+    for first, last in gaps:
+        candidate = first
+        while len(numbers) < count and (last is None or candidate <= last):
+            if candidate not in exclude:
+                numbers.append(candidate)
+            candidate += 1
+        if len(numbers) == count:
+            break
+    return numbers
+
+
+def allocate_numbers(race_obj, count, exclude=()):
+    """Pick numbers (and tags) for count new runners of race_obj: the smallest unused tags
+    >= race.number_start first, then numbers only, filling the smallest gaps. exclude holds
+    numbers not saved yet but already spoken for (explicit numbers in the same batch). The
+    caller must hold the race row lock (select_for_update) until the runners are saved, so
+    concurrent auto-assigns cannot hand out the same tag. Returns a list of (number, tag_or_None)."""
+    if count <= 0:
+        return []
+    exclude = set(exclude)
+    starting = race_obj.number_start or 1
+    tags = free_tags(race_obj, starting, count + len(exclude))
+    allocated = [(tag.tag_number, tag) for tag in tags if tag.tag_number not in exclude][:count]
+    if len(allocated) < count:
+        taken = exclude | {number for number, _ in allocated}
+        allocated += [(number, None) for number in free_numbers(race_obj, starting, count - len(allocated), taken)]
+    return allocated
+
+
+def assign_tags_to_unassigned(race_obj, starting):
+    """Give every runner of race_obj without a number and tag the next unused tag >= starting
+    (runner number = tag number), in signup order, in one transaction under the race lock.
+    Stops when tags run out. Returns (assigned, remaining). May raise IntegrityError if a tag
+    is taken concurrently outside the lock."""
+    with transaction.atomic():
+        race.objects.select_for_update().filter(pk=race_obj.pk).first()
+        unassigned = list(
+            runners.objects.filter(race=race_obj, number__isnull=True, tag__isnull=True).order_by('id')
+        )
+        tags = free_tags(race_obj, starting, len(unassigned))
+        assigned = []
+        for runner, tag in zip(unassigned, tags):
+            runner.number = tag.tag_number
+            runner.tag = tag
+            assigned.append(runner)
+        runners.objects.bulk_update(assigned, ['number', 'tag'], batch_size=500)
+        if assigned:
+            runners_updated_in_bulk(assigned)
+            bump_race_version(race_obj.pk)
+    return len(assigned), len(unassigned) - len(assigned)
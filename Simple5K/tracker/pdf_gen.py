@@ -322,32 +322,64 @@ def generate_race_report(filename, race_data, return_type):
     pdf_data = buffer.getvalue()
 
     if return_type.lower() == "response":
-        response = HttpResponse(content_type='application/pdf')
-        safe_fn = safe_content_disposition_filename(filename) if filename else "report"
-        if not safe_fn.endswith(".pdf"):
-            safe_fn += ".pdf"
-        response['Content-Disposition'] = f'attachment; filename="{safe_fn}"'
-        response.write(pdf_data)
-        return response
+        return race_report_response(filename, pdf_data)
     elif return_type.lower() == "file":
         return pdf_data
     else:
         raise ValueError("Invalid return_type.  Must be 'response' or 'file'.")
 
 
-def create_runner_pdf(buffer, race_obj, runners_queryset, sort_by=None):
-    """Generates a PDF report of runners for a given race.
+def race_report_response(filename, pdf_data):
+    """Wrap already-rendered race report PDF bytes in a download HttpResponse."""
+    response = HttpResponse(content_type='application/pdf')
+    safe_fn = safe_content_disposition_filename(filename) if filename else "report"
+    if not safe_fn.endswith(".pdf"):
+        safe_fn += ".pdf"
+    response['Content-Disposition'] = f'attachment; filename="{safe_fn}"'
+    response.write(pdf_data)
+    return response
+
+
+# Rows fetched per database round trip and rows per platypus Table when building the
+# printable runner list; both bound memory regardless of race size.
+RUNNER_PDF_FETCH_CHUNK = 500
+RUNNER_PDF_TABLE_ROWS = 40
+
+RUNNER_PDF_FIELDS = ('number', 'first_name', 'last_name', 'gender', 'shirt_size', 'type')
+
+
+class _LazyStory(list):
+    """Flowable list for doc.build() that is refilled from an iterator as platypus consumes it,
+    so only a few flowables (one table chunk at a time) exist in memory."""
+    LOOKAHEAD = 4
+
+    def __init__(self, flowables):
+        super().__init__()
+        self._source = iter(flowables)
+
+    def _fill(self):
+        while self._source is not None and list.__len__(self) < self.LOOKAHEAD:
+            try:
+                self.append(next(self._source))
+            except StopIteration:
+                self._source = None
+
+    def __len__(self):
+        self._fill()
+        return list.__len__(self)
+
+
+def create_runner_pdf(output, race_obj, runners_queryset, sort_by=None):
+    """Generates a PDF report of runners for a given race, written to output (a file-like
+    object such as an HttpResponse). Rows are read with values().iterator() and laid out
+    in fixed-size tables, so memory stays flat for very large races.
     When sort_by=='paid', runners are split into Unpaid and Paid tables."""
-    doc = SimpleDocTemplate(buffer, pagesize=letter,
+    from .models import runners
+
+    doc = SimpleDocTemplate(output, pagesize=letter,
                             leftMargin=0.5 * inch, rightMargin=0.5 * inch,
                             topMargin=0.5 * inch, bottomMargin=0.5 * inch)
     styles = getSampleStyleSheet()
-    story = []
-
-    # Title
-    title = f"Runner List: {race_obj.name}"
-    story.append(Paragraph(title, styles['h1']))
-    story.append(Spacer(1, 0.2 * inch))
 
     header = ['Number', 'First Name', 'Last Name', 'Gender', 'Shirt Size', 'Type']
     col_widths = [0.5 * inch, 0.8 * inch, 1.5 * inch, 1.5 * inch, 0.8 * inch, 1.2 * inch]
@@ -363,56 +395,59 @@ def create_runner_pdf(buffer, race_obj, runners_queryset, sort_by=None):
         ('ALIGN', (2, 1), (3, -1), 'LEFT'),
         ('LEFTPADDING', (2, 1), (3, -1), 6),
     ])
+    gender_labels = dict(runners._meta.get_field('gender').choices)
+    shirt_labels = dict(runners._meta.get_field('shirt_size').choices)
+    type_labels = dict(runners._meta.get_field('type').choices)
+
+    def row_for(r):
+        return [
+            r['number'] if r['number'] is not None else 'N/A',
+            r['first_name'],
+            r['last_name'],
+            gender_labels.get(r['gender'], r['gender']) if r['gender'] else 'N/A',
+            shirt_labels.get(r['shirt_size'], r['shirt_size']) if r['shirt_size'] else 'N/A',
+            type_labels.get(r['type'], r['type']) if r['type'] else 'N/A',
+        ]
+
+    def chunk_table(data):
+        table = Table(data, colWidths=col_widths, repeatRows=1)
+        table.setStyle(table_style)
+        return table
 
-    def make_table_rows(runner_list):
+    def table_chunks(queryset, empty_text=None):
+        rows = queryset.values(*RUNNER_PDF_FIELDS).iterator(chunk_size=RUNNER_PDF_FETCH_CHUNK)
         data = [header]
-        for runner in runner_list:
-            try:
-                shirt = runner.get_shirt_size_display() if getattr(runner, 'shirt_size', None) else 'N/A'
-            except (ValueError, AttributeError):
-                shirt = str(getattr(runner, 'shirt_size', '')) or 'N/A'
-            data.append([
-                runner.number if runner.number is not None else 'N/A',
-                runner.first_name,
-                runner.last_name,
-                runner.get_gender_display() if runner.gender else 'N/A',
-                shirt,
-                runner.get_type_display() if runner.type else 'N/A',
-            ])
-        return data
-
-    if sort_by == 'paid':
-        runners_list = list(runners_queryset)
-        unpaid = [r for r in runners_list if not getattr(r, 'paid', False)]
-        paid = [r for r in runners_list if getattr(r, 'paid', False)]
-        # Unpaid section
-        story.append(Paragraph("Unpaid", styles['h2']))
-        story.append(Spacer(1, 0.15 * inch))
-        if unpaid:
-            data = make_table_rows(unpaid)
-            table = Table(data, colWidths=col_widths)
-            table.setStyle(table_style)
-            story.append(table)
+        any_rows = False
+        for r in rows:
+            data.append(row_for(r))
+            if len(data) > RUNNER_PDF_TABLE_ROWS:
+                any_rows = True
+                yield chunk_table(data)
+                data = [header]
+        if len(data) > 1:
+            any_rows = True
+            yield chunk_table(data)
+        if not any_rows and empty_text:
+            yield Paragraph(empty_text, styles['Normal'])
+
+    def story():
+        # Title
+        yield Paragraph(f"Runner List: {race_obj.name}", styles['h1'])
+        yield Spacer(1, 0.2 * inch)
+        if sort_by == 'paid':
+            # Unpaid section
+            yield Paragraph("Unpaid", styles['h2'])
+            yield Spacer(1, 0.15 * inch)
+            yield from table_chunks(runners_queryset.filter(paid=False), "No unpaid runners.")
+            yield Spacer(1, 0.3 * inch)
+            # Paid section
+            yield Paragraph("Paid", styles['h2'])
+            yield Spacer(1, 0.15 * inch)
+            yield from table_chunks(runners_queryset.filter(paid=True), "No paid runners.")
         else:
-            story.append(Paragraph("No unpaid runners.", styles['Normal']))
-        story.append(Spacer(1, 0.3 * inch))
-        # Paid section
-        story.append(Paragraph("Paid", styles['h2']))
-        story.append(Spacer(1, 0.15 * inch))
-        if paid:
-            data = make_table_rows(paid)
-            table = Table(data, colWidths=col_widths)
-            table.setStyle(table_style)
-            story.append(table)
-        else:
-            story.append(Paragraph("No paid runners.", styles['Normal']))
-    else:
-        data = make_table_rows(list(runners_queryset))
-        table = Table(data, colWidths=col_widths)
-        table.setStyle(table_style)
-        story.append(table)
+            yield from table_chunks(runners_queryset)
 
-    doc.build(story)
+    doc.build(_LazyStory(story()))
 
 
 def generate_race_summary_pdf(buffer, summary_data):
@@ -0,0 +1,124 @@
+"""
+Index checks for the timing and results hot-path queries, shared by the test suite
+(tracker.tests.QueryPlanTests) and the check_query_plans diagnostic command.
+
+seed_race() creates a synthetic finished race; hot_path_queries() lists the queries
+record_lap, results and reports run most; plan_problems() runs EXPLAIN on one and says
+whether it scans a whole table, or sorts where an index should give the order. Supports
+SQLite and PostgreSQL; on PostgreSQL call disable_seqscan_and_sort() inside the
+transaction first, so small seeds still show which indexes are usable.
+"""
+import re
+from datetime import date, timedelta
+
+from django.db import connection
+from django.utils import timezone
+
+from .models import race, runners, laps, RfidTag, normalize_rfid_hex
+
+SUPPORTED_VENDORS = ('sqlite', 'postgresql')
+
+
+def _full_scans(plan):
+    """Tables read by a full (sequential) scan in a QuerySet.explain() result."""
+    if connection.vendor == 'postgresql':
+        return re.findall(r'Seq Scan on (\w+)', plan)
+    # SQLite: "SCAN <table>" without "USING [COVERING] INDEX" reads the whole table
+    return re.findall(r'\bSCAN (\w+)(?! USING)', plan)
+
+
+def _sorts(plan):
+    if connection.vendor == 'postgresql':
+        return bool(re.search(r'^\s*(->\s*)?Sort\b', plan, re.M))
+    return 'USE TEMP B-TREE FOR ORDER BY' in plan
+
+
+def disable_seqscan_and_sort():
+    """PostgreSQL only, inside a transaction: make the planner use any usable index."""
+    if connection.vendor == 'postgresql':
+        with connection.cursor() as cursor:
+            cursor.execute('SET LOCAL enable_seqscan = off')
+            cursor.execute('SET LOCAL enable_sort = off')
+
+
+def seed_race(runner_count=200):
+    """Create a finished race with runner_count tagged runners and their laps.
+    Returns (race, a runner, a tag) to plug into hot_path_queries()."""
+    race_obj = race.objects.create(
+        name=f'Query plan check {timezone.now().timestamp()}',
+        status='in_progress',
+        Entry_fee=0,
+        date=date.today(),
+        distance=5000,
+        laps_count=3,
+        min_lap_time=timedelta(minutes=1),
+        start_time=timezone.now(),
+    )
+    base = RfidTag.objects.order_by('-tag_number').values_list('tag_number', flat=True).first() or 0
+    tags = RfidTag.objects.bulk_create([
+        RfidTag(tag_number=base + i + 1, rfid_hex=normalize_rfid_hex(f'PLANCHECK{base + i + 1:08X}'))
+        for i in range(runner_count)
+    ])
+    runners.objects.bulk_create([
+        runners(
+            first_name='Plan', last_name=f'Check{i}', email=f'plan{i}@example.invalid', age='18-34',
+            gender='female' if i % 2 else 'male', shirt_size='Medium', race=race_obj, number=i + 1,
+            tag=tags[i], place=i // 2 + 1, total_race_time=timedelta(minutes=20, seconds=i),
+            race_completed=True,
+        )
+        for i in range(runner_count)
+    ])
+    race_runners = list(runners.objects.filter(race=race_obj).order_by('number'))
+    laps.objects.bulk_create([
+        laps(
+            runner=runner, attach_to_race=race_obj, lap=lap, time=race_obj.start_time + timedelta(minutes=7 * lap),
+            duration=timedelta(minutes=7), average_speed=8, average_pace=timedelta(minutes=7),
+        )
+        for runner in race_runners
+        for lap in range(race_obj.laps_count + 1)
+    ])
+    return race_obj, race_runners[len(race_runners) // 2], tags[len(tags) // 2]
+
+
+def hot_path_queries(seeded):
+    """(label, queryset, ordered) for the queries record_lap, results and reports run most."""
+    race_obj, runner, tag = seeded
+    return [
+        ('tag by hex (record_lap, assign_tag)',
+         RfidTag.objects.filter(rfid_hex=tag.rfid_hex), False),
+        ('runner by race and tag (record_lap)',
+         runners.objects.filter(race=race_obj, tag=tag), False),
+        ('runner by race and number (assign_tag, manual laps)',
+         runners.objects.filter(race=race_obj, number=runner.number), False),
+        ('previous lap (record_lap)',
+         laps.objects.filter(runner=runner, attach_to_race=race_obj).order_by('-lap')[:1], True),
+        ('lap 0 / final lap (chip time)',
+         laps.objects.filter(runner=runner, attach_to_race=race_obj, lap=0)[:1], False),
+        ("runner's laps in order (reports)",
+         laps.objects.filter(runner=runner).order_by('lap'), True),
+        # One query per page; sorting a single race's laps is cheap
+        ("race's laps by runner (results, summary)",
+         laps.objects.filter(attach_to_race=race_obj).order_by('runner_id', 'lap'), False),
+        ('results by place',
+         runners.objects.filter(race=race_obj, gender=runner.gender).order_by('place'), True),
+        ('finishers by time',
+         runners.objects.filter(race=race_obj, total_race_time__isnull=False).order_by('total_race_time'), True),
+        ('faster finishers (overall place)',
+         runners.objects.filter(race=race_obj, total_race_time__lt=runner.total_race_time), False),
+        ('faster finishers of same gender (gender place)',
+         runners.objects.filter(race=race_obj, gender=runner.gender, total_race_time__lt=runner.total_race_time)
+         .order_by('total_race_time'), True),
+    ]
+
+
+def plan_problems(queryset, ordered):
+    """(plan, problems): the EXPLAIN output of queryset and what is wrong with it (empty if
+    it only reads through indexes and, when ordered, in index order)."""
+    plan = queryset.explain()
+    scans = [t for t in _full_scans(plan) if t.startswith('tracker_')]
+    problems = []
+    if scans:
+        problems.append(f"full scan of {', '.join(sorted(set(scans)))}")
+    if ordered and _sorts(plan):
+        problems.append('sorts instead of reading in index order')
+    return plan, problems
@@ -0,0 +1,133 @@
+"""
+Versioned cache of expensive per-race fragments (leaderboard HTML, results JSON).
+
+Each race has a version number in the shared cache; fragment keys include it, so a write
+to the race, its runners or its laps makes every cached fragment of that race unreachable
+at once instead of waiting for a timeout. Saves and deletes bump the version through
+signals; bulk writes (bulk_create, bulk_update, queryset.update) do not send signals and
+must call bump_race_version() themselves.
+
+Fragments hold no user-specific content, so anonymous visitors and logged-in staff share
+them; per-user chrome is rendered around them on every request. With the dummy cache
+backend nothing is cached and every request builds its fragments. Fragments built from
+the read replica are only kept for DATABASE_REPLICA_PIN_SECONDS.
+
+With a per-process cache (CACHE_BACKEND=locmem) a bump is only seen by the process that
+made it, so there versions also move on every LOCAL_TTL_SECONDS and fragments expire
+after that long: other processes serve (or answer an ETag for) data at most that stale.
+"""
+import logging
+import time
+
+from django.conf import settings
+from django.core.cache import cache, caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils.safestring import mark_safe
+
+from .db_router import reading_from_replica
+from .models import race, runners, laps
+
+logger = logging.getLogger(__name__)
+
+# Fragments only go stale through a version bump; the timeout just frees cache space
+FRAGMENT_TIMEOUT = 60 * 60
+
+# Upper bound on how stale a process's fragments get when version bumps are not shared
+LOCAL_TTL_SECONDS = 5
+
+# Pseudo race id for fragments built from all races (the public schedule); bumped
+# whenever any race changes
+SCHEDULE = 'schedule'
+
+
+def _version_key(race_id):
+    return f'tracker:race_version:{race_id}'
+
+
+def _cache_is_shared():
+    """False for the per-process locmem backend, whose bumps other processes never see."""
+    return not isinstance(caches['default'], LocMemCache)
+
+
+def race_version(race_id):
+    """Current version of a race's fragments. Starts at the current time in ms, so a version
+    key evicted from the cache never restarts at a number older fragments were cached under."""
+    key = _version_key(race_id)
+    try:
+        version = cache.get(key)
+        if version is None:
+            cache.add(key, int(time.time() * 1000), None)
+            version = cache.get(key)
+    except Exception:
+        logger.warning('Could not read race version for race %s', race_id, exc_info=True)
+        return None
+    if version is not None and not _cache_is_shared():
+        version = f'{version}-{int(time.time() // LOCAL_TTL_SECONDS)}'
+    return version
+
+
+def bump_race_version(race_id):
+    """Invalidate every cached fragment of a race. Deferred to commit when called inside a
+    transaction, so no request can rebuild a fragment from rows that are about to change."""
+    def bump():
+        key = _version_key(race_id)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.add(key, int(time.time() * 1000), None)
+        except Exception:
+            logger.warning('Could not bump race version for race %s', race_id, exc_info=True)
+    transaction.on_commit(bump)
+
+
+def cached_fragment(name, race_id, build):
+    """Return the named fragment of a race, calling build() only if it is not cached for the
+    race's current version. build() must not depend on the request's user."""
+    version = race_version(race_id)
+    if version is None:
+        return build()
+    key = f'tracker:fragment:{name}:{race_id}:{version}'
+    try:
+        fragment = cache.get(key)
+    except Exception:
+        fragment = None
+    if fragment is None:
+        fragment = build()
+        # Built from a lagging replica, it may predate the write that bumped the version
+        timeout = settings.DATABASE_REPLICA_PIN_SECONDS if reading_from_replica() else FRAGMENT_TIMEOUT
+        if not _cache_is_shared():
+            timeout = min(timeout, LOCAL_TTL_SECONDS)
+        try:
+            cache.set(key, fragment, timeout)
+        except Exception:
+            logger.warning('Could not cache fragment %s of race %s', name, race_id, exc_info=True)
+    return fragment
+
+
+def cached_html_fragment(name, race_id, build):
+    """cached_fragment() for rendered HTML, marked safe for inclusion in a page."""
+    return mark_safe(cached_fragment(name, race_id, lambda: str(build())))
+
+
+@receiver(post_save, sender=race)
+@receiver(post_delete, sender=race)
+def _race_changed(sender, instance, **kwargs):
+    bump_race_version(instance.pk)
+    bump_race_version(SCHEDULE)
+
+
+@receiver(post_save, sender=runners)
+@receiver(post_delete, sender=runners)
+def _runner_changed(sender, instance, **kwargs):
+    if instance.race_id is not None:
+        bump_race_version(instance.race_id)
+
+
+@receiver(post_save, sender=laps)
+@receiver(post_delete, sender=laps)
+def _lap_changed(sender, instance, **kwargs):
+    if instance.attach_to_race_id is not None:
+        bump_race_version(instance.attach_to_race_id)
@@ -0,0 +1,252 @@
+"""
+Keeps RaceStats current as runners are written.
+
+Each runner remembers the values that feed the counters when it is loaded (post_init);
+saving or deleting it applies only the difference to its race's RaceStats row, inside the
+same transaction, under a row lock. Saves that change none of those values (confirmation
+flags, lap times before the finish...) cost nothing. Runners deleted together (a queryset
+or cascade delete) remove a shared email address from email_addresses once.
+
+Bulk writes send no signals: after bulk_update, callers pass the modified runners to
+runners_updated_in_bulk(); after bulk_create they recount the race with recount_race_stats().
+Deleting an RfidTag clears it on its runners (SET_NULL) without runner signals, so the
+races of those runners are recounted. `manage.py reconcile_race_stats` recounts every
+race, for drift from writes made outside the app.
+"""
+from collections import Counter
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, Q
+from django.db.models.signals import post_delete, post_init, post_save, pre_delete
+from django.dispatch import receiver
+
+from .models import RaceStats, RfidTag, runners
+
+# Runner attributes the counters depend on
+TRACKED_FIELDS = ('race_id', 'email', 'paid', 'total_race_time', 'number', 'tag_id', 'shirt_size', 'gender', 'age')
+
+# RaceStats JSON fields holding a count per value of a runner field (keyed by str(value))
+BREAKDOWNS = (('shirt_sizes', 'shirt_size'), ('genders', 'gender'), ('ages', 'age'))
+
+_SNAPSHOT_ATTR = '_race_stats_snapshot'
+_TAG_RACES_ATTR = '_race_stats_tag_races'
+_DELETING_ATTR = '_race_stats_deleting'
+
+
+def count_race(race_id):
+    """Count every RaceStats value of a race from its runners (a few aggregate queries)."""
+    race_runners = runners.objects.filter(race_id=race_id)
+    with_email = Q(email__isnull=False) & ~Q(email='')
+    # Aliased: an aggregate may not share its name with a field it filters on (paid)
+    aggregates = race_runners.aggregate(
+        n_registered=Count('id'),
+        n_paid=Count('id', filter=Q(paid=True)),
+        n_finishers=Count('id', filter=Q(total_race_time__isnull=False)),
+        n_unassigned=Count('id', filter=Q(number__isnull=True, tag__isnull=True)),
+        n_email_addresses=Count('email', filter=with_email, distinct=True),
+        n_unpaid_with_email=Count('id', filter=with_email & Q(paid=False)),
+    )
+    counts = {name.removeprefix('n_'): n for name, n in aggregates.items()}
+    for stats_field, runner_field in BREAKDOWNS:
+        counts[stats_field] = {
+            str(row[runner_field]): row['n']
+            for row in race_runners.exclude(**{f'{runner_field}__isnull': True})
+            .values(runner_field).annotate(n=Count('id')).order_by()
+        }
+    return counts
+
+
+def recount_race_stats(race_id):
+    """Recount a race's stats from its runners and store them; returns the RaceStats row."""
+    counts = count_race(race_id)
+    try:
+        with transaction.atomic():
+            stats, _ = RaceStats.objects.update_or_create(race_id=race_id, defaults=counts)
+    except IntegrityError:
+        # Created concurrently by another writer; overwrite it with this count
+        RaceStats.objects.filter(race_id=race_id).update(**counts)
+        stats = RaceStats.objects.get(race_id=race_id)
+    return stats
+
+
+def _values(instance):
+    """Tracked values as loaded, or None if some were deferred (.only()/.defer())."""
+    values = {}
+    for field in TRACKED_FIELDS:
+        if field not in instance.__dict__:
+            return None
+        values[field] = instance.__dict__[field]
+    values['total_race_time'] = values['total_race_time'] is not None
+    return values
+
+
+def _contribution(values):
+    """What one runner adds to their race's counters."""
+    c = Counter(registered=1)
+    if values['paid']:
+        c['paid'] += 1
+    if values['total_race_time']:
+        c['finishers'] += 1
+    if values['number'] is None and values['tag_id'] is None:
+        c['unassigned'] += 1
+    if values['email'] and not values['paid']:
+        c['unpaid_with_email'] += 1
+    for stats_field, runner_field in BREAKDOWNS:
+        if values[runner_field] is not None:
+            c[(stats_field, values[runner_field])] += 1
+    return c
+
+
+def _address_is_unique(race_id, email, exclude_pk):
+    """True if no runner of race_id other than exclude_pk has this email."""
+    others = runners.objects.filter(race_id=race_id, email=email)
+    if exclude_pk is not None:
+        others = others.exclude(pk=exclude_pk)
+    return not others.exists()
+
+
+def _apply(race_id, delta, address_changes=()):
+    """Add delta to the race's counters. address_changes are (sign, email, runner_pk): the
+    runner gained (+1) or lost (-1) that address, which changes email_addresses only if no
+    other runner of the race has it; checked under the row lock, after concurrent writers
+    to the same race have committed."""
+    delta = {key: n for key, n in delta.items() if n}
+    address_changes = [change for change in address_changes if change[1]]
+    if not delta and not address_changes:
+        return
+    with transaction.atomic():
+        stats = RaceStats.objects.select_for_update().filter(pk=race_id).first()
+        if stats is None:
+            # First write seen for this race: count it whole (this write included)
+            recount_race_stats(race_id)
+            return
+        for sign, email, runner_pk in address_changes:
+            if _address_is_unique(race_id, email, runner_pk):
+                stats.email_addresses += sign
+        for key, n in delta.items():
+            if isinstance(key, tuple):
+                stats_field, value = key
+                value = str(value)  # JSON object keys are strings
+                breakdown = getattr(stats, stats_field)
+                breakdown[value] = breakdown.get(value, 0) + n
+                if breakdown[value] <= 0:
+                    del breakdown[value]
+            else:
+                setattr(stats, key, getattr(stats, key) + n)
+        stats.save()
+
+
+def _apply_change(instance, before, after, address=True):
+    """Apply the counter changes of one runner going from before to after (None = absent).
+    address=False leaves email_addresses alone (another runner accounts for the address)."""
+    deltas = {}
+    addresses = {}
+    if before is not None:
+        deltas.setdefault(before['race_id'], Counter()).subtract(_contribution(before))
+    if after is not None:
+        deltas.setdefault(after['race_id'], Counter()).update(_contribution(after))
+    old_address = (before['race_id'], before['email']) if before else None
+    new_address = (after['race_id'], after['email']) if after else None
+    if address and old_address != new_address:
+        if old_address:
+            addresses.setdefault(old_address[0], []).append((-1, old_address[1], instance.pk))
+        if new_address:
+            addresses.setdefault(new_address[0], []).append((1, new_address[1], instance.pk))
+    for race_id, delta in deltas.items():
+        _apply(race_id, delta, addresses.get(race_id, ()))
+
+
+def runners_updated_in_bulk(instances):
+    """Apply the counter changes of runners saved with bulk_update (or queryset.update),
+    which sends no signals. instances must be the loaded-then-modified objects, which still
+    remember their loaded values. One locked update per race; races where an email changed
+    are recounted instead, since the distinct-address check assumes one runner at a time."""
+    deltas = {}
+    recount = set()
+    for instance in instances:
+        before = getattr(instance, _SNAPSHOT_ATTR, None)
+        after = _values(instance)
+        if (before is None or after is None or before['email'] != after['email']
+                or before['race_id'] != after['race_id']):
+            recount.update(v['race_id'] for v in (before, after) if v is not None)
+            recount.add(instance.race_id)
+        elif before != after:
+            delta = deltas.setdefault(after['race_id'], Counter())
+            delta.subtract(_contribution(before))
+            delta.update(_contribution(after))
+        setattr(instance, _SNAPSHOT_ATTR, after)
+    for race_id in recount:
+        recount_race_stats(race_id)
+    for race_id, delta in deltas.items():
+        if race_id not in recount:
+            _apply(race_id, delta)
+
+
+@receiver(post_init, sender=runners)
+def _remember_values(sender, instance, **kwargs):
+    if instance.pk is not None:
+        setattr(instance, _SNAPSHOT_ATTR, _values(instance))
+
+
+@receiver(post_save, sender=runners)
+def _runner_saved(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    after = _values(instance)
+    if created:
+        before = None
+    else:
+        before = getattr(instance, _SNAPSHOT_ATTR, None)
+        if before is None or after is None:
+            # Loaded with deferred fields (or constructed by hand): the old values are
+            # unknown, so recount the race instead of guessing
+            recount_race_stats(instance.race_id)
+            setattr(instance, _SNAPSHOT_ATTR, after)
+            return
+    if before != after:
+        _apply_change(instance, before, after)
+    setattr(instance, _SNAPSHOT_ATTR, after)
+
+
+def _deleting(origin, instance):
+    """{(race_id, email): pks} of the runners deleted together with instance. Kept on the
+    deletion's origin (the queryset or instance delete() was called on), which is the same
+    object for every signal of one delete."""
+    target = origin if origin is not None else instance
+    deleting = getattr(target, _DELETING_ATTR, None)
+    if deleting is None:
+        deleting = {}
+        setattr(target, _DELETING_ATTR, deleting)
+    return deleting
+
+
+@receiver(pre_delete, sender=runners)
+def _remember_deleted_address(sender, instance, origin=None, **kwargs):
+    # A multi-row delete (queryset, admin action, cascade) removes every row before the
+    # first post_delete: record who is going, so an address shared by several of them is
+    # only taken off email_addresses once
+    before = getattr(instance, _SNAPSHOT_ATTR, None) or _values(instance)
+    if before is not None and before['email']:
+        _deleting(origin, instance).setdefault((before['race_id'], before['email']), set()).add(instance.pk)
+
+
+@receiver(post_delete, sender=runners)
+def _runner_deleted(sender, instance, origin=None, **kwargs):
+    before = getattr(instance, _SNAPSHOT_ATTR, None) or _values(instance)
+    if before is None:
+        recount_race_stats(instance.race_id)
+        return
+    same_address = _deleting(origin, instance).get((before['race_id'], before['email']), {instance.pk})
+    _apply_change(instance, before, None, address=instance.pk == min(same_address))
+
+
+@receiver(pre_delete, sender=RfidTag)
+def _remember_tag_races(sender, instance, **kwargs):
+    # runners.tag is SET_NULL: deleting a tag clears it on its runners without signals
+    setattr(instance, _TAG_RACES_ATTR, set(runners.objects.filter(tag=instance).values_list('race_id', flat=True)))
+
+
+@receiver(post_delete, sender=RfidTag)
+def _tag_deleted(sender, instance, **kwargs):
+    for race_id in getattr(instance, _TAG_RACES_ATTR, ()):
+        recount_race_stats(race_id)
@@ -0,0 +1,176 @@
+"""
+Cache of rendered per-runner race report PDFs, plus a low-priority background
+worker that pre-renders a runner's report as soon as they cross the finish line, and
+every finisher's report again once the race is marked completed. Downloads and results
+emails then read the PDF from the cache instead of rendering it on demand.
+
+Entries are keyed by race, runner and a digest of the data that runner's report shows
+(prepare_race_data, a few queries), so writes that do not change it (other runners' laps,
+unrelated edits) keep the entry, while a report whose placings changed since it was
+rendered (e.g. more finishers came in) is rendered again.
+"""
+import hashlib
+import json
+import logging
+import queue
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# Cache alias holding rendered PDFs (see settings.CACHES['reports'])
+REPORT_CACHE_ALIAS = 'reports'
+
+# Pending pre-renders; when full (finish-line burst) further requests are dropped and
+# those reports are rendered on demand instead.
+PRERENDER_QUEUE_SIZE = 200
+
+# Throttle: render at most one report per this many seconds...
+PRERENDER_MIN_INTERVAL_SECONDS = 1.0
+# ...and only once record_lap has been quiet for this long, so lap ingest keeps the CPU
+# during a burst of finishers.
+PRERENDER_INGEST_QUIET_SECONDS = 2.0
+# Never defer a pending render longer than this, even if ingest never goes quiet.
+PRERENDER_MAX_DEFER_SECONDS = 30.0
+
+_prerender_queue = queue.Queue(maxsize=PRERENDER_QUEUE_SIZE)
+_pending = set()
+_pending_lock = threading.Lock()
+_last_ingest_activity = 0.0
+
+
+def _report_cache():
+    from django.core.cache import caches
+    from django.core.cache.backends.base import InvalidCacheBackendError
+
+    try:
+        return caches[REPORT_CACHE_ALIAS]
+    except InvalidCacheBackendError:
+        return caches['default']
+
+
+def _report_cache_key(race_id, runner_id, race_data):
+    payload = json.dumps(race_data, sort_keys=True, default=str).encode('utf-8')
+    return f'race_report:{race_id}:{runner_id}:{hashlib.sha256(payload).hexdigest()}'
+
+
+def render_race_report(race_obj, runner_obj):
+    """Return the race report PDF bytes of runner_obj, from the cache when the report's data
+    has not changed since it was rendered; otherwise render and cache it."""
+    from .pdf_gen import generate_race_report
+    from .views import prepare_race_data
+
+    race_data = prepare_race_data(race_obj, runner_obj)
+    key = _report_cache_key(race_obj.pk, runner_obj.pk, race_data)
+    cache = _report_cache()
+    try:
+        pdf_data = cache.get(key)
+    except Exception as e:
+        logger.warning("Report cache read failed: %s", e)
+        pdf_data = None
+    if pdf_data is not None:
+        return pdf_data
+    pdf_data = generate_race_report('', race_data, 'file')
+    try:
+        cache.set(key, pdf_data)
+    except Exception as e:
+        logger.warning("Report cache write failed: %s", e)
+    return pdf_data
+
+
+def note_ingest_activity():
+    """Called by record_lap so the pre-render worker backs off while laps are arriving."""
+    global _last_ingest_activity
+    _last_ingest_activity = time.monotonic()
+
+
+def enqueue_report_prerender(runner_id, race_id):
+    """Queue a background pre-render of one runner's report once the current transaction
+    commits, so the worker never renders uncommitted data (non-blocking; duplicates and
+    overflow are dropped)."""
+    from django.db import transaction
+
+    transaction.on_commit(lambda: _enqueue(runner_id, race_id))
+
+
+def enqueue_race_prerender(race_id):
+    """Queue a background pre-render of every finisher's report once the current transaction
+    commits; called when the race is marked completed, after which placings stop changing."""
+    enqueue_report_prerender(None, race_id)
+
+
+def _enqueue(runner_id, race_id):
+    item = (runner_id, race_id)
+    with _pending_lock:
+        if item in _pending:
+            return
+        try:
+            _prerender_queue.put_nowait(item)
+        except queue.Full:
+            logger.debug("Report pre-render queue full; runner pk=%s will render on demand", runner_id)
+            return
+        _pending.add(item)
+    start_report_prerender_worker()
+
+
+def _wait_for_quiet_ingest():
+    deadline = time.monotonic() + PRERENDER_MAX_DEFER_SECONDS
+    while time.monotonic() < deadline:
+        idle = time.monotonic() - _last_ingest_activity
+        if idle >= PRERENDER_INGEST_QUIET_SECONDS:
+            return
+        time.sleep(PRERENDER_INGEST_QUIET_SECONDS - idle)
+
+
+def _prerender_loop():
+    from django.db import connection
+
+    from .models import race, runners
+
+    while True:
+        item = _prerender_queue.get()
+        runner_id, race_id = item
+        with _pending_lock:
+            _pending.discard(item)
+        try:
+            _wait_for_quiet_ingest()
+            race_obj = race.objects.filter(pk=race_id).first()
+            if race_obj and runner_id is None:
+                _prerender_race(race_obj)
+            else:
+                runner_obj = runners.objects.filter(pk=runner_id, race_id=race_id).first()
+                if race_obj and runner_obj:
+                    render_race_report(race_obj, runner_obj)
+        except Exception as e:
+            logger.exception("Report pre-render failed for runner pk=%s: %s", runner_id, e)
+        finally:
+            try:
+                connection.close()
+            except Exception as e:
+                logger.debug("Connection close in report pre-render loop: %s", e)
+        time.sleep(PRERENDER_MIN_INTERVAL_SECONDS)
+
+
+def _prerender_race(race_obj):
+    from .models import runners
+
+    finishers = runners.objects.filter(race=race_obj, total_race_time__isnull=False).order_by('pk')
+    for runner_obj in finishers.iterator():
+        render_race_report(race_obj, runner_obj)
+        time.sleep(PRERENDER_MIN_INTERVAL_SECONDS)
+        _wait_for_quiet_ingest()
+
+
+_prerender_worker_started = False
+_prerender_worker_lock = threading.Lock()
+
+
+def start_report_prerender_worker():
+    """Start the background report pre-render thread (idempotent)."""
+    global _prerender_worker_started
+    with _prerender_worker_lock:
+        if _prerender_worker_started:
+            return
+        _prerender_worker_started = True
+    t = threading.Thread(target=_prerender_loop, daemon=True)
+    t.start()
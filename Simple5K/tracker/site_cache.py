@@ -0,0 +1,95 @@
+"""
+Per-process cache of the SiteSettings singleton and the active banners of each public
+page, so the context processor and public pages render without querying them.
+
+Saving or deleting a SiteSettings or Banner row clears this process's copy and bumps a
+version number in the shared cache (CACHE_BACKEND); other processes compare that version
+on each read and reload when it changed. With a per-process or dummy cache backend other
+processes do not see the bump, so every copy is also reloaded after LOCAL_TTL_SECONDS.
+
+Cached instances are shared between requests: treat them as read-only. Code that edits
+site settings must load its own instance with SiteSettings.get_settings().
+"""
+import logging
+import threading
+import time
+
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import Banner, SiteSettings
+
+logger = logging.getLogger(__name__)
+
+# Shared-cache key holding the site content version
+VERSION_KEY = 'tracker:site_content_version'
+
+# Upper bound on how stale a process's copy can get when the version bump is not shared
+LOCAL_TTL_SECONDS = 60
+
+_lock = threading.Lock()
+_state = {'version': None, 'loaded_at': 0.0, 'settings': None, 'banners': {}}
+
+
+def _shared_version():
+    try:
+        return cache.get(VERSION_KEY)
+    except Exception:
+        logger.warning('Could not read site content version from the cache', exc_info=True)
+        return None
+
+
+def _fresh_state():
+    """The process state, emptied first if another process changed the content or it expired."""
+    version = _shared_version()
+    with _lock:
+        if version != _state['version'] or time.monotonic() - _state['loaded_at'] > LOCAL_TTL_SECONDS:
+            _state.update(version=version, loaded_at=time.monotonic(), settings=None, banners={})
+        return _state
+
+
+def get_site_settings():
+    """The SiteSettings singleton, from this process's cache when current."""
+    state = _fresh_state()
+    settings_obj = state['settings']
+    if settings_obj is None:
+        settings_obj = SiteSettings.get_settings()
+        with _lock:
+            state['settings'] = settings_obj
+    return settings_obj
+
+
+def active_banners(page_slug):
+    """List of active banners for a page slug (see Banner.PAGE_*), cached like get_site_settings()."""
+    state = _fresh_state()
+    banners = state['banners'].get(page_slug)
+    if banners is None:
+        # From the primary even inside @replica_reads views, so a lagging replica cannot
+        # repopulate the cache with banners from before the change that invalidated it
+        banners = list(Banner.objects.db_manager(DEFAULT_DB_ALIAS).active_for_page(page_slug))
+        with _lock:
+            state['banners'][page_slug] = banners
+    return banners
+
+
+def invalidate():
+    """Drop this process's copy and bump the shared version so other processes reload."""
+    with _lock:
+        _state.update(loaded_at=0.0, settings=None, banners={})
+    try:
+        if not cache.add(VERSION_KEY, 1, None):
+            cache.incr(VERSION_KEY)
+    except Exception:
+        logger.warning('Could not bump site content version; other processes refresh within %ss',
+                       LOCAL_TTL_SECONDS, exc_info=True)
+
+
+@receiver(post_save, sender=SiteSettings)
+@receiver(post_delete, sender=SiteSettings)
+@receiver(post_save, sender=Banner)
+@receiver(post_delete, sender=Banner)
+def _site_content_changed(sender, **kwargs):
+    # After commit, so no process reloads the old rows under the new version
+    transaction.on_commit(invalidate)
@@ -0,0 +1,167 @@
+"""
+Local SMTP stand-in for measuring the email subsystem without a real mail provider.
+Accepts plain (no TLS) SMTP, records every message with its timing, and can inject
+per-message latency, temporary failures and dropped connections.
+
+Used by the `smtp_sink` and `email_benchmark` management commands.
+"""
+import random
+import socketserver
+import threading
+import time
+
+
+class SinkMessage:
+    """One accepted (or deliberately failed) message as seen by the sink."""
+
+    def __init__(self, recipients, size, started_at, finished_at, accepted):
+        self.recipients = recipients
+        self.size = size
+        self.started_at = started_at  # MAIL FROM received (time.monotonic())
+        self.finished_at = finished_at  # reply to DATA sent
+        self.accepted = accepted
+
+    @property
+    def duration(self):
+        return self.finished_at - self.started_at
+
+
+class _SmtpHandler(socketserver.StreamRequestHandler):
+    """Minimal SMTP dialogue: EHLO/HELO, AUTH (any credentials), MAIL, RCPT, DATA, RSET,
+    NOOP, QUIT. STARTTLS is not offered, so clients must have TLS disabled."""
+
+    def reply(self, line):
+        self.wfile.write(line.encode('ascii') + b'\r\n')
+
+    def handle(self):
+        sink = self.server.sink
+        sink._connection_opened()
+        self.reply('220 simple5k-smtp-sink ESMTP ready')
+        recipients = []
+        started_at = None
+        while True:
+            raw = self.rfile.readline()
+            if not raw:
+                return
+            line = raw.decode('utf-8', 'replace').rstrip('\r\n')
+            command = line[:4].upper()
+            if command == 'EHLO':
+                self.reply('250-simple5k-smtp-sink')
+                self.reply('250-AUTH PLAIN LOGIN')
+                self.reply('250 8BITMIME')
+            elif command == 'HELO':
+                self.reply('250 simple5k-smtp-sink')
+            elif command == 'AUTH':
+                parts = line.split()
+                if len(parts) >= 2 and parts[1].upper() == 'LOGIN':
+                    # Username and password prompts; any values are accepted
+                    for prompt in ('334 VXNlcm5hbWU6', '334 UGFzc3dvcmQ6'):
+                        self.reply(prompt)
+                        self.rfile.readline()
+                elif len(parts) == 2:
+                    self.reply('334 ')
+                    self.rfile.readline()
+                self.reply('235 2.7.0 Authentication successful')
+            elif command == 'MAIL':
+                recipients = []
+                started_at = time.monotonic()
+                self.reply('250 OK')
+            elif command == 'RCPT':
+                recipients.append(line.split(':', 1)[-1].strip().strip('<>'))
+                self.reply('250 OK')
+            elif command == 'DATA':
+                self.reply('354 End data with <CR><LF>.<CR><LF>')
+                size = 0
+                while True:
+                    data_line = self.rfile.readline()
+                    if not data_line or data_line in (b'.\r\n', b'.\n'):
+                        break
+                    size += len(data_line)
+                accepted, disconnect = sink._decide()
+                if sink.latency:
+                    time.sleep(sink.latency)
+                if disconnect:
+                    sink._record(SinkMessage(recipients, size, started_at or time.monotonic(), time.monotonic(), False))
+                    return
+                self.reply('250 2.0.0 Queued' if accepted else '451 4.3.0 Injected temporary failure')
+                sink._record(SinkMessage(recipients, size, started_at or time.monotonic(), time.monotonic(), accepted))
+                recipients = []
+                started_at = None
+            elif command == 'RSET':
+                recipients = []
+                started_at = None
+                self.reply('250 OK')
+            elif command == 'NOOP':
+                self.reply('250 OK')
+            elif command == 'QUIT':
+                self.reply('221 Bye')
+                return
+            else:
+                self.reply('502 5.5.2 Command not recognized')
+
+
+class _ThreadingSmtpServer(socketserver.ThreadingMixIn, socketserver.TCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+class SmtpSink:
+    """
+    Threaded local SMTP server. Start with start(); stats are available while it runs.
+    latency: seconds added before answering each DATA.
+    fail_rate: fraction (0-1) of messages answered with a temporary failure (451).
+    disconnect_every: drop the connection instead of answering every Nth message (0 = never).
+    """
+
+    def __init__(self, host='127.0.0.1', port=0, latency=0.0, fail_rate=0.0, disconnect_every=0, seed=None):
+        self.latency = latency
+        self.fail_rate = fail_rate
+        self.disconnect_every = disconnect_every
+        self.messages = []
+        self.connections = 0
+        self._count = 0
+        self._lock = threading.Lock()
+        self._random = random.Random(seed)
+        self._server = _ThreadingSmtpServer((host, port), _SmtpHandler)
+        self._server.sink = self
+        self._thread = None
+
+    @property
+    def address(self):
+        return self._server.server_address[:2]
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+        return False
+
+    def _connection_opened(self):
+        with self._lock:
+            self.connections += 1
+
+    def _decide(self):
+        """Returns (accepted, disconnect) for the next message."""
+        with self._lock:
+            self._count += 1
+            if self.disconnect_every and self._count % self.disconnect_every == 0:
+                return False, True
+            return self._random.random() >= self.fail_rate, False
+
+    def _record(self, message):
+        with self._lock:
+            self.messages.append(message)
+
+    def accepted_messages(self):
+        with self._lock:
+            return [m for m in self.messages if m.accepted]
@@ -0,0 +1,182 @@
+"""
+Django cache backend stored in a local SQLite file, so every gunicorn worker on the host
+shares one cache without Redis or memcached. Select it with CACHE_BACKEND=sqlite.
+
+The file runs in WAL mode: readers never block each other or the writer, and writes are
+short single-row transactions. Entries past MAX_ENTRIES are evicted least recently used
+first (approximately: last-access times are refreshed at most every ACCESS_GRANULARITY
+seconds, and the size is checked every CULL_EVERY writes per process). incr/decr are
+atomic across processes, which the login rate limiter relies on.
+
+LOCATION is the database file path; its directory is created if needed and must be
+writable by every app process. Use a local disk: SQLite locking is unreliable on network
+file systems.
+"""
+import os
+import pickle
+import sqlite3
+import threading
+import time
+
+from django.core.cache.backends.base import DEFAULT_TIMEOUT, BaseCache
+
+# Refresh an entry's last-access time on read at most this often (seconds), so hot keys
+# do not turn every cache hit into a write
+ACCESS_GRANULARITY = 10
+
+# Expired-entry cleanup and LRU size check run once per this many writes (per process)
+CULL_EVERY = 100
+
+# Wait this long (ms) for another process's write to finish before giving up
+BUSY_TIMEOUT_MS = 5000
+
+_SCHEMA = (
+    'CREATE TABLE IF NOT EXISTS cache_entry ('
+    ' key TEXT PRIMARY KEY, value BLOB NOT NULL, expires REAL, accessed REAL NOT NULL'
+    ') WITHOUT ROWID',
+    'CREATE INDEX IF NOT EXISTS cache_entry_accessed ON cache_entry (accessed)',
+    'CREATE INDEX IF NOT EXISTS cache_entry_expires ON cache_entry (expires)',
+)
+
+
+class SQLiteCache(BaseCache):
+    pickle_protocol = pickle.HIGHEST_PROTOCOL
+
+    def __init__(self, location, params):
+        super().__init__(params)
+        self._path = location
+        self._local = threading.local()
+        self._writes = 0
+        self._writes_lock = threading.Lock()
+
+    def _connection(self):
+        """One connection per thread (and per process, in case of fork)."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None and self._local.pid == os.getpid():
+            return conn
+        directory = os.path.dirname(self._path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        conn = sqlite3.connect(self._path, timeout=BUSY_TIMEOUT_MS / 1000.0, isolation_level=None)
+        conn.execute(f'PRAGMA busy_timeout = {BUSY_TIMEOUT_MS}')
+        conn.execute('PRAGMA journal_mode = WAL')
+        # A crash can lose the last writes, never corrupt the file; fine for a cache
+        conn.execute('PRAGMA synchronous = NORMAL')
+        for statement in _SCHEMA:
+            conn.execute(statement)
+        self._local.conn = conn
+        self._local.pid = os.getpid()
+        return conn
+
+    def _expiry(self, timeout):
+        return self.get_backend_timeout(timeout)  # absolute time, or None for never
+
+    def _wrote(self, conn, now):
+        with self._writes_lock:
+            self._writes += 1
+            due = self._writes % CULL_EVERY == 0
+        if due:
+            self._cull(conn, now)
+
+    def _cull(self, conn, now):
+        conn.execute('DELETE FROM cache_entry WHERE expires IS NOT NULL AND expires <= ?', (now,))
+        count = conn.execute('SELECT COUNT(*) FROM cache_entry').fetchone()[0]
+        if count > self._max_entries:
+            # Evict least recently used down to (1 - 1/CULL_FREQUENCY) of MAX_ENTRIES
+            keep = self._max_entries - self._max_entries // max(self._cull_frequency, 1)
+            conn.execute(
+                'DELETE FROM cache_entry WHERE key IN '
+                '(SELECT key FROM cache_entry ORDER BY accessed LIMIT ?)',
+                (count - keep,),
+            )
+
+    def get(self, key, default=None, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        conn = self._connection()
+        now = time.time()
+        row = conn.execute('SELECT value, expires, accessed FROM cache_entry WHERE key = ?', (key,)).fetchone()
+        if row is None:
+            return default
+        value, expires, accessed = row
+        if expires is not None and expires <= now:
+            conn.execute('DELETE FROM cache_entry WHERE key = ? AND expires <= ?', (key, now))
+            return default
+        if accessed < now - ACCESS_GRANULARITY:
+            conn.execute('UPDATE cache_entry SET accessed = ? WHERE key = ?', (now, key))
+        return pickle.loads(value)
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        conn = self._connection()
+        now = time.time()
+        conn.execute(
+            'INSERT OR REPLACE INTO cache_entry (key, value, expires, accessed) VALUES (?, ?, ?, ?)',
+            (key, pickle.dumps(value, self.pickle_protocol), self._expiry(timeout), now),
+        )
+        self._wrote(conn, now)
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        conn = self._connection()
+        now = time.time()
+        # Insert, or replace only an expired entry; atomic, so exactly one concurrent add wins
+        cursor = conn.execute(
+            'INSERT INTO cache_entry (key, value, expires, accessed) VALUES (?, ?, ?, ?) '
+            'ON CONFLICT (key) DO UPDATE SET value = excluded.value, expires = excluded.expires, '
+            'accessed = excluded.accessed WHERE cache_entry.expires IS NOT NULL AND cache_entry.expires <= ?',
+            (key, pickle.dumps(value, self.pickle_protocol), self._expiry(timeout), now, now),
+        )
+        added = cursor.rowcount == 1
+        if added:
+            self._wrote(conn, now)
+        return added
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        now = time.time()
+        cursor = self._connection().execute(
+            'UPDATE cache_entry SET expires = ?, accessed = ? WHERE key = ? AND (expires IS NULL OR expires > ?)',
+            (self._expiry(timeout), now, key, now),
+        )
+        return cursor.rowcount == 1
+
+    def delete(self, key, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        cursor = self._connection().execute('DELETE FROM cache_entry WHERE key = ?', (key,))
+        return cursor.rowcount == 1
+
+    def has_key(self, key, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        row = self._connection().execute(
+            'SELECT 1 FROM cache_entry WHERE key = ? AND (expires IS NULL OR expires > ?)', (key, time.time())
+        ).fetchone()
+        return row is not None
+
+    def incr(self, key, delta=1, version=None):
+        """Atomic across processes: the read and write share one IMMEDIATE transaction."""
+        key = self.make_and_validate_key(key, version=version)
+        conn = self._connection()
+        now = time.time()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            row = conn.execute('SELECT value, expires FROM cache_entry WHERE key = ?', (key,)).fetchone()
+            if row is None or (row[1] is not None and row[1] <= now):
+                raise ValueError("Key '%s' not found" % key)
+            new_value = pickle.loads(row[0]) + delta
+            conn.execute(
+                'UPDATE cache_entry SET value = ?, accessed = ? WHERE key = ?',
+                (pickle.dumps(new_value, self.pickle_protocol), now, key),
+            )
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+        conn.execute('COMMIT')
+        return new_value
+
+    def clear(self):
+        self._connection().execute('DELETE FROM cache_entry')
+
+    def close(self, **kwargs):
+        # Keep the per-thread connection open across requests; SQLite connections are cheap
+        # to hold and reopening would redo the PRAGMAs on every request.
+        pass
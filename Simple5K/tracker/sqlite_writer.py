@@ -0,0 +1,106 @@
+"""
+Single writer for lap and runner writes in SQLite race-day mode (SQLITE_RACE_DAY=TRUE).
+
+SQLite allows one writer at a time; with several gunicorn workers and threads writing
+at once, a writer that waits longer than busy_timeout fails with "database is locked".
+Views decorated with @single_writer instead hand their POST requests to one writer thread
+per process, in arrival order, and that thread takes a lock file next to the database
+around each request, so only one app writer touches the database at any moment and
+nobody waits on SQLite's lock. Waiting for the writer has no timeout: a slow moment
+delays a lap, it never drops it.
+
+Outside race-day mode (or on PostgreSQL/MySQL) the decorator calls the view directly.
+"""
+import os
+import queue
+import threading
+from concurrent.futures import Future
+from functools import wraps
+
+from django.conf import settings
+
+try:
+    import fcntl
+except ImportError:  # Windows: the lock then only serializes writers within one process
+    fcntl = None
+
+
+_SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+_jobs = queue.Queue()
+_writer_thread = None
+_writer_pid = None
+_writer_lock = threading.Lock()
+
+
+def race_day_mode():
+    return getattr(settings, 'SQLITE_RACE_DAY', False)
+
+
+def _lock_path():
+    return f"{settings.DATABASES['default']['NAME']}.writer.lock"
+
+
+class _ProcessWriteLock:
+    """Exclusive lock shared by every process writing to the same database file."""
+
+    def __init__(self, path):
+        self._file = open(path, 'a+') if fcntl else None
+
+    def __enter__(self):
+        if self._file:
+            fcntl.flock(self._file, fcntl.LOCK_EX)
+
+    def __exit__(self, *exc):
+        if self._file:
+            fcntl.flock(self._file, fcntl.LOCK_UN)
+
+
+def _writer_loop():
+    from django.db import close_old_connections
+
+    lock = _ProcessWriteLock(_lock_path())
+    while True:
+        future, func, args, kwargs = _jobs.get()
+        if not future.set_running_or_notify_cancel():
+            continue
+        try:
+            close_old_connections()
+            with lock:
+                result = func(*args, **kwargs)
+        except BaseException as e:
+            future.set_exception(e)
+        else:
+            future.set_result(result)
+
+
+def _start_writer():
+    """Start this process's writer thread (idempotent; restarted in a forked child)."""
+    global _writer_thread, _writer_pid
+    with _writer_lock:
+        if _writer_thread is None or _writer_pid != os.getpid() or not _writer_thread.is_alive():
+            _writer_thread = threading.Thread(target=_writer_loop, name='sqlite-writer', daemon=True)
+            _writer_pid = os.getpid()
+            _writer_thread.start()
+
+
+def run_serialized(func, *args, **kwargs):
+    """Run func on this process's writer thread, under the database's writer lock, and
+    return its result (or raise its exception). Runs func directly outside race-day mode,
+    and when already on the writer thread."""
+    if not race_day_mode() or threading.current_thread() is _writer_thread:
+        return func(*args, **kwargs)
+    _start_writer()
+    future = Future()
+    _jobs.put((future, func, args, kwargs))
+    return future.result()
+
+
+def single_writer(view_func):
+    """Queue the view's write requests (anything but GET/HEAD/OPTIONS) for the writer thread."""
+    @wraps(view_func)
+    def wrapped_view(request, *args, **kwargs):
+        if request.method in _SAFE_METHODS:
+            return view_func(request, *args, **kwargs)
+        return run_serialized(view_func, request, *args, **kwargs)
+    return wrapped_view
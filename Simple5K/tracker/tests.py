@@ -1,3 +1,151 @@
-from django.test import TestCase
+from datetime import date, timedelta
+from unittest import skipUnless
+from unittest.mock import patch
 
-# Create your tests here.
+from django.core.cache import caches
+from django.db import connection
+from django.test import TestCase, override_settings
+
+from .models import race, runners, RaceStats, RfidTag
+from .race_stats import count_race, runners_updated_in_bulk
+from .report_cache import render_race_report
+from .query_plans import SUPPORTED_VENDORS, disable_seqscan_and_sort, hot_path_queries, plan_problems, seed_race
+
+
+@skipUnless(connection.vendor in SUPPORTED_VENDORS, 'query plan checks support SQLite and PostgreSQL')
+class QueryPlanTests(TestCase):
+    """The timing and results hot-path queries must keep using indexes: each fails if its
+    plan scans a whole tracker table, or sorts where an index should give the order."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.seeded = seed_race()
+
+    def test_hot_path_queries_use_indexes(self):
+        disable_seqscan_and_sort()
+        for label, queryset, ordered in hot_path_queries(self.seeded):
+            with self.subTest(label):
+                plan, problems = plan_problems(queryset, ordered)
+                self.assertEqual(problems, [], f'{label}:\n{plan}')
+
+
+class RaceStatsTests(TestCase):
+    """RaceStats counters, kept by deltas on every runner write, must always equal a recount."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.race = race.objects.create(
+            name='Stats race', status='signup_open', Entry_fee=0, date=date.today(), distance=5000,
+            laps_count=3, min_lap_time=timedelta(minutes=1),
+        )
+
+    def _runner(self, email, **fields):
+        defaults = {
+            'first_name': 'Stats', 'last_name': 'Runner', 'age': '18-34', 'gender': 'female',
+            'shirt_size': 'Medium',
+        }
+        defaults.update(fields)
+        return runners.objects.create(race=self.race, email=email, **defaults)
+
+    def assertStatsMatchRecount(self):
+        stats = RaceStats.objects.get(pk=self.race.pk)
+        counts = count_race(self.race.pk)
+        self.assertEqual({field: getattr(stats, field) for field in counts}, counts)
+
+    def test_create_edit_and_delete(self):
+        parent = self._runner('family@example.invalid')
+        child = self._runner('family@example.invalid', age='0-12', shirt_size='Kids S')
+        self._runner('solo@example.invalid', paid=True)
+        self.assertStatsMatchRecount()
+        self.assertEqual(RaceStats.objects.get(pk=self.race.pk).email_addresses, 2)
+
+        child.email = 'child@example.invalid'
+        child.save()
+        self.assertStatsMatchRecount()
+        parent.paid = True
+        parent.number = 7
+        parent.total_race_time = timedelta(minutes=25)
+        parent.save()
+        self.assertStatsMatchRecount()
+        child.delete()
+        self.assertStatsMatchRecount()
+
+    def test_queryset_delete_of_runners_sharing_an_address(self):
+        self._runner('family@example.invalid')
+        self._runner('family@example.invalid')
+        self._runner('solo@example.invalid')
+        self.assertStatsMatchRecount()
+
+        runners.objects.filter(race=self.race).delete()
+        self.assertStatsMatchRecount()
+        self.assertEqual(RaceStats.objects.get(pk=self.race.pk).email_addresses, 0)
+
+    def test_partial_queryset_delete_keeps_shared_address(self):
+        first = self._runner('family@example.invalid')
+        second = self._runner('family@example.invalid')
+        self._runner('family@example.invalid')
+
+        runners.objects.filter(pk__in=[first.pk, second.pk]).delete()
+        self.assertStatsMatchRecount()
+        self.assertEqual(RaceStats.objects.get(pk=self.race.pk).email_addresses, 1)
+
+    def test_bulk_update(self):
+        for i in range(3):
+            self._runner(f'bulk{i}@example.invalid')
+        edited = list(runners.objects.filter(race=self.race))
+        for runner in edited:
+            runner.paid = True
+            runner.shirt_size = 'Large'
+        runners.objects.bulk_update(edited, ['paid', 'shirt_size'])
+        runners_updated_in_bulk(edited)
+        self.assertStatsMatchRecount()
+
+    def test_deleting_an_assigned_tag(self):
+        tag = RfidTag.objects.create(tag_number=900001, rfid_hex='STATS900001')
+        self._runner('tagged@example.invalid', tag=tag)
+        self.assertStatsMatchRecount()
+
+        tag.delete()
+        self.assertStatsMatchRecount()
+        self.assertEqual(RaceStats.objects.get(pk=self.race.pk).unassigned, 1)
+
+
+@override_settings(CACHES={
+    'default': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'},
+    'reports': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'report-tests'},
+})
+@patch('tracker.pdf_gen.generate_race_report', return_value=b'%PDF')
+class ReportCacheTests(TestCase):
+    """A cached report is rendered again only when the data it shows changes."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.race = race.objects.create(
+            name='Report race', status='in_progress', Entry_fee=0, date=date.today(), distance=5000,
+            laps_count=3, min_lap_time=timedelta(minutes=1),
+        )
+        cls.runner = cls._runner('first@example.invalid', timedelta(minutes=20))
+
+    def setUp(self):
+        caches['reports'].clear()
+
+    @classmethod
+    def _runner(cls, email, total_race_time=None):
+        return runners.objects.create(
+            race=cls.race, email=email, first_name='Report', last_name='Runner', age='18-34',
+            gender='female', shirt_size='Medium', total_race_time=total_race_time,
+        )
+
+    def test_unrelated_writes_keep_the_entry(self, generate):
+        render_race_report(self.race, self.runner)
+        other = self._runner('second@example.invalid')
+        other.shirt_size = 'Large'
+        other.save()
+        render_race_report(self.race, self.runner)
+        self.assertEqual(generate.call_count, 1)
+
+    def test_new_finisher_renders_again(self, generate):
+        render_race_report(self.race, self.runner)
+        self._runner('second@example.invalid', timedelta(minutes=25))
+        render_race_report(self.race, self.runner)
+        self.assertEqual(generate.call_count, 2)
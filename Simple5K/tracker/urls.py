@@ -20,7 +20,12 @@ from .views import (
     show_runners,
     add_runner,
     edit_runner,
+    edit_runners,
+    import_runners,
+    import_runners_page,
     rfid_tags_list,
+    rfid_tags_export,
+    import_rfid_tags,
     RaceAdd,
     RaceEdit,
     ListRaces,
@@ -65,9 +70,13 @@ urlpatterns = [
     path('runners_view/<int:pk>/', show_runners, name='view_runners'),
     path('api/add-runner/', add_runner, name='add_runner'),
     path('api/edit-runner/', edit_runner, name='edit_runner'),
+    path('api/edit-runners/', edit_runners, name='edit_runners'),
+    path('api/import-runners/', import_runners, name='import_runners_api'),
+    path('runners_import/<int:pk>/', import_runners_page, name='import_runners'),
     path('select_race_runners', select_race_for_runners, name='select_race_runners'),
     path('assign_numbers/', assign_numbers, name='assign_numbers'),
     path('rfid-tags/', rfid_tags_list, name='rfid_tags_list'),
+    path('rfid-tags/export.csv', rfid_tags_export, name='rfid_tags_export'),
     path('mark_runner_finished/', mark_runner_finished, name='mark_runner_finished'),
     path('race_report/<int:race_id>/<int:runner_id>/', GenerateRaceReportView.as_view(), name='race_report'),
     path('completed_races_selection/', completed_races_selection, name='completed_races_selection'),
@@ -82,6 +91,7 @@ urlpatterns = [
     path('api/record-lap/', record_lap, name='api-record-lap'),
     path('api/update-race-time/', update_race_time, name='api-update-race-time'),
     path('api/create-rfid/', create_rfid, name='api-create-rfid'),
+    path('api/import-rfid/', import_rfid_tags, name='api-import-rfid'),
     path('api/assign-tag/', assign_tag, name='api-assign-tag'),
     path('api/available-races/', get_available_races, name='api-available-races'),
 
@@ -1,25 +1,30 @@
 from django.contrib.auth.decorators import login_required
 from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import condition
+from django.utils.cache import patch_cache_control
 from django.shortcuts import render, get_object_or_404, redirect
+from django.template.loader import render_to_string
 from django.views import View
 from django.db import IntegrityError, transaction
-from django.db.models import F, Q, Window, IntegerField, OrderBy, Value
+from django.db.models import Count, F, Max, Q, Window, IntegerField, OrderBy, Value
 from django.db.models.functions import Rank, DenseRank, Lower, Coalesce
 from django.urls import reverse
-from django.http import Http404, HttpResponse, JsonResponse, HttpResponseNotFound
+from django.http import Http404, HttpResponse, JsonResponse, StreamingHttpResponse
 from datetime import datetime, timedelta
 from django.utils import timezone
+from django.utils.safestring import mark_safe
 from django.views.generic.edit import FormView, UpdateView
 from django.views.generic.list import ListView
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.contrib import messages
-from django.views.decorators.cache import cache_page
-from django.core.mail import EmailMessage, send_mail
+from django.core.mail import EmailMessage
 from django.core.validators import EmailValidator
 from django.conf import settings
 from decimal import Decimal
 from functools import wraps
+import csv
 import hmac
+import itertools
 import hashlib
 import io
 import json
@@ -28,22 +33,29 @@ import pytz
 
 logger = logging.getLogger(__name__)
 
-from .models import race, runners, laps, Banner, ApiKey, RfidTag, SiteSettings, EmailSendJob, PayPalOrder
+from .models import race, runners, laps, Banner, ApiKey, RfidTag, SiteSettings, EmailSendJob, EmailDelivery, PayPalOrder, RaceStats, normalize_rfid_hex
 from .forms import LapForm, raceStart, runnerStats, SignupForm, RaceForm, RaceSelectionForm, RunnerInfoSelectionForm, RaceSummaryForm, SiteSettingsForm, BannerForm
-from .pdf_gen import generate_race_report, create_runner_pdf, generate_race_summary_pdf
+from .pdf_gen import create_runner_pdf, generate_race_summary_pdf, race_report_response
+from .report_cache import render_race_report, enqueue_race_prerender, enqueue_report_prerender, note_ingest_activity
+from .email_queue import (
+    acquire_email_send_token, create_job_deliveries, retry_failed_deliveries, notify_email_jobs,
+    notify_signup_confirmations, EMAIL_REQUEST_TOKEN_TIMEOUT_SECONDS,
+)
+from .api_keys import is_valid_api_key
+from .db_router import replica_reads
+from .sqlite_writer import run_serialized, single_writer
+from .lap_archive import laps_by_runner, runner_laps
+from .race_stats import recount_race_stats, runners_updated_in_bulk
+from .race_cache import SCHEDULE, bump_race_version, cached_fragment, cached_html_fragment, race_version
+from .site_cache import get_site_settings, active_banners
+from .numbering import allocate_numbers, assign_tags_to_unassigned, free_tags
 from .utils import safe_content_disposition_filename
 
 
 def require_api_key(view_func):
     @wraps(view_func)
     def wrapped_view(request, *args, **kwargs):
-        api_key = request.headers.get('X-API-Key')
-        if not api_key:
-            return JsonResponse({'error': 'Invalid API key'}, status=401)
-
-        try:
-            ApiKey.objects.get(key=api_key, is_active=True)
-        except ApiKey.DoesNotExist:
+        if not is_valid_api_key(request.headers.get('X-API-Key')):
             return JsonResponse({'error': 'Invalid API key'}, status=401)
 
         return view_func(request, *args, **kwargs)
@@ -54,33 +66,14 @@ def require_api_key_or_login(view_func):
     """Allow either valid X-API-Key header or authenticated session."""
     @wraps(view_func)
     def wrapped_view(request, *args, **kwargs):
-        api_key = request.headers.get('X-API-Key')
-        if api_key:
-            try:
-                ApiKey.objects.get(key=api_key, is_active=True)
-                return view_func(request, *args, **kwargs)
-            except ApiKey.DoesNotExist:
-                pass
+        if is_valid_api_key(request.headers.get('X-API-Key')):
+            return view_func(request, *args, **kwargs)
         if request.user.is_authenticated:
             return view_func(request, *args, **kwargs)
         return JsonResponse({'error': 'Invalid API key'}, status=401)
     return wrapped_view
 
 
-def cache_unless_authenticated(timeout):
-    def decorator(view_func):
-        @wraps(view_func)
-        def wrapped_view(request, *args, **kwargs):
-            if request.user.is_authenticated:
-                # Bypass caching and return fresh response for authenticated users
-                return view_func(request, *args, **kwargs)
-            else:
-                # Cache the response for anonymous users
-                return cache_page(timeout)(view_func)(request, *args, **kwargs)
-        return wrapped_view
-    return decorator
-
-
 def calculate_age_bracket_placement(runner, race_obj):
     """
     Calculates a runner's placement within their age bracket for a given race.
@@ -166,10 +159,10 @@ def _build_race_summary_data(race_obj):
     ).order_by('total_race_time')
     females = []
     males = []
+    race_laps = laps_by_runner(race_obj.pk)
     for runner in finishers:
-        runner_laps = list(laps.objects.filter(runner=runner).order_by('lap'))
         # Exclude lap 0 (chip start) when computing fastest/slowest
-        running_laps = [l for l in runner_laps if l.lap != 0]
+        running_laps = [l for l in race_laps.get(runner.pk, []) if l.lap != 0]
         if running_laps:
             fastest = min(running_laps, key=lambda l: l.duration)
             slowest = max(running_laps, key=lambda l: l.duration)
@@ -245,7 +238,7 @@ def prepare_race_data(race_obj, runner_obj):
 
     # Lap Data (use duration for "Lap time" column; lap.time is clock time, lap.duration is elapsed time; exclude lap 0)
     laps_data = []
-    for lap in laps.objects.filter(runner=runner_obj).order_by('lap'):
+    for lap in runner_laps(runner_obj):
         if lap.lap == 0:
             continue
         dur = getattr(lap, 'duration', None)
@@ -322,55 +315,52 @@ def prepare_race_data(race_obj, runner_obj):
     }
 
 
-def send_race_report_email(runner_id, race_id):
+def build_race_report_email(race_obj, runner_obj):
     """
-    Generates a race report, attaches it to an email, and sends the email
-    to the runner.
+    Build the results email for one runner with their race report PDF attached.
     Args:
-        runner_id: The ID of the runner.
-        race_id: The ID of the race.
+        race_obj: The race.
+        runner_obj: The runner (already fetched; not looked up again).
     Returns:
-        None.  Raises exceptions if email sending fails.
+        EmailMessage ready to send.
     """
-    race_obj = get_object_or_404(race, pk=race_id)
-    runner_obj = get_object_or_404(runners, pk=runner_id)
-    # Generate the PDF; sanitize attachment filename to prevent header injection
+    # Sanitize attachment filename to prevent header injection
     safe_name = safe_content_disposition_filename(
         f"{race_obj.name}_{runner_obj.first_name}_{runner_obj.last_name}"
     )
     pdf_filename = f"race_report_{safe_name}.pdf"
     if not pdf_filename.endswith('.pdf'):
         pdf_filename += '.pdf'
-    race_data = prepare_race_data(race_obj, runner_obj)
+    # Race report PDF as bytes (cached once the race's results stop changing)
+    pdf_content = render_race_report(race_obj, runner_obj)
 
-    try:
-        # Generate the race report PDF as bytes
-        pdf_content = generate_race_report(pdf_filename, race_data, 'file')  # Returns the pdf content as bytes
-
-        # Construct the email
-        subject = "Your Race Report"
-        body = f"{runner_obj.first_name} {runner_obj.last_name},\nPlease find your race report attached.\n\n{race_obj.name} Team"
-        from_email = settings.EMAIL_HOST_USER  # Use the email address configured in settings.py
-        recipient_list = [runner_obj.email]  # The runner's email address
-
-        # Create an EmailMessage object for attachments.  Use EmailMessage not send_mail for more control
-        email = EmailMessage(subject, body, from_email, recipient_list)
-
-        # Attach the PDF directly from the bytes (filename already sanitized above)
-        email.attach(pdf_filename, pdf_content, "application/pdf")  # Attach the report
-        # If you're using Microsoft 365 and have configured TLS settings:
-        # email.fail_silently = False  # Raise exceptions on email sending failures
-        # Send the email
-        try:
-            email.send()  # Actually sends the email.
+    subject = "Your Race Report"
+    body = f"{runner_obj.first_name} {runner_obj.last_name},\nPlease find your race report attached.\n\n{race_obj.name} Team"
+    from_email = settings.EMAIL_HOST_USER  # Use the email address configured in settings.py
+    email = EmailMessage(subject, body, from_email, [runner_obj.email])
+    email.attach(pdf_filename, pdf_content, "application/pdf")
+    return email
 
-        except Exception as e:
-            logger.exception("Error sending email for runner pk=%s", runner_obj.pk)
-            raise  # Re-raise to alert the caller
 
-    except Exception as e:
+def send_race_report_email(runner_id, race_id):
+    """
+    Generates a race report, attaches it to an email, and sends the email
+    to the runner.
+    Args:
+        runner_id: The ID of the runner.
+        race_id: The ID of the race.
+    Returns:
+        None.  Raises exceptions if email sending fails.
+    """
+    race_obj = get_object_or_404(race, pk=race_id)
+    runner_obj = get_object_or_404(runners, pk=runner_id)
+    try:
+        email = build_race_report_email(race_obj, runner_obj)
+        # Send the email (waits for a token from the shared send rate limiter)
+        acquire_email_send_token()
+        email.send()
+    except Exception:
         logger.exception("Error processing or sending race report for runner pk=%s", runner_obj.pk)
-        # Potentially log details to database
         raise  # Re-raise the exception to  handle it further up
 
 
@@ -406,18 +396,13 @@ class GenerateRaceReportView(LoginRequiredMixin, View):
         race_obj = get_object_or_404(race, pk=race_id)
         runner_obj = get_object_or_404(runners, race=race_obj, number=runner_id)
 
-        # Prepare data for the report
-        race_data = prepare_race_data(race_obj, runner_obj)
-        # Generate the PDF
-        if race_data is None:
-            return HttpResponseNotFound("No runner or race data found")
         safe_name = safe_content_disposition_filename(f"{race_obj.name}_{runner_obj.first_name}_{runner_obj.last_name}")
         pdf_filename = f"race_report_{safe_name}.pdf"
-        response = generate_race_report(pdf_filename, race_data, 'response')
-        return response
+        return race_report_response(pdf_filename, render_race_report(race_obj, runner_obj))
 
 
 @login_required
+@single_writer
 def race_start_view(request):
     form = raceStart(request.POST or None)
     context = {"form": form}
@@ -444,7 +429,6 @@ def runner_stats(request):
     form = runnerStats(request.POST or None)
     context = {'form': form}
     if request.method == "POST":
-        racetotalobj = {}
         if form.is_valid():
             raceobj = form.cleaned_data['racename']
             try:
@@ -452,12 +436,10 @@ def runner_stats(request):
             except runners.DoesNotExist:
                 messages.error(request, f"No runner with number {form.cleaned_data['runnernumber']} found for this race.")
                 return render(request, 'tracker/runner_stats.html', context=context)
-            racetotalobj = prepare_race_data(raceobj, runnerobj)
         else:
             return render(request, 'tracker/runner_stats.html', context=context)
         filename = f"race_report_{raceobj.name}_{runnerobj.first_name}_{runnerobj.last_name}.pdf"
-        response = generate_race_report(filename, racetotalobj, "response")
-        return response
+        return race_report_response(filename, render_race_report(raceobj, runnerobj))
 
     return render(request, 'tracker/runner_stats.html', context=context)
 
@@ -487,10 +469,8 @@ def select_race(request):
 
 @login_required
 def view_shirt_sizes(request, pk):
-    from django.db.models import Count
     race_obj = get_object_or_404(race, pk=pk)
-    size_rows = runners.objects.filter(race=race_obj).values('shirt_size').annotate(count=Count('id'))
-    size_counts = {row['shirt_size']: row['count'] for row in size_rows}
+    size_counts = RaceStats.for_race(race_obj.pk).shirt_sizes
     all_sizes = ['Kids XS', 'Kids S', 'Kids M', 'Kids L', 'Extra Small', 'Small', 'Medium', 'Large', 'XL', 'XXL']
     shirt_size_counts = {s: size_counts.get(s, 0) for s in all_sizes}
     total_runners = sum(shirt_size_counts.values())
@@ -553,63 +533,26 @@ def show_runners(request, pk):
         # Path-only URLs so fetch() uses the current page origin (HTTPS when page is HTTPS)
         'add_runner_url': reverse('tracker:add_runner'),
         'edit_runner_url': reverse('tracker:edit_runner'),
+        'edit_runners_url': reverse('tracker:edit_runners'),
     }
     return render(request, 'tracker/view_runners.html', context)
 
 
-@csrf_exempt
-@require_api_key_or_login
-def add_runner(request):
-    """POST: create a new runner for the given race. Expects race_id and runner fields. Returns JSON. Auth: API key or session."""
-    if request.method != 'POST':
-        return JsonResponse({'success': False, 'errors': ['Method not allowed']}, status=405)
-    try:
-        data = json.loads(request.body) if request.body else {}
-    except json.JSONDecodeError:
-        data = request.POST.dict()
-    race_id = data.get('race_id')
-    if not race_id:
-        return JsonResponse({'success': False, 'errors': ['race_id required']}, status=400)
-    race_obj = get_object_or_404(race, pk=race_id)
+# Choice sets for runner validation, built once instead of per request / per row
+RUNNER_AGE_CHOICES = frozenset(c[0] for c in runners.age_bracket)
+RUNNER_GENDER_CHOICES = frozenset(c[0] for c in runners._meta.get_field('gender').choices)
+RUNNER_TYPE_CHOICES = frozenset(c[0] for c in runners.race_type)
+RUNNER_SHIRT_CHOICES = frozenset(c[0] for c in runners._meta.get_field('shirt_size').choices)
+
+_TRUE_VALUES = (True, 'true', 'True', 1, '1')
+
+
+def _clean_new_runner(data):
+    """Validate the fields of a new runner from a dict of raw values (API body or import row).
+    Returns (fields, errors): fields holds the cleaned model values (number is None when blank)."""
     errors = []
-    first_name = (data.get('first_name') or '').strip()
-    last_name = (data.get('last_name') or '').strip()
-    email = (data.get('email') or '').strip()
-    age = (data.get('age') or '').strip()
-    gender = (data.get('gender') or '').strip() or None
-    auto_assign_number = data.get('auto_assign_number') in (True, 'true', 'True', 1, '1')
     number = data.get('number')
-    tag_obj = None
-    if auto_assign_number:
-        # Assign the smallest unused tag whose tag_number >= race.number_start (fills gaps).
-        # Lock the race row to prevent concurrent auto-assign from producing duplicates.
-        with transaction.atomic():
-            race.objects.select_for_update().filter(pk=race_obj.pk).first()
-            starting = race_obj.number_start or 1
-            tags_in_use = set(
-                runners.objects.filter(race=race_obj)
-                .exclude(tag__isnull=True)
-                .values_list('tag_id', flat=True)
-            )
-            tag_obj = (
-                RfidTag.objects
-                .exclude(pk__in=tags_in_use)
-                .filter(tag_number__gte=starting)
-                .order_by('tag_number')
-                .first()
-            )
-            if tag_obj:
-                number = tag_obj.tag_number
-            else:
-                # No tags left — assign a number only, filling the smallest gap >= starting
-                existing_numbers = set(
-                    runners.objects.filter(race=race_obj, number__isnull=False)
-                    .values_list('number', flat=True)
-                )
-                number = starting
-                while number in existing_numbers:
-                    number += 1
-    elif number is not None and number != '':
+    if number is not None and number != '':
         try:
             number = int(number)
             if number < 0:
@@ -618,6 +561,11 @@ def add_runner(request):
             errors.append('Number must be an integer')
     else:
         number = None
+    first_name = (data.get('first_name') or '').strip()
+    last_name = (data.get('last_name') or '').strip()
+    email = (data.get('email') or '').strip()
+    age = (data.get('age') or '').strip()
+    gender = (data.get('gender') or '').strip() or None
     runner_type = (data.get('type') or '').strip() or None
     shirt_size = (data.get('shirt_size') or '').strip()
     notes = (data.get('notes') or '').strip() or None
@@ -639,37 +587,75 @@ def add_runner(request):
             EmailValidator()(email)
         except Exception:
             errors.append('Enter a valid email address')
-    if not age or age not in [c[0] for c in runners.age_bracket]:
+    if age not in RUNNER_AGE_CHOICES:
         errors.append('Valid age bracket is required')
     if not gender:
         errors.append('Gender is required')
-    elif gender not in [c[0] for c in runners._meta.get_field('gender').choices]:
+    elif gender not in RUNNER_GENDER_CHOICES:
         errors.append('Invalid gender')
-    if runner_type is not None and runner_type not in [c[0] for c in runners.race_type]:
+    if runner_type is not None and runner_type not in RUNNER_TYPE_CHOICES:
         errors.append('Invalid type')
-    if not shirt_size or shirt_size not in [c[0] for c in runners._meta.get_field('shirt_size').choices]:
+    if shirt_size not in RUNNER_SHIRT_CHOICES:
         errors.append('Valid shirt size is required')
+    if notes is not None and len(notes) > 512:
+        errors.append('Notes too long')
+
+    fields = {
+        'first_name': first_name,
+        'last_name': last_name,
+        'email': email,
+        'age': age,
+        'gender': gender,
+        'number': number,
+        'type': runner_type,
+        'shirt_size': shirt_size,
+        'notes': notes,
+    }
+    return fields, errors
 
-    send_confirmation_email = data.get('send_confirmation_email') in (True, 'true', 'True', 1, '1')
+
+@csrf_exempt
+@require_api_key_or_login
+def add_runner(request):
+    """POST: create a new runner for the given race. Expects race_id and runner fields. Returns JSON. Auth: API key or session."""
+    if request.method != 'POST':
+        return JsonResponse({'success': False, 'errors': ['Method not allowed']}, status=405)
+    try:
+        data = json.loads(request.body) if request.body else {}
+    except json.JSONDecodeError:
+        data = request.POST.dict()
+    race_id = data.get('race_id')
+    if not race_id:
+        return JsonResponse({'success': False, 'errors': ['race_id required']}, status=400)
+    race_obj = get_object_or_404(race, pk=race_id)
+    auto_assign_number = data.get('auto_assign_number') in _TRUE_VALUES
+    if auto_assign_number:
+        # The number is assigned below; ignore any value sent with it
+        data = {k: v for k, v in data.items() if k != 'number'}
+    fields, errors = _clean_new_runner(data)
+    send_confirmation_email = data.get('send_confirmation_email') in _TRUE_VALUES
 
     if errors:
         return JsonResponse({'success': False, 'errors': errors}, status=400)
-    runner_obj = runners.objects.create(
-        race=race_obj,
-        first_name=first_name,
-        last_name=last_name,
-        email=email,
-        age=age,
-        gender=gender,
-        number=number,
-        tag=tag_obj,
-        type=runner_type,
-        shirt_size=shirt_size,
-        notes=notes,
-        send_signup_confirmation=send_confirmation_email,
-    )
+
+    @transaction.atomic
+    def create_runner():
+        tag_obj = None
+        if auto_assign_number:
+            # Lock the race row to prevent concurrent auto-assign from producing duplicates
+            race.objects.select_for_update().filter(pk=race_obj.pk).first()
+            fields['number'], tag_obj = allocate_numbers(race_obj, 1)[0]
+        return runners.objects.create(
+            race=race_obj,
+            tag=tag_obj,
+            send_signup_confirmation=send_confirmation_email,
+            **fields,
+        )
+
+    # Only the write is serialized; the confirmation email below must not hold up lap ingest
+    runner_obj = run_serialized(create_runner)
     if send_confirmation_email and runner_obj.email and (runner_obj.email or '').strip():
-        send_signup_confirmation_email(runner_obj)
+        send_signup_confirmation_email(runner_obj, token_timeout=EMAIL_REQUEST_TOKEN_TIMEOUT_SECONDS)
     return JsonResponse({
         'success': True,
         'runner': {
@@ -689,21 +675,247 @@ def add_runner(request):
     })
 
 
+# Most data rows accepted in one runner import file
+RUNNER_IMPORT_MAX_ROWS = 5000
+
+RUNNER_IMPORT_REQUIRED_COLUMNS = ('first_name', 'last_name', 'email', 'age', 'gender', 'shirt_size')
+RUNNER_IMPORT_COLUMNS = RUNNER_IMPORT_REQUIRED_COLUMNS + ('type', 'number', 'notes', 'paid')
+
+
+class ImportFileError(Exception):
+    """An uploaded import file as a whole cannot be read (bad format, missing columns, too big)."""
+
+
+def _import_column(header):
+    return str(header or '').strip().lower().replace(' ', '_')
+
+
+def _import_cell(value):
+    if value is None:
+        return ''
+    if isinstance(value, float) and value.is_integer():
+        # Spreadsheet numbers come back as floats (101.0)
+        value = int(value)
+    return str(value).strip()
+
+
+def _iter_import_rows(uploaded_file):
+    """Yield (row_number, row_dict) for each non-blank data row of an uploaded CSV or XLSX file,
+    reading it incrementally. Headers are matched case-insensitively ("First Name" = first_name);
+    row_number is the spreadsheet row (the header is row 1)."""
+    name = (uploaded_file.name or '').lower()
+    if name.endswith('.xlsx'):
+        try:
+            from openpyxl import load_workbook
+        except ImportError:
+            raise ImportFileError('XLSX import requires the openpyxl package; upload a CSV file instead')
+        try:
+            workbook = load_workbook(uploaded_file, read_only=True, data_only=True)
+        except Exception:
+            raise ImportFileError('Could not read the XLSX file')
+        try:
+            rows = workbook.active.iter_rows(values_only=True)
+            header = [_import_column(h) for h in next(rows, None) or ()]
+            _check_import_header(header)
+            for row_number, values in enumerate(rows, start=2):
+                row = {key: _import_cell(value) for key, value in zip(header, values) if key}
+                if any(row.values()):
+                    yield row_number, row
+        finally:
+            workbook.close()
+    else:
+        text = io.TextIOWrapper(uploaded_file.file, encoding='utf-8-sig', newline='')
+        try:
+            reader = csv.reader(text)
+            header = [_import_column(h) for h in next(reader, None) or ()]
+            _check_import_header(header)
+            for values in reader:
+                row = {key: value.strip() for key, value in zip(header, values) if key}
+                if any(row.values()):
+                    yield reader.line_num, row
+        except UnicodeDecodeError:
+            raise ImportFileError('CSV file must be UTF-8 encoded')
+        except csv.Error as e:
+            raise ImportFileError(f'Could not read the CSV file: {e}')
+        finally:
+            text.detach()
+
+
+def _check_import_header(header):
+    missing = [column for column in RUNNER_IMPORT_REQUIRED_COLUMNS if column not in header]
+    if missing:
+        raise ImportFileError(f"Missing column(s): {', '.join(missing)}")
+
+
+def import_runners_from_file(race_obj, uploaded_file, auto_assign_number=False, send_confirmation_email=False,
+                             skip_invalid=False):
+    """
+    Bulk-create runners for race_obj from a CSV or XLSX file (columns: RUNNER_IMPORT_COLUMNS).
+    Every row is validated before anything is saved; with errors nothing is imported unless
+    skip_invalid, which imports the valid rows only. A number already used in the race, or by
+    an earlier row of the file, is a row error. Rows without a number get one (and a tag)
+    when auto_assign_number, allocated for the whole batch under one race lock.
+    The file is read and validated outside the single writer; only the final write is
+    serialized, and it checks the explicit numbers again against runners added meanwhile.
+    Confirmation emails are left to the signup confirmation worker (sent at once for paid rows).
+    Returns {'rows', 'created', 'errors': [{'row', 'errors'}]}. Raises ImportFileError for an
+    unreadable file.
+    """
+    valid = []  # (row_number, fields)
+    row_errors = []
+    total_rows = 0
+    taken_numbers = set(
+        runners.objects.filter(race=race_obj, number__isnull=False).values_list('number', flat=True)
+    )
+    file_numbers = {}  # explicit number -> first row using it
+    for row_number, row in _iter_import_rows(uploaded_file):
+        total_rows += 1
+        if total_rows > RUNNER_IMPORT_MAX_ROWS:
+            raise ImportFileError(f'Too many rows (at most {RUNNER_IMPORT_MAX_ROWS} per file)')
+        fields, errors = _clean_new_runner(row)
+        paid = row.get('paid', '').lower()
+        if paid not in ('', 'true', 'false', 'yes', 'no', '1', '0'):
+            errors.append('Paid must be yes or no')
+        number = fields['number']
+        if number is not None:
+            if number in taken_numbers:
+                errors.append(f'Number {number} is already used in this race')
+            elif number in file_numbers:
+                errors.append(f'Number {number} is also used by row {file_numbers[number]}')
+            else:
+                file_numbers[number] = row_number
+        if errors:
+            row_errors.append({'row': row_number, 'errors': errors})
+            continue
+        fields['paid'] = paid in ('true', 'yes', '1')
+        valid.append((row_number, fields))
+
+    result = {'rows': total_rows, 'created': 0, 'errors': row_errors}
+    if not valid or (row_errors and not skip_invalid):
+        return result
+
+    @transaction.atomic
+    def create_runners():
+        # Lock the race row so numbers cannot be taken between the check below and the insert
+        race.objects.select_for_update().filter(pk=race_obj.pk).first()
+        taken_meanwhile = set(runners.objects.filter(
+            race=race_obj, number__in=[fields['number'] for _, fields in valid if fields['number'] is not None],
+        ).values_list('number', flat=True))
+        rows = []
+        for row_number, fields in valid:
+            if fields['number'] in taken_meanwhile:
+                error = f"Number {fields['number']} is already used in this race"
+                row_errors.append({'row': row_number, 'errors': [error]})
+            else:
+                rows.append(fields)
+        if taken_meanwhile:
+            row_errors.sort(key=lambda error: error['row'])
+            if not rows or not skip_invalid:
+                return 0
+        if auto_assign_number:
+            unnumbered = [fields for fields in rows if fields['number'] is None]
+            if unnumbered:
+                explicit = [fields['number'] for fields in rows if fields['number'] is not None]
+                allocations = allocate_numbers(race_obj, len(unnumbered), exclude=explicit)
+                for fields, (number, tag_obj) in zip(unnumbered, allocations):
+                    fields['number'] = number
+                    fields['tag'] = tag_obj
+        created = runners.objects.bulk_create(
+            [runners(race=race_obj, send_signup_confirmation=send_confirmation_email, **fields) for fields in rows],
+            batch_size=500,
+        )
+        recount_race_stats(race_obj.pk)
+        bump_race_version(race_obj.pk)
+        if send_confirmation_email:
+            notify_signup_confirmations()
+        return len(created)
+
+    result['created'] = run_serialized(create_runners)
+    return result
+
+
+def _import_request_options(data):
+    return {
+        'auto_assign_number': data.get('auto_assign_number') in _TRUE_VALUES,
+        'send_confirmation_email': data.get('send_confirmation_email') in _TRUE_VALUES,
+        'skip_invalid': data.get('skip_invalid') in _TRUE_VALUES,
+    }
+
+
 @csrf_exempt
 @require_api_key_or_login
-def edit_runner(request):
-    """POST: update runner fields. Expects runner_id and editable fields. Returns JSON. Auth: API key or session."""
+def import_runners(request):
+    """POST (multipart): bulk-create runners from a CSV or XLSX file. Expects race_id and file;
+    optional auto_assign_number, send_confirmation_email, skip_invalid. Returns JSON with a per-row
+    error report. Auth: API key or session."""
     if request.method != 'POST':
         return JsonResponse({'success': False, 'errors': ['Method not allowed']}, status=405)
+    race_id = request.POST.get('race_id')
+    if not race_id:
+        return JsonResponse({'success': False, 'errors': ['race_id required']}, status=400)
+    race_obj = get_object_or_404(race, pk=race_id)
+    uploaded_file = request.FILES.get('file')
+    if not uploaded_file:
+        return JsonResponse({'success': False, 'errors': ['file required']}, status=400)
     try:
-        data = json.loads(request.body) if request.body else {}
-    except json.JSONDecodeError:
-        data = request.POST.dict()
-    runner_id = data.get('runner_id')
-    if not runner_id:
-        return JsonResponse({'success': False, 'errors': ['runner_id required']}, status=400)
-    runner_obj = get_object_or_404(runners, pk=runner_id)
+        result = import_runners_from_file(race_obj, uploaded_file, **_import_request_options(request.POST))
+    except ImportFileError as e:
+        return JsonResponse({'success': False, 'errors': [str(e)]}, status=400)
+    success = result['created'] > 0 or not result['errors']
+    return JsonResponse({
+        'success': success,
+        'rows': result['rows'],
+        'created': result['created'],
+        'row_errors': result['errors'],
+    }, status=200 if success else 400)
+
+
+@login_required
+def import_runners_page(request, pk):
+    """Upload form for bulk runner import; shows the per-row error report after a POST."""
+    selected_race = get_object_or_404(race, pk=pk)
+    context = {
+        'race': selected_race,
+        'required_columns': RUNNER_IMPORT_REQUIRED_COLUMNS,
+        'optional_columns': RUNNER_IMPORT_COLUMNS[len(RUNNER_IMPORT_REQUIRED_COLUMNS):],
+        'max_rows': RUNNER_IMPORT_MAX_ROWS,
+        'options': _import_request_options(request.POST) if request.method == 'POST' else {},
+    }
+    if request.method == 'POST':
+        uploaded_file = request.FILES.get('file')
+        if not uploaded_file:
+            messages.error(request, 'Choose a CSV or XLSX file to import.')
+        else:
+            try:
+                result = import_runners_from_file(selected_race, uploaded_file, **context['options'])
+            except ImportFileError as e:
+                messages.error(request, str(e))
+            else:
+                context['result'] = result
+                if result['created']:
+                    messages.success(request, f"Imported {result['created']} of {result['rows']} runner(s).")
+                elif result['errors']:
+                    messages.error(request, 'Nothing was imported. Fix the rows below and upload the file again.')
+                else:
+                    messages.info(request, 'The file has no runner rows.')
+    return render(request, 'tracker/import_runners.html', context)
+
+
+# Most runner updates accepted in one bulk edit request
+RUNNER_BULK_EDIT_MAX = 500
+
+_TAG_IN_USE_ERROR = (
+    'That RFID tag is already assigned to another runner in this race. '
+    'Each tag can only be used by one runner per race.'
+)
+
+
+def _apply_runner_changes(runner_obj, data):
+    """Validate the editable fields present in data and set them on runner_obj (not saved).
+    A tag_id is only parsed here; _save_runner_edits checks that the tag exists and is free.
+    Returns (fields, errors): fields are the model field names that were set."""
     errors = []
+    fields = []
     if 'first_name' in data:
         v = (data.get('first_name') or '').strip()
         if not v:
@@ -712,6 +924,7 @@ def edit_runner(request):
             errors.append('First name too long')
         else:
             runner_obj.first_name = v
+            fields.append('first_name')
     if 'last_name' in data:
         v = (data.get('last_name') or '').strip()
         if not v:
@@ -720,6 +933,7 @@ def edit_runner(request):
             errors.append('Last name too long')
         else:
             runner_obj.last_name = v
+            fields.append('last_name')
     if 'email' in data:
         v = (data.get('email') or '').strip()
         if not v:
@@ -733,25 +947,28 @@ def edit_runner(request):
                 errors.append('Enter a valid email address')
             else:
                 runner_obj.email = v
+                fields.append('email')
     if 'age' in data:
         v = (data.get('age') or '').strip()
-        valid_ages = [c[0] for c in runners.age_bracket]
-        if v not in valid_ages:
+        if v not in RUNNER_AGE_CHOICES:
             errors.append('Invalid age bracket')
         else:
             runner_obj.age = v
+            fields.append('age')
     if 'gender' in data:
         v = (data.get('gender') or '').strip() or None
         if not v:
             errors.append('Gender is required')
-        elif v not in [c[0] for c in runners._meta.get_field('gender').choices]:
+        elif v not in RUNNER_GENDER_CHOICES:
             errors.append('Invalid gender')
         else:
             runner_obj.gender = v
+            fields.append('gender')
     if 'number' in data:
         v = data.get('number')
         if v is None or v == '':
             runner_obj.number = None
+            fields.append('number')
         else:
             try:
                 n = int(v)
@@ -759,109 +976,202 @@ def edit_runner(request):
                     errors.append('Number must be non-negative')
                 else:
                     runner_obj.number = n
+                    fields.append('number')
             except (TypeError, ValueError):
                 errors.append('Number must be an integer')
     if 'type' in data:
         v = (data.get('type') or '').strip() or None
-        if v is not None and v not in [c[0] for c in runners.race_type]:
+        if v is not None and v not in RUNNER_TYPE_CHOICES:
             errors.append('Invalid type')
         else:
             runner_obj.type = v
+            fields.append('type')
     if 'shirt_size' in data:
         v = (data.get('shirt_size') or '').strip()
-        if not v or v not in [c[0] for c in runners._meta.get_field('shirt_size').choices]:
+        if v not in RUNNER_SHIRT_CHOICES:
             errors.append('Invalid shirt size')
         else:
             runner_obj.shirt_size = v
+            fields.append('shirt_size')
     if 'paid' in data:
         v = data.get('paid')
         if v in (True, 'true', '1', 1):
             runner_obj.paid = True
+            fields.append('paid')
         elif v in (False, 'false', '0', 0, None, ''):
             runner_obj.paid = False
+            fields.append('paid')
         else:
             errors.append('Invalid paid value')
     if 'tag_id' in data:
         v = data.get('tag_id')
         if v is None or v == '':
-            runner_obj.tag_id = None
+            runner_obj.tag = None
+            fields.append('tag')
         else:
             try:
-                tag_pk = int(v)
-                tag_obj = RfidTag.objects.filter(pk=tag_pk).first()
-                if not tag_obj:
-                    errors.append('RFID tag not found')
-                else:
-                    other = runners.objects.filter(race_id=runner_obj.race_id, tag_id=tag_pk).exclude(pk=runner_obj.pk).first()
-                    if other:
-                        errors.append(
-                            'That RFID tag is already assigned to another runner in this race. '
-                            'Each tag can only be used by one runner per race.'
-                        )
-                    else:
-                        runner_obj.tag_id = tag_pk
+                runner_obj.tag_id = int(v)
+                fields.append('tag')
             except (TypeError, ValueError):
                 errors.append('Invalid tag_id')
-    if errors:
-        return JsonResponse({'success': False, 'errors': errors}, status=400)
-    runner_obj.save()
-    tag_display = ''
-    tag_id = None
-    if runner_obj.tag_id:
-        tag_id = runner_obj.tag_id
-        tag_display = str(runner_obj.tag)
-    return JsonResponse({
-        'success': True,
-        'runner': {
-            'id': runner_obj.id,
-            'first_name': runner_obj.first_name,
-            'last_name': runner_obj.last_name,
-            'email': runner_obj.email,
-            'age': runner_obj.age,
-            'gender': runner_obj.gender or '',
-            'number': runner_obj.number,
-            'type': runner_obj.type or '',
-            'shirt_size': runner_obj.shirt_size,
-            'paid': runner_obj.paid,
-            'tag_id': tag_id,
-            'tag_display': tag_display,
-        }
-    })
+    return fields, errors
 
 
-def format_remaining_time(end_time):
-    """Format remaining time into days, hours, minutes, seconds"""
-    # Get current time in UTC
-    now = timezone.now()
-
-    # If end_time is naive (has no timezone info), localize it to UTC
-    if timezone.is_naive(end_time):
-        end_time = timezone.make_aware(end_time, timezone=timezone.get_default_timezone())
-
-    # Ensure both times are in the same timezone before comparison
-    now_utc = now.astimezone(timezone.get_default_timezone())
-    end_time_utc = end_time.astimezone(timezone.get_default_timezone())
+def _save_runner_edits(updates):
+    """
+    Validate and save a batch of partial runner updates (dicts with runner_id plus the fields
+    to change, as for edit_runner). All or nothing: returns (runner_objs, row_errors), where
+    row_errors lists {'index', 'runner_id', 'errors'} and nothing is saved if it is non-empty.
+    Tags are checked for the whole batch with one lookup of the tags and one of their current
+    holders, so tags can also be swapped between runners of the same batch.
+    May raise IntegrityError if a concurrent edit takes one of the tags first.
+    """
+    errors_by_index = {}
+    runner_ids = []
+    for data in updates:
+        try:
+            runner_ids.append(int(data.get('runner_id')))
+        except (AttributeError, TypeError, ValueError):
+            runner_ids.append(None)
+    found = runners.objects.select_related('tag').in_bulk([pk for pk in runner_ids if pk is not None])
+    edited = []
+    seen = set()
+    for index, (runner_id, data) in enumerate(zip(runner_ids, updates)):
+        runner_obj = found.get(runner_id)
+        if runner_id is None:
+            errors_by_index[index] = ['runner_id required']
+        elif runner_obj is None:
+            errors_by_index[index] = ['Runner not found']
+        elif runner_id in seen:
+            errors_by_index[index] = ['Runner appears more than once in this batch']
+        else:
+            seen.add(runner_id)
+            old_tag_id = runner_obj.tag_id
+            fields, errors = _apply_runner_changes(runner_obj, data)
+            if 'tag' in fields and runner_obj.tag_id == old_tag_id:
+                fields.remove('tag')
+            if errors:
+                errors_by_index[index] = errors
+            edited.append((index, runner_obj, fields))
+
+    moving = [(index, r) for index, r, fields in edited if 'tag' in fields]
+    new_tag_ids = {r.tag_id for _, r in moving if r.tag_id is not None}
+    if new_tag_ids:
+        tags = RfidTag.objects.in_bulk(new_tag_ids)
+        # Runners keeping their tag through this batch, holding one of the requested tags
+        held = set(
+            runners.objects.filter(race_id__in={r.race_id for _, r in moving}, tag_id__in=new_tag_ids)
+            .exclude(pk__in=[r.pk for _, r in moving])
+            .values_list('race_id', 'tag_id')
+        )
+        for index, r in moving:
+            if r.tag_id is None:
+                continue
+            key = (r.race_id, r.tag_id)
+            if r.tag_id not in tags:
+                errors_by_index.setdefault(index, []).append('RFID tag not found')
+            elif key in held:
+                errors_by_index.setdefault(index, []).append(_TAG_IN_USE_ERROR)
+            else:
+                held.add(key)
+                r.tag = tags[r.tag_id]
+
+    if errors_by_index:
+        row_errors = [
+            {'index': index, 'runner_id': runner_ids[index], 'errors': errors_by_index[index]}
+            for index in sorted(errors_by_index)
+        ]
+        return [], row_errors
+    with transaction.atomic():
+        if moving:
+            # The (race, tag) unique index is checked row by row, so free the moving tags
+            # first; otherwise a swap inside one UPDATE would collide with itself.
+            runners.objects.filter(pk__in=[r.pk for _, r in moving]).update(tag=None)
+        by_fields = {}
+        for _, r, fields in edited:
+            if fields:
+                by_fields.setdefault(tuple(sorted(fields)), []).append(r)
+        for fields, objs in by_fields.items():
+            # Only the fields each update sent, so concurrent edits to other fields survive
+            runners.objects.bulk_update(objs, fields, batch_size=500)
+        runners_updated_in_bulk([r for _, r, fields in edited if fields])
+        for race_id in {r.race_id for _, r, fields in edited if fields}:
+            bump_race_version(race_id)
+    return [r for _, r, _ in edited], []
+
+
+def _edited_runner_json(runner_obj):
+    return {
+        'id': runner_obj.id,
+        'first_name': runner_obj.first_name,
+        'last_name': runner_obj.last_name,
+        'email': runner_obj.email,
+        'age': runner_obj.age,
+        'gender': runner_obj.gender or '',
+        'number': runner_obj.number,
+        'type': runner_obj.type or '',
+        'shirt_size': runner_obj.shirt_size,
+        'paid': runner_obj.paid,
+        'tag_id': runner_obj.tag_id,
+        'tag_display': str(runner_obj.tag) if runner_obj.tag_id else '',
+    }
 
-    if end_time_utc <= now_utc:
-        return {'days': 0, 'hours': 0, 'minutes': 0, 'seconds': 0}
 
-    delta = end_time_utc - now_utc
+@csrf_exempt
+@require_api_key_or_login
+@single_writer
+def edit_runner(request):
+    """POST: update runner fields. Expects runner_id and editable fields. Returns JSON. Auth: API key or session."""
+    if request.method != 'POST':
+        return JsonResponse({'success': False, 'errors': ['Method not allowed']}, status=405)
+    try:
+        data = json.loads(request.body) if request.body else {}
+    except json.JSONDecodeError:
+        data = request.POST.dict()
+    runner_id = data.get('runner_id')
+    if not runner_id:
+        return JsonResponse({'success': False, 'errors': ['runner_id required']}, status=400)
+    get_object_or_404(runners, pk=runner_id)
+    try:
+        edited, row_errors = _save_runner_edits([data])
+    except IntegrityError:
+        return JsonResponse({'success': False, 'errors': [_TAG_IN_USE_ERROR]}, status=400)
+    if row_errors:
+        return JsonResponse({'success': False, 'errors': row_errors[0]['errors']}, status=400)
+    return JsonResponse({'success': True, 'runner': _edited_runner_json(edited[0])})
 
-    days = delta.days
-    seconds = delta.seconds
-    hours = seconds // 3600
-    minutes = (seconds % 3600) // 60
-    seconds = seconds % 60
 
-    return {
-        'days': days,
-        'hours': hours,
-        'minutes': minutes,
-        'seconds': seconds
-    }
+@csrf_exempt
+@require_api_key_or_login
+@single_writer
+def edit_runners(request):
+    """POST: update many runners at once. Expects {"updates": [{runner_id, ...fields}, ...]} with the
+    same fields as edit_runner; saved in one transaction, all or nothing. Returns JSON with a
+    per-update error report. Auth: API key or session."""
+    if request.method != 'POST':
+        return JsonResponse({'success': False, 'errors': ['Method not allowed']}, status=405)
+    try:
+        data = json.loads(request.body) if request.body else {}
+    except json.JSONDecodeError:
+        return JsonResponse({'success': False, 'errors': ['Invalid JSON']}, status=400)
+    updates = data.get('updates') if isinstance(data, dict) else None
+    if not isinstance(updates, list) or not updates:
+        return JsonResponse({'success': False, 'errors': ['updates must be a non-empty list']}, status=400)
+    if len(updates) > RUNNER_BULK_EDIT_MAX:
+        return JsonResponse(
+            {'success': False, 'errors': [f'At most {RUNNER_BULK_EDIT_MAX} updates per request']}, status=400
+        )
+    try:
+        edited, row_errors = _save_runner_edits(updates)
+    except IntegrityError:
+        return JsonResponse({'success': False, 'errors': [_TAG_IN_USE_ERROR]}, status=400)
+    if row_errors:
+        return JsonResponse({'success': False, 'row_errors': row_errors}, status=400)
+    return JsonResponse({'success': True, 'runners': [_edited_runner_json(r) for r in edited]})
 
 
 @login_required
+@single_writer
 def mark_runner_finished(request):
     if request.method == 'POST':
         runner_number = request.POST.get('runner_number')
@@ -888,12 +1198,14 @@ def mark_runner_finished(request):
 def email_list_view(request):
     """
     Page to send an email to all runners of a selected race. Form: race, subject, body.
-    On Send: creates EmailSendJob (queued); background worker sends one email per runner
-    with throttling. Confirms that the email has been queued.
+    On Send: creates EmailSendJob (queued) with one EmailDelivery per recipient; background
+    worker sends one email per runner with throttling. Confirms that the email has been queued.
+    Recent jobs show sent/total progress and can be retried for the recipients not yet sent.
     """
     try:
-        from .email_queue import start_email_worker
-        start_email_worker()
+        from .email_queue import start_email_worker, web_workers_enabled
+        if web_workers_enabled():
+            start_email_worker()
     except Exception as e:
         logger.exception("Failed to start email worker: %s", e)
     races = race.objects.filter(archived=False).order_by('-date', '-scheduled_time')
@@ -929,14 +1241,19 @@ def email_list_view(request):
                     return JsonResponse({'success': False, 'error': 'Selected race(s) have no unpaid runners with email addresses.'}, status=400)
                 if not unpaid_reminder and total_count == 0:
                     return JsonResponse({'success': False, 'error': 'Selected race(s) have no runners with email addresses.'}, status=400)
+                total_count = 0
                 for race_obj in race_objs:
-                    EmailSendJob.objects.create(
-                        race=race_obj,
-                        subject=subject[:255],
-                        body=body,
-                        unpaid_reminder=unpaid_reminder,
-                        status=EmailSendJob.STATUS_QUEUED,
-                    )
+                    # Job and its recipient ledger appear together so the worker never sees one without the other
+                    with transaction.atomic():
+                        job = EmailSendJob.objects.create(
+                            race=race_obj,
+                            subject=subject[:255],
+                            body=body,
+                            unpaid_reminder=unpaid_reminder,
+                            status=EmailSendJob.STATUS_QUEUED,
+                        )
+                        total_count += create_job_deliveries(job)
+                        notify_email_jobs()
                 num_races = len(race_objs)
                 if num_races == 1:
                     msg = f'Your email has been queued and will be sent to {total_count} runner(s).'
@@ -957,16 +1274,33 @@ def email_list_view(request):
             if not race_ids:
                 return JsonResponse({'count': 0})
             unpaid_reminder = data.get('unpaid_reminder') in ('1', 'true', 'yes')
-            total = 0
-            for rid in race_ids:
-                try:
-                    race_obj = race.objects.get(pk=rid)
-                    total += race_obj.unpaid_runner_email_count() if unpaid_reminder else race_obj.runner_email_count()
-                except (race.DoesNotExist, ValueError):
-                    pass
+            try:
+                race_ids = set(race.objects.filter(pk__in=race_ids).values_list('pk', flat=True))
+            except ValueError:
+                return JsonResponse({'count': 0})
+            stats = {st.pk: st for st in RaceStats.objects.filter(pk__in=race_ids)}
+            stats.update((rid, RaceStats.for_race(rid)) for rid in race_ids - stats.keys())
+            total = sum(st.unpaid_with_email if unpaid_reminder else st.email_addresses for st in stats.values())
             return JsonResponse({'count': total})
+        if action == 'retry_job':
+            # Re-send a finished job to only the recipients that did not get it
+            try:
+                job = EmailSendJob.objects.get(pk=data.get('job_id'))
+            except (EmailSendJob.DoesNotExist, ValueError, TypeError):
+                return JsonResponse({'success': False, 'error': 'Job not found.'}, status=404)
+            if job.status != EmailSendJob.STATUS_FAILED:
+                return JsonResponse({'success': False, 'error': 'Only failed jobs can be retried.'}, status=400)
+            count = retry_failed_deliveries(job)
+            notify_email_jobs()
+            return JsonResponse({
+                'success': True,
+                'message': f'Job re-queued for {count} recipient(s) who have not received it yet.',
+            })
 
-    recent_jobs = EmailSendJob.objects.order_by('-created_at')[:10]
+    recent_jobs = EmailSendJob.objects.select_related('race').annotate(
+        delivery_total=Count('deliveries'),
+        delivery_sent=Count('deliveries', filter=Q(deliveries__status=EmailDelivery.STATUS_SENT)),
+    ).order_by('-created_at')[:10]
     context = {'races': races, 'recent_jobs': recent_jobs}
     return render(request, 'tracker/email_list.html', context)
 
@@ -1017,16 +1351,12 @@ def generate_runner_pdf_report(request):
         messages.warning(request, f"No runners found for race '{selected_race.name}'.")
         return redirect('tracker:select_race_report')
 
-    # Create PDF
-    buffer = io.BytesIO()
-    create_runner_pdf(buffer, selected_race, runners_list, sort_by=sort_by)
-    buffer.seek(0)  # Reset buffer position to the beginning
-
-    # Create HTTP response
-    response = HttpResponse(buffer, content_type='application/pdf')
+    # Create HTTP response and write the PDF straight into it (no intermediate buffer)
+    response = HttpResponse(content_type='application/pdf')
     # Suggest a filename for the download (sanitized to prevent header injection)
     filename = safe_content_disposition_filename(f"race_{selected_race.id}_runners_{sort_by}") + ".pdf"
     response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    create_runner_pdf(response, selected_race, runners_list, sort_by=sort_by)
 
     return response
 
@@ -1060,9 +1390,11 @@ def generate_race_summary_pdf_report(request):
 # ---------------------------API---------------------------------------------
 @csrf_exempt
 @require_api_key
+@single_writer
 def record_lap(request):
     if request.method != 'POST':
         return JsonResponse({'error': 'Method not allowed'}, status=405)
+    note_ingest_activity()
     try:
         laps_data = json.loads(request.body)
 
@@ -1104,9 +1436,7 @@ def record_lap(request):
             try:
                 current_time = time_naive.replace(tzinfo=pytz.utc)
                 race_obj = race.objects.get(id=race_id)
-                rfid_tag_obj = RfidTag.objects.filter(
-                    rfid_hex__iexact=runner_rfid_hex.strip()
-                ).first()
+                rfid_tag_obj = RfidTag.objects.filter(rfid_hex=normalize_rfid_hex(runner_rfid_hex)).first()
                 if not rfid_tag_obj:
                     logger.debug('record_lap: unknown tag hex %s — ignored', runner_rfid_hex)
                     results.append({"runner_rfid": runner_rfid_hex, "status": "success"})
@@ -1237,6 +1567,8 @@ def record_lap(request):
                             # pace: seconds per mile (for timedelta display as min:sec per mile)
                             runner_obj.race_avg_pace = timedelta(seconds=total_seconds * 1609.34 / distance_meters)
                         runner_obj.save()
+                    # Render the result sheet in the background so the runner's download is a cache hit
+                    enqueue_report_prerender(runner_obj.pk, race_obj.pk)
 
                 results.append({"runner_rfid": runner_rfid_hex, "status": "success"})
 
@@ -1261,6 +1593,7 @@ def record_lap(request):
 
 @csrf_exempt
 @require_api_key
+@single_writer
 def update_race_time(request):
     if request.method != 'POST':
         return JsonResponse({'error': 'Method not allowed'}, status=405)
@@ -1303,6 +1636,8 @@ def update_race_time(request):
                 race_obj.end_time = current_time
                 race_obj.status = 'completed'
                 race_obj.save()
+                # Placings are final now; reports pre-rendered mid-race showed fewer finishers
+                enqueue_race_prerender(race_obj.pk)
         else:
             return JsonResponse({'error': 'Invalid action'}, status=400)
 
@@ -1344,7 +1679,7 @@ def create_rfid(request):
 
     if RfidTag.objects.filter(tag_number=tag_number).exists():
         return JsonResponse({'error': f'Tag number {tag_number} already exists'}, status=400)
-    if RfidTag.objects.filter(rfid_hex__iexact=rfid_hex).exists():
+    if RfidTag.objects.filter(rfid_hex=normalize_rfid_hex(rfid_hex)).exists():
         return JsonResponse({'error': 'An RFID tag with that hex value already exists'}, status=400)
 
     RfidTag.objects.create(name=name or '', tag_number=tag_number, rfid_hex=rfid_hex)
@@ -1353,6 +1688,7 @@ def create_rfid(request):
 
 @csrf_exempt
 @require_api_key
+@single_writer
 def assign_tag(request):
     """Assign an existing RFID tag to a runner. Tag must already exist (use create-rfid to create a tag first)."""
     if request.method != 'POST':
@@ -1379,7 +1715,7 @@ def assign_tag(request):
     if not runner_obj:
         return JsonResponse({'error': 'Runner not found'}, status=404)
 
-    rfid_tag_obj = RfidTag.objects.filter(rfid_hex__iexact=rfid_tag).first()
+    rfid_tag_obj = RfidTag.objects.filter(rfid_hex=normalize_rfid_hex(rfid_tag)).first()
     if not rfid_tag_obj:
         return JsonResponse({'error': 'RFID tag not found with that hex value'}, status=400)
 
@@ -1498,6 +1834,9 @@ def rfid_tags_list(request):
                 messages.error(request, 'Tag not found.')
             return redirect('tracker:rfid_tags_list')
 
+        if request.POST.get('action') == 'import':
+            return _rfid_tags_import_post(request)
+
         name = (request.POST.get('name') or '').strip()
         tag_number = request.POST.get('tag_number')
         rfid_hex = (request.POST.get('rfid_hex') or '').strip()
@@ -1512,13 +1851,246 @@ def rfid_tags_list(request):
             except ValueError:
                 messages.error(request, 'Tag number must be a whole number.')
             except IntegrityError:
-                messages.error(request, f'Tag number {tag_number} already exists.')
+                messages.error(request, f'Tag number {tag_number} or that RFID hex value already exists.')
         else:
             messages.error(request, 'Tag number and RFID hex are required.')
         return redirect('tracker:rfid_tags_list')
 
     tags = RfidTag.objects.all().order_by('tag_number')
-    return render(request, 'tracker/rfid_tags.html', {'tags': tags})
+    return render(request, 'tracker/rfid_tags.html', {'tags': tags, 'max_import_rows': RFID_IMPORT_MAX_ROWS})
+
+
+def _rfid_tags_import_post(request):
+    """Tag import from the RFID tags page: redirect with a summary, or show the row errors."""
+    uploaded_file = request.FILES.get('file')
+    start_number, error = _rfid_start_number(request.POST.get('start_number'))
+    result = None
+    if not uploaded_file:
+        messages.error(request, 'Choose a CSV or reader dump file to import.')
+    elif error:
+        messages.error(request, error)
+    else:
+        try:
+            result = import_rfid_tags_from_file(
+                uploaded_file, start_number, skip_existing=request.POST.get('skip_existing') in _TRUE_VALUES
+            )
+        except ImportFileError as e:
+            messages.error(request, str(e))
+    if result is not None and not result['errors']:
+        summary = f"Imported {result['created']} RFID tag(s)."
+        if result['skipped']:
+            summary += f" Skipped {result['skipped']} already in the inventory."
+        messages.success(request, summary)
+        return redirect('tracker:rfid_tags_list')
+    if result is not None:
+        messages.error(request, 'Nothing was imported. Fix the rows below and upload the file again.')
+    tags = RfidTag.objects.all().order_by('tag_number')
+    return render(request, 'tracker/rfid_tags.html', {
+        'tags': tags,
+        'max_import_rows': RFID_IMPORT_MAX_ROWS,
+        'import_result': result,
+    })
+
+
+# Most tags accepted in one tag import file
+RFID_IMPORT_MAX_ROWS = 10000
+
+RFID_EXPORT_COLUMNS = ('tag_number', 'name', 'rfid_hex')
+
+
+def _read_rfid_import_rows(uploaded_file):
+    """Read an uploaded tag file into a list of (row_number, tag_number_text, rfid_hex, name).
+    A CSV whose first row names an rfid_hex (or rfid_tag) column is read by header
+    (tag_number, rfid_hex, name); anything else is taken as a reader dump, one tag hex value
+    per line (first column), and tag_number_text is None."""
+    text = io.TextIOWrapper(uploaded_file.file, encoding='utf-8-sig', newline='')
+    rows = []
+    try:
+        reader = csv.reader(text)
+        first = next(reader, None) or []
+        header = [_import_column(h) for h in first]
+        hex_column = next((c for c in ('rfid_hex', 'rfid_tag') if c in header), None)
+        if hex_column is None:
+            lines = itertools.chain([first], reader)
+        else:
+            lines = reader
+        for values in lines:
+            if hex_column is None:
+                row = {'rfid_hex': values[0].strip() if values else ''}
+            else:
+                row = {key: value.strip() for key, value in zip(header, values) if key}
+                row['rfid_hex'] = row.get(hex_column, '')
+            if not any(row.values()):
+                continue
+            if len(rows) >= RFID_IMPORT_MAX_ROWS:
+                raise ImportFileError(f'Too many rows (at most {RFID_IMPORT_MAX_ROWS} per file)')
+            tag_number = row.get('tag_number', '') if hex_column else None
+            rows.append((reader.line_num, tag_number, row['rfid_hex'], row.get('name', '')))
+    except UnicodeDecodeError:
+        raise ImportFileError('File must be UTF-8 encoded text')
+    except csv.Error as e:
+        raise ImportFileError(f'Could not read the file: {e}')
+    finally:
+        text.detach()
+    return rows
+
+
+def import_rfid_tags_from_file(uploaded_file, start_number=None, skip_existing=False):
+    """
+    Bulk-create RFID tags from a CSV (tag_number, rfid_hex, name) or a reader dump (one hex
+    per line; numbered from start_number, default one past the highest tag number, skipping
+    numbers already in use). Duplicates of the inventory are found with one query; with
+    skip_existing they are skipped, otherwise reported. Any error means nothing is saved.
+    Returns {'rows', 'created', 'skipped', 'errors': [{'row', 'errors'}]}. Raises
+    ImportFileError for an unreadable file.
+    """
+    rows = _read_rfid_import_rows(uploaded_file)
+    dump = bool(rows) and rows[0][1] is None
+    row_errors = []
+    parsed = []  # (row_number, tag_number or None, rfid_hex, name)
+    for row_number, tag_number, rfid_hex, name in rows:
+        errors = []
+        if not dump:
+            try:
+                tag_number = int(tag_number)
+                if tag_number < 1:
+                    errors.append('Tag number must be at least 1')
+            except (TypeError, ValueError):
+                errors.append('Tag number must be a whole number')
+        rfid_hex = normalize_rfid_hex(rfid_hex)
+        if not rfid_hex:
+            errors.append('RFID hex is required')
+        elif len(rfid_hex) > 512:
+            errors.append('RFID hex too long')
+        if len(name) > 255:
+            errors.append('Name too long')
+        if errors:
+            row_errors.append({'row': row_number, 'errors': errors})
+        else:
+            parsed.append((row_number, tag_number, rfid_hex, name))
+
+    if dump and start_number is None:
+        start_number = (RfidTag.objects.aggregate(Max('tag_number'))['tag_number__max'] or 0) + 1
+    hexes = {rfid_hex for _, _, rfid_hex, _ in parsed}
+    numbers_filter = Q(tag_number__gte=start_number) if dump else Q(tag_number__in=[n for _, n, _, _ in parsed])
+    existing_numbers = set()
+    existing_hexes = set()
+    if parsed:
+        for tag_number, rfid_hex in (
+            RfidTag.objects.filter(numbers_filter | Q(rfid_hex__in=hexes)).values_list('tag_number', 'rfid_hex')
+        ):
+            existing_numbers.add(tag_number)
+            existing_hexes.add(rfid_hex)
+
+    new_tags = []
+    skipped = 0
+    seen_numbers = set()
+    seen_hexes = set()
+    next_number = start_number
+    for row_number, tag_number, rfid_hex, name in parsed:
+        errors = []
+        if rfid_hex in seen_hexes:
+            errors.append('RFID hex appears more than once in the file')
+        elif rfid_hex in existing_hexes:
+            if skip_existing:
+                skipped += 1
+                continue
+            errors.append('An RFID tag with that hex value already exists')
+        if dump:
+            while next_number in existing_numbers:
+                next_number += 1
+            tag_number = next_number
+        elif tag_number in seen_numbers:
+            errors.append(f'Tag number {tag_number} appears more than once in the file')
+        elif tag_number in existing_numbers:
+            if skip_existing and not errors:
+                skipped += 1
+                continue
+            errors.append(f'Tag number {tag_number} already exists')
+        seen_hexes.add(rfid_hex)
+        seen_numbers.add(tag_number)
+        if errors:
+            row_errors.append({'row': row_number, 'errors': errors})
+            continue
+        if dump:
+            next_number += 1
+        new_tags.append(RfidTag(tag_number=tag_number, rfid_hex=rfid_hex, name=name))
+
+    result = {'rows': len(rows), 'created': 0, 'skipped': skipped, 'errors': sorted(row_errors, key=lambda e: e['row'])}
+    if row_errors or not new_tags:
+        return result
+    try:
+        with transaction.atomic():
+            RfidTag.objects.bulk_create(new_tags, batch_size=1000)
+    except IntegrityError:
+        raise ImportFileError('Some of these tag numbers were added meanwhile; import the file again')
+    result['created'] = len(new_tags)
+    return result
+
+
+class _Echo:
+    """File-like object whose write() returns the value, for streaming csv.writer output."""
+
+    def write(self, value):
+        return value
+
+
+def _rfid_export_rows():
+    writer = csv.writer(_Echo())
+    yield writer.writerow(RFID_EXPORT_COLUMNS)
+    for values in RfidTag.objects.order_by('tag_number').values_list(*RFID_EXPORT_COLUMNS).iterator(chunk_size=2000):
+        yield writer.writerow(values)
+
+
+@login_required
+def rfid_tags_export(request):
+    """Stream the whole tag inventory as CSV (same columns the tag import reads)."""
+    response = StreamingHttpResponse(_rfid_export_rows(), content_type='text/csv')
+    response['Content-Disposition'] = 'attachment; filename="rfid-tags.csv"'
+    return response
+
+
+@csrf_exempt
+@require_api_key_or_login
+def import_rfid_tags(request):
+    """POST (multipart): bulk-create RFID tags from a CSV or reader dump file. Expects file;
+    optional start_number (reader dumps) and skip_existing. Returns JSON with a per-row error
+    report. Auth: API key or session."""
+    if request.method != 'POST':
+        return JsonResponse({'success': False, 'errors': ['Method not allowed']}, status=405)
+    uploaded_file = request.FILES.get('file')
+    if not uploaded_file:
+        return JsonResponse({'success': False, 'errors': ['file required']}, status=400)
+    start_number, error = _rfid_start_number(request.POST.get('start_number'))
+    if error:
+        return JsonResponse({'success': False, 'errors': [error]}, status=400)
+    try:
+        result = import_rfid_tags_from_file(
+            uploaded_file, start_number, skip_existing=request.POST.get('skip_existing') in _TRUE_VALUES
+        )
+    except ImportFileError as e:
+        return JsonResponse({'success': False, 'errors': [str(e)]}, status=400)
+    success = not result['errors']
+    return JsonResponse({
+        'success': success,
+        'rows': result['rows'],
+        'created': result['created'],
+        'skipped': result['skipped'],
+        'row_errors': result['errors'],
+    }, status=200 if success else 400)
+
+
+def _rfid_start_number(value):
+    """Parse the optional start_number of a tag import. Returns (number_or_None, error)."""
+    if value is None or str(value).strip() == '':
+        return None, None
+    try:
+        number = int(value)
+    except (TypeError, ValueError):
+        return None, 'Start number must be a whole number'
+    if number < 1:
+        return None, 'Start number must be at least 1'
+    return number, None
 
 
 # View for generating API keys
@@ -1538,25 +2110,16 @@ def generate_api_key(request):
 # ----------------------------Assign numbers--------------------------------------
 def _assign_numbers_preview(race_local, starting_tag):
     """Return dict with next_tag_number (next unused tag >= starting_tag) and unassigned_count."""
-    tags_in_use = set(
-        runners.objects.filter(race=race_local).exclude(tag__isnull=True).values_list('tag_id', flat=True)
-    )
-    next_tag = (
-        RfidTag.objects.exclude(pk__in=tags_in_use)
-        .filter(tag_number__gte=starting_tag)
-        .order_by('tag_number')
-        .first()
-    )
-    unassigned_count = runners.objects.filter(
-        race=race_local, number__isnull=True, tag__isnull=True
-    ).count()
+    next_tags = free_tags(race_local, starting_tag, 1)
+    unassigned_count = RaceStats.for_race(race_local.pk).unassigned
     return {
-        'next_tag_number': next_tag.tag_number if next_tag else None,
+        'next_tag_number': next_tags[0].tag_number if next_tags else None,
         'unassigned_count': unassigned_count,
     }
 
 
 @login_required
+@single_writer
 def assign_numbers(request):
     races = race.objects.exclude(status='in_progress').exclude(status='completed').filter(archived=False)
 
@@ -1571,37 +2134,9 @@ def assign_numbers(request):
         if starting_tag < 1:
             starting_tag = 1
 
-        runners_unassigned = runners.objects.filter(
-            race=race_local, number__isnull=True, tag__isnull=True
-        ).order_by('id')
-        if runners_unassigned.exists():
-            tags_in_use = set(
-                runners.objects.filter(race=race_local).exclude(tag__isnull=True).values_list('tag_id', flat=True)
-            )
-            available_tags = list(
-                RfidTag.objects.exclude(pk__in=tags_in_use)
-                .filter(tag_number__gte=starting_tag)
-                .order_by('tag_number')
-            )
-            existing_numbers = set(
-                runners.objects.filter(race=race_local, number__isnull=False).values_list('number', flat=True)
-            )
-            assigned_numbers = set()
-            assigned_with_tag = 0
-            assigned_no_tag = 0
-
+        if runners.objects.filter(race=race_local, number__isnull=True, tag__isnull=True).exists():
             try:
-                with transaction.atomic():
-                    for i, runner in enumerate(runners_unassigned):
-                        if i < len(available_tags):
-                            tag = available_tags[i]
-                            runner.number = tag.tag_number
-                            runner.tag = tag
-                            assigned_numbers.add(tag.tag_number)
-                            assigned_with_tag += 1
-                            runner.save()
-                        else:
-                            break
+                assigned_with_tag, remaining = assign_tags_to_unassigned(race_local, starting_tag)
             except IntegrityError:
                 messages.error(
                     request,
@@ -1617,7 +2152,6 @@ def assign_numbers(request):
                     'starting_tag': starting_tag,
                 })
 
-            remaining = runners_unassigned.count() - assigned_with_tag
             if remaining == 0:
                 messages.success(
                     request,
@@ -1673,69 +2207,83 @@ def assign_numbers(request):
 # ---------------------------Public Views------------------------------------------
 
 
-@cache_unless_authenticated(60)
-def race_overview(request):
-    current_race = race.objects.filter(status='in_progress', archived=False).first()
-
-    # Initialize an empty list to store runner times
+def _race_overview_runner_times(race_obj):
+    """Leaderboard rows for race_overview: every runner of race_obj with their laps, by place."""
     runner_times = []
+    # Get all runners for the current race
+    runnersall = runners.objects.filter(race=race_obj).order_by(F('place').asc(nulls_last=True))
+    race_laps = laps_by_runner(race_obj.pk)
+
+    # Create a list of runner names and their total race times
+    for arunner in runnersall:
+        run_laps = []
+        for lap in race_laps.get(arunner.pk, []):
+            if lap.lap == 0:
+                continue  # exclude chip start from lap list
+            lap_dur = getattr(lap, 'duration', None)
+            lap_pace = getattr(lap, 'average_pace', None)
+            lap_speed = getattr(lap, 'average_speed', None)
+            run_laps.append({
+                'lap': lap.lap,
+                'duration': timedelta(seconds=round(lap_dur.total_seconds())) if lap_dur else timedelta(0),
+                'average_pace': timedelta(seconds=round(lap_pace.total_seconds())) if lap_pace else timedelta(0),
+                'average_speed': lap_speed
+            })
 
-    if current_race:
-        # Get all runners for the current race
-        runnersall = runners.objects.filter(race=current_race).order_by(F('place').asc(nulls_last=True))
-
-        # Create a list of runner names and their total race times
-        for arunner in runnersall:
-            run_laps = []
-            alap = laps.objects.filter(runner=arunner).order_by('lap')
-            for lap in alap:
-                if lap.lap == 0:
-                    continue  # exclude chip start from lap list
-                lap_dur = getattr(lap, 'duration', None)
-                lap_pace = getattr(lap, 'average_pace', None)
-                lap_speed = getattr(lap, 'average_speed', None)
-                run_laps.append({
-                    'lap': lap.lap,
-                    'duration': timedelta(seconds=round(lap_dur.total_seconds())) if lap_dur else timedelta(0),
-                    'average_pace': timedelta(seconds=round(lap_pace.total_seconds())) if lap_pace else timedelta(0),
-                    'average_speed': lap_speed
-                })
+        runner_times.append({
+            'number': arunner.number,
+            'name': f"{arunner.first_name} {arunner.last_name}",
+            'total_race_time': (
+                timedelta(seconds=round(trt.total_seconds()))
+                if (trt := arunner.total_race_time) is not None
+                else "Not Finished"
+            ),
+            'gun_time': (
+                timedelta(seconds=round(trt.total_seconds()))
+                if (trt := arunner.total_race_time) is not None
+                else None
+            ),
+            'chip_time': (
+                timedelta(seconds=round(ct.total_seconds()))
+                if (ct := getattr(arunner, 'chip_time', None)) is not None
+                else None
+            ),
+            'average_pace': (
+                timedelta(seconds=round(trt.total_seconds()))
+                if (trt := arunner.race_avg_pace) is not None
+                else "Not Finished"
+            ),
+            'average_speed': arunner.race_avg_speed if arunner.race_avg_speed is not None else "Not Finished",
+            'place': arunner.place,
+            'gender': arunner.gender,
+            'type': arunner.type,
+            'laps': run_laps
 
-            runner_times.append({
-                'number': arunner.number,
-                'name': f"{arunner.first_name} {arunner.last_name}",
-                'total_race_time': (
-                    timedelta(seconds=round(trt.total_seconds()))
-                    if (trt := arunner.total_race_time) is not None
-                    else "Not Finished"
-                ),
-                'gun_time': (
-                    timedelta(seconds=round(trt.total_seconds()))
-                    if (trt := arunner.total_race_time) is not None
-                    else None
-                ),
-                'chip_time': (
-                    timedelta(seconds=round(ct.total_seconds()))
-                    if (ct := getattr(arunner, 'chip_time', None)) is not None
-                    else None
-                ),
-                'average_pace': (
-                    timedelta(seconds=round(trt.total_seconds()))
-                    if (trt := arunner.race_avg_pace) is not None
-                    else "Not Finished"
-                ),
-                'average_speed': arunner.race_avg_speed if arunner.race_avg_speed is not None else "Not Finished",
-                'place': arunner.place,
-                'gender': arunner.gender,
-                'type': arunner.type,
-                'laps': run_laps
+        })
+    return runner_times
 
-            })
 
-    # Pass the runner times to the template
+@replica_reads
+def race_overview(request):
+    current_race = race.objects.filter(status='in_progress', archived=False).first()
+    race_name = current_race.name if current_race else "No current race"
+
+    def render_results():
+        runner_times = _race_overview_runner_times(current_race) if current_race else []
+        return render_to_string('tracker/race_overview_results.html', {
+            'runner_times': runner_times,
+            'race_name': race_name,
+        })
+
+    # The leaderboard is shared by every visitor and only rebuilt after the race changes;
+    # the page around it (finish form for staff) is rendered per request
+    if current_race:
+        results_html = cached_html_fragment('overview', current_race.pk, render_results)
+    else:
+        results_html = mark_safe(render_results())
     context = {
-        'runner_times': runner_times,
-        'race_name': current_race.name if current_race else "No current race",
+        'results_html': results_html,
+        'race_name': race_name,
         'current_race': current_race,
     }
 
@@ -1752,7 +2300,7 @@ def format_timedelta(td):
     return f"{hours:02}:{minutes:02}:{seconds:02}"
 
 
-@cache_unless_authenticated(60)
+@replica_reads
 def completed_races_selection(request):
     completed_races = race.objects.filter(status='completed', hidden_from_past_races=False)
     context = {
@@ -1761,6 +2309,68 @@ def completed_races_selection(request):
     return render(request, 'tracker/completed_races_selection.html', context)
 
 
+def _completed_race_results(race_obj):
+    """JSON payload of get_completed_race_overview: every runner of race_obj with their laps."""
+    runner_times = []
+    try:
+        runnersall = runners.objects.filter(race=race_obj).order_by(F('place').asc(nulls_last=True))
+    except (TypeError, AttributeError):
+        runnersall = runners.objects.filter(race=race_obj).order_by('place')
+    race_laps = laps_by_runner(race_obj.pk)
+
+    for arunner in runnersall:
+        run_laps = []
+        for lap in race_laps.get(arunner.pk, []):
+            if lap.lap == 0:
+                continue  # exclude chip start from lap list
+            run_laps.append({
+                'lap': lap.lap,
+                'duration': format_timedelta(lap.duration) if lap.duration is not None else "—",
+                'average_pace': format_timedelta(lap.average_pace) if lap.average_pace is not None else "—",
+                'average_speed': float(lap.average_speed) if lap.average_speed is not None else "—",
+            })
+        name = f"{(arunner.first_name or '')} {(arunner.last_name or '')}".strip() or "—"
+        avg_speed = arunner.race_avg_speed
+        if avg_speed is not None and hasattr(avg_speed, '__float__'):
+            avg_speed = float(avg_speed)
+        runner_times.append({
+            'number': arunner.number,
+            'name': name,
+            'total_race_time': (
+                format_timedelta(td)
+                if (td := arunner.total_race_time) is not None
+                else "Not Finished"
+            ),
+            'gun_time': (
+                format_timedelta(td)
+                if (td := arunner.total_race_time) is not None
+                else None
+            ),
+            'chip_time': (
+                format_timedelta(td)
+                if (td := getattr(arunner, 'chip_time', None)) is not None
+                else None
+            ),
+            'average_pace': (
+                format_timedelta(td)
+                if (td := arunner.race_avg_pace) is not None
+                else "Not Finished"
+            ),
+            'average_speed': avg_speed if avg_speed is not None else "Not Finished",
+            'place': arunner.place,
+            'gender': arunner.gender or None,
+            'type': arunner.type or None,
+            'laps': run_laps
+        })
+
+    return {
+        'runner_times': runner_times,
+        'race_name': race_obj.name,
+        'race_id': race_obj.pk,
+    }
+
+
+@replica_reads
 def get_completed_race_overview(request, race_id):
     try:
         try:
@@ -1770,64 +2380,7 @@ def get_completed_race_overview(request, race_id):
                 {'error': 'Race not found.', 'runner_times': [], 'race_name': '', 'race_id': race_id},
                 status=404
             )
-
-        runner_times = []
-        try:
-            runnersall = runners.objects.filter(race=current_race).order_by(F('place').asc(nulls_last=True))
-        except (TypeError, AttributeError):
-            runnersall = runners.objects.filter(race=current_race).order_by('place')
-
-        for arunner in runnersall:
-            run_laps = []
-            alap = laps.objects.filter(runner=arunner).order_by('lap')
-            for lap in alap:
-                if lap.lap == 0:
-                    continue  # exclude chip start from lap list
-                run_laps.append({
-                    'lap': lap.lap,
-                    'duration': format_timedelta(lap.duration) if lap.duration is not None else "—",
-                    'average_pace': format_timedelta(lap.average_pace) if lap.average_pace is not None else "—",
-                    'average_speed': float(lap.average_speed) if lap.average_speed is not None else "—",
-                })
-            name = f"{(arunner.first_name or '')} {(arunner.last_name or '')}".strip() or "—"
-            avg_speed = arunner.race_avg_speed
-            if avg_speed is not None and hasattr(avg_speed, '__float__'):
-                avg_speed = float(avg_speed)
-            runner_times.append({
-                'number': arunner.number,
-                'name': name,
-                'total_race_time': (
-                    format_timedelta(td)
-                    if (td := arunner.total_race_time) is not None
-                    else "Not Finished"
-                ),
-                'gun_time': (
-                    format_timedelta(td)
-                    if (td := arunner.total_race_time) is not None
-                    else None
-                ),
-                'chip_time': (
-                    format_timedelta(td)
-                    if (td := getattr(arunner, 'chip_time', None)) is not None
-                    else None
-                ),
-                'average_pace': (
-                    format_timedelta(td)
-                    if (td := arunner.race_avg_pace) is not None
-                    else "Not Finished"
-                ),
-                'average_speed': avg_speed if avg_speed is not None else "Not Finished",
-                'place': arunner.place,
-                'gender': arunner.gender or None,
-                'type': arunner.type or None,
-                'laps': run_laps
-            })
-
-        context = {
-            'runner_times': runner_times,
-            'race_name': current_race.name,
-            'race_id': race_id,
-        }
+        context = cached_fragment('results', current_race.pk, lambda: _completed_race_results(current_race))
         return JsonResponse(context)
     except Exception as e:
         logger.exception("get_completed_race_overview failed for race_id=%s", race_id)
@@ -1945,10 +2498,12 @@ def _capture_paypal_order(order_id):
     }, None
 
 
-def _pay_link_for_runner(runner):
-    """Build the pay-later URL for a runner, or None if site_base_url is not set."""
-    site_settings = SiteSettings.get_settings()
-    base = (site_settings.site_base_url or '').strip().rstrip('/')
+def _pay_link_for_runner(runner, site_base_url=None):
+    """Build the pay-later URL for a runner, or None if site_base_url is not set.
+    Pass site_base_url when building many links to skip the SiteSettings lookup."""
+    if site_base_url is None:
+        site_base_url = get_site_settings().site_base_url
+    base = (site_base_url or '').strip().rstrip('/')
     if not base:
         return None
     signature = _paypal_sign_runner_id(runner.id)
@@ -1956,80 +2511,100 @@ def _pay_link_for_runner(runner):
     return base + path
 
 
-def send_signup_confirmation_email(runner):
+def build_signup_confirmation_email(runner, from_email=None, site_base_url=None):
     """
-    Send a single signup confirmation email to the runner.
+    Build the signup confirmation message for runner (with race selected), or None if the
+    runner has no email address.
     If paid: confirm signup and payment. If not paid: confirm signup and include pay link if site_base_url is set.
-    Marks runner.signup_confirmation_sent = True.
+    from_email / site_base_url: pass when building a batch so settings are read once.
     """
     if not runner.email or (runner.email or '').strip() == '':
-        runner.signup_confirmation_sent = True
-        runner.save(update_fields=['signup_confirmation_sent'])
-        return
+        return None
     race_obj = runner.race
     race_name = race_obj.name
     race_date = race_obj.date
     race_time = race_obj.scheduled_time
     entry_fee = float(race_obj.Entry_fee or 0)
-    from_email = getattr(settings, 'DEFAULT_FROM_EMAIL', None) or getattr(settings, 'EMAIL_HOST_USER', 'noreply@example.com')
+    if from_email is None:
+        from_email = getattr(settings, 'DEFAULT_FROM_EMAIL', None) or getattr(settings, 'EMAIL_HOST_USER', 'noreply@example.com')
     subject = f"Signup confirmed: {race_name}"
+    body = f"Hi {runner.first_name},\n\nYou're signed up for {race_name}."
+    if race_date:
+        body += f" The race is on {race_date}"
+        if race_time:
+            body += f" at {race_time}"
+        body += "."
     if runner.paid:
-        body = f"Hi {runner.first_name},\n\nYou're signed up for {race_name}."
-        if race_date:
-            body += f" The race is on {race_date}"
-            if race_time:
-                body += f" at {race_time}"
-            body += "."
         body += "\n\nYour payment has been received. See you on race day!"
     else:
-        body = f"Hi {runner.first_name},\n\nYou're signed up for {race_name}."
-        if race_date:
-            body += f" The race is on {race_date}"
-            if race_time:
-                body += f" at {race_time}"
-            body += "."
         if entry_fee > 0:
             body += f"\n\nThe entry fee is ${entry_fee:.2f}."
-            pay_link = _pay_link_for_runner(runner)
+            pay_link = _pay_link_for_runner(runner, site_base_url)
             if pay_link:
                 body += f"\n\nIf you haven't paid yet, you can pay here: {pay_link}"
             body += "\n\nYou can also pay on race day when you check in."
         body += "\n\nSee you on race day!"
     body += "\n\n---\nThis is an unmonitored email account. Please do not reply."
-    send_mail(
-        subject=subject,
-        message=body,
-        from_email=from_email,
-        recipient_list=[runner.email],
-        fail_silently=False,
-    )
+    return EmailMessage(subject, body, from_email, [runner.email])
+
+
+def send_signup_confirmation_email(runner, token_timeout=None):
+    """
+    Send a single signup confirmation email to the runner (see build_signup_confirmation_email).
+    Marks runner.signup_confirmation_sent = True.
+    token_timeout: max seconds to wait for the shared send rate limiter (None = wait). If no
+    token is granted in time the email is not sent (returns False): the runner is marked
+    signup_confirmation_deferred and the background signup confirmation worker sends it
+    right away instead.
+    """
+    email = build_signup_confirmation_email(runner)
+    if email is None:
+        runner.signup_confirmation_sent = True
+        runner.save(update_fields=['signup_confirmation_sent'])
+        return True
+    if not acquire_email_send_token(timeout=token_timeout):
+        logger.info("Send rate limit busy; signup confirmation for runner pk=%s left to background worker", runner.pk)
+        runner.signup_confirmation_deferred = True
+        runner.save(update_fields=['signup_confirmation_deferred'])
+        notify_signup_confirmations()
+        return False
+    email.send(fail_silently=False)
     runner.signup_confirmation_sent = True
     runner.save(update_fields=['signup_confirmation_sent'])
+    return True
 
 
+@replica_reads
 def race_signup(request):
     if request.method == 'POST':
         form = SignupForm(request.POST)
         if form.is_valid():
             selected_race = form.cleaned_data['race']
-            runner = form.save()
-            runner.send_signup_confirmation = True
-            runner.save(update_fields=['send_signup_confirmation'])
-            site_settings = SiteSettings.get_settings()
+            def save_signup():
+                runner = form.save()
+                runner.send_signup_confirmation = True
+                runner.save(update_fields=['send_signup_confirmation'])
+                return runner
+
+            # Only the write is serialized; the PayPal call below must not hold up lap ingest
+            runner = run_serialized(save_signup)
+            site_settings = get_site_settings()
             entry_fee = float(selected_race.Entry_fee or 0)
             paypal_configured = bool(settings.PAYPAL_CLIENT_ID and settings.PAYPAL_CLIENT_SECRET)
             if site_settings.paypal_enabled and paypal_configured and entry_fee > 0:
                 try:
                     approve_url, _ = _create_paypal_order(request, runner, selected_race)
+                    # Confirmation is sent on PayPal return, or by the worker after the timeout
+                    notify_signup_confirmations()
                     return redirect(approve_url)
                 except Exception:
                     logger.exception("PayPal order creation failed for runner pk=%s", runner.pk)
-            send_signup_confirmation_email(runner)
+            send_signup_confirmation_email(runner, token_timeout=EMAIL_REQUEST_TOKEN_TIMEOUT_SECONDS)
             return redirect(reverse('tracker:signup-success', args=[selected_race.id]))
     else:
         form = SignupForm()
     current_races = race.objects.filter(status='signup_open', archived=False).order_by('date', 'scheduled_time')
-    banners = Banner.objects.active_for_page(Banner.PAGE_SIGNUP)
+    banners = active_banners(Banner.PAGE_SIGNUP)
     context = {'form': form, 'current_races': current_races, 'banners': banners}
     return render(request, 'tracker/signup.html', context)
 
@@ -2101,7 +2676,7 @@ def paypal_return(request):
     runner.save(update_fields=['paid'])
 
     if runner.send_signup_confirmation and not runner.signup_confirmation_sent:
-        send_signup_confirmation_email(runner)
+        send_signup_confirmation_email(runner, token_timeout=EMAIL_REQUEST_TOKEN_TIMEOUT_SECONDS)
 
     context['paid'] = True
     logger.info("PayPal payment captured: order=%s capture=%s runner=%s amount=%s",
@@ -2115,6 +2690,8 @@ def paypal_cancel(request):
     """
     if request.GET.get('sent') == '1':
         return render(request, 'tracker/paypal_cancel.html', {'sent': True})
+    if request.GET.get('sent') == 'queued':
+        return render(request, 'tracker/paypal_cancel.html', {'queued': True})
 
     runner = None
     token = request.GET.get('token', '').strip()
@@ -2128,8 +2705,8 @@ def paypal_cancel(request):
 
     if runner is not None:
         if runner.send_signup_confirmation and not runner.signup_confirmation_sent:
-            send_signup_confirmation_email(runner)
-            return redirect(reverse('tracker:paypal-cancel') + '?sent=1')
+            sent = send_signup_confirmation_email(runner, token_timeout=EMAIL_REQUEST_TOKEN_TIMEOUT_SECONDS)
+            return redirect(reverse('tracker:paypal-cancel') + ('?sent=1' if sent else '?sent=queued'))
 
     return render(request, 'tracker/paypal_cancel.html', {'sent': False})
 
@@ -2147,7 +2724,7 @@ def pay_entry(request, runner_id, signature):
         raise Http404("Runner not found.")
     if runner_obj.paid:
         return redirect(reverse('tracker:signup-success', args=[runner_obj.race_id]))
-    site_settings = SiteSettings.get_settings()
+    site_settings = get_site_settings()
     race_obj = runner_obj.race
     entry_fee = float(race_obj.Entry_fee or 0)
     paypal_configured = settings.PAYPAL_CLIENT_ID and settings.PAYPAL_CLIENT_SECRET
@@ -2161,11 +2738,17 @@ def pay_entry(request, runner_id, signature):
         return redirect(reverse('tracker:signup-success', args=[race_obj.id]))
 
 
-def race_countdown(request):
-    """Get countdown for all upcoming races along with active race information"""
-    # Get races that haven't started yet (status is signup_open or signup_closed), exclude archived
+# Browsers count down locally and re-fetch the schedule this often...
+COUNTDOWN_POLL_SECONDS = 60
+# ...and may reuse a fetched schedule for this long without asking the server
+COUNTDOWN_MAX_AGE = 30
+
+
+def _countdown_schedule():
+    """Public schedule for the race list countdown: upcoming races with absolute start times
+    (epoch milliseconds, None if not scheduled) and the active race, if any."""
+    # Races that haven't started yet (status is signup_open or signup_closed), exclude archived
     upcoming_races = race.objects.filter(status__in=['signup_open', 'signup_closed'], archived=False).order_by('date', 'scheduled_time')
-    # Check for an active race (exclude archived)
     active_race = race.objects.filter(status='in_progress', archived=False).first()
     active_race_data = None
 
@@ -2174,27 +2757,45 @@ def race_countdown(request):
             'id': active_race.id,
             'name': active_race.name,
         }
-    # Calculate remaining time for each race
+    tz = timezone.get_default_timezone()
     race_data = []
     for r in upcoming_races:
-        # Combine date and scheduled_time; skip if no scheduled time
-        if r.scheduled_time is None:
-            remaining = {'days': 0, 'hours': 0, 'minutes': 0, 'seconds': 0}
-        else:
-            start_time = datetime.combine(r.date, r.scheduled_time)
-            remaining = format_remaining_time(start_time)
+        starts_at = None
+        if r.scheduled_time is not None:
+            start_time = timezone.make_aware(datetime.combine(r.date, r.scheduled_time), tz)
+            starts_at = int(start_time.timestamp() * 1000)
         race_data.append({
             'id': r.id,
             'name': r.name,
             'distance': f"{r.distance} meters",
             'laps_count': f"{r.laps_count} laps",
             'entry_fee': f"${r.Entry_fee:.2f}",
-            'remaining': remaining
+            'starts_at': starts_at,
         })
-    return JsonResponse({'races': race_data, 'active_race': active_race_data}, safe=False)  # Return json in dictionary structure
+    return {'races': race_data, 'active_race': active_race_data}
+
+
+def _countdown_etag(request):
+    version = race_version(SCHEDULE)
+    return None if version is None else str(version)
+
+
+@replica_reads
+@condition(etag_func=_countdown_etag)
+def race_countdown(request):
+    """Schedule for the race list countdown. Start times are absolute, so browsers count down
+    locally and only re-poll every COUNTDOWN_POLL_SECONDS; the version (also the ETag) changes
+    whenever any race is saved, so a conditional re-poll of an unchanged schedule is a 304."""
+    data = dict(cached_fragment('countdown', SCHEDULE, _countdown_schedule))
+    data['version'] = race_version(SCHEDULE)
+    data['poll_seconds'] = COUNTDOWN_POLL_SECONDS
+    response = JsonResponse(data)
+    patch_cache_control(response, public=True, max_age=COUNTDOWN_MAX_AGE)
+    return response
 
 
+@replica_reads
 def race_list(request):
     """Render the race list page."""
-    banners = Banner.objects.active_for_page(Banner.PAGE_HOME)
+    banners = active_banners(Banner.PAGE_HOME)
     return render(request, 'tracker/race_list.html', context={'banners': banners})
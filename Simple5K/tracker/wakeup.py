@@ -0,0 +1,183 @@
+"""
+Wake-ups for the background workers, so queued work is picked up immediately and idle
+workers do not poll the database.
+
+notify(channel) is called by code that queues work (after its transaction commits);
+Waiter(channel).wait(timeout) blocks the worker until a notification arrives or the
+timeout expires. Delivery:
+
+- PostgreSQL: LISTEN/NOTIFY on a dedicated connection, so any process or host can wake
+  the worker.
+- Other databases (SQLite, MySQL): a UDP ping to 127.0.0.1 on WORKER_WAKEUP_PORT (one
+  port per channel), so any process on the same host can wake it. If the port cannot
+  be bound the worker falls back to an in-process event.
+
+Wake-ups are hints only: the worker still re-checks the database when its timeout
+expires, so a lost notification only delays work.
+"""
+import logging
+import select
+import socket
+import threading
+
+logger = logging.getLogger(__name__)
+
+CHANNEL_EMAIL_JOBS = 'simple5k_email_jobs'
+CHANNEL_SIGNUP_CONFIRMATIONS = 'simple5k_signup_confirmations'
+CHANNELS = (CHANNEL_EMAIL_JOBS, CHANNEL_SIGNUP_CONFIRMATIONS)
+
+# Base UDP port for non-PostgreSQL wake-ups; channel N uses base + N.
+# Override with settings.WORKER_WAKEUP_PORT.
+WORKER_WAKEUP_PORT = 47651
+
+_events = {channel: threading.Event() for channel in CHANNELS}
+
+
+def _is_postgres():
+    from django.db import connection
+
+    return connection.vendor == 'postgresql'
+
+
+def _wakeup_port(channel):
+    from django.conf import settings
+
+    base = getattr(settings, 'WORKER_WAKEUP_PORT', None) or WORKER_WAKEUP_PORT
+    return base + CHANNELS.index(channel)
+
+
+def _send_notification(channel):
+    _events[channel].set()
+    try:
+        if _is_postgres():
+            from django.db import connection
+
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT pg_notify(%s, '')", [channel])
+        else:
+            with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+                sock.sendto(b'1', ('127.0.0.1', _wakeup_port(channel)))
+    except Exception as e:
+        logger.debug("Wake-up notification on %s failed: %s", channel, e)
+
+
+def notify(channel):
+    """Wake the worker listening on channel once the current transaction commits (at once
+    outside a transaction)."""
+    from django.db import transaction
+
+    transaction.on_commit(lambda: _send_notification(channel))
+
+
+class Waiter:
+    """Blocks a worker thread until channel is notified. Create it in the thread that
+    waits, and close() it when that thread stops waiting for good (e.g. loses its lease),
+    so another process can bind the wake-up port."""
+
+    def __init__(self, channel):
+        self.channel = channel
+        self._event = _events[channel]
+        self._sock = None
+        self._pg = None
+        self._pg_woken = False
+        self._open()
+
+    def _open(self):
+        if _is_postgres():
+            self._listen()
+        else:
+            self._bind()
+
+    def _bind(self):
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        try:
+            sock.bind(('127.0.0.1', _wakeup_port(self.channel)))
+            sock.setblocking(False)
+            self._sock = sock
+        except OSError as e:
+            sock.close()
+            logger.warning("Cannot bind wake-up port for %s (%s); only in-process wake-ups will work", self.channel, e)
+
+    def _listen(self):
+        from django.db import DEFAULT_DB_ALIAS, connections
+
+        try:
+            pg = connections.create_connection(DEFAULT_DB_ALIAS)
+            pg.connect()
+            pg.set_autocommit(True)
+            raw = pg.connection
+            if hasattr(raw, 'add_notify_handler'):
+                # psycopg 3 delivers notifications to handlers while processing results
+                raw.add_notify_handler(self._on_pg_notify)
+            with pg.cursor() as cursor:
+                cursor.execute(f'LISTEN "{self.channel}"')
+            self._pg = pg
+        except Exception as e:
+            logger.warning("LISTEN on %s failed (%s); only in-process wake-ups will work", self.channel, e)
+
+    def _on_pg_notify(self, notification):
+        self._pg_woken = True
+
+    def _wait_postgres(self, timeout):
+        raw = self._pg.connection
+        self._pg_woken = False
+        ready, _, _ = select.select([raw], [], [], timeout)
+        if not ready:
+            return False
+        if hasattr(raw, 'add_notify_handler'):
+            raw.execute('SELECT 1')
+        else:
+            # psycopg2
+            raw.poll()
+            self._pg_woken = bool(raw.notifies)
+            raw.notifies.clear()
+        return self._pg_woken
+
+    def _drain_socket(self):
+        # Many queued pings still mean one wake-up
+        try:
+            while True:
+                self._sock.recv(64)
+        except BlockingIOError:
+            pass
+
+    def _wait_socket(self, timeout):
+        ready, _, _ = select.select([self._sock], [], [], timeout)
+        if not ready:
+            return False
+        self._drain_socket()
+        return True
+
+    def wait(self, timeout):
+        """Wait up to timeout seconds. Returns True if woken by a notification."""
+        if self._event.is_set():
+            # Notified from this process; the matching ping would only cause a second wake-up
+            self._event.clear()
+            if self._sock is not None:
+                self._drain_socket()
+            return True
+        try:
+            if self._pg is not None:
+                woken = self._wait_postgres(timeout)
+            elif self._sock is not None:
+                woken = self._wait_socket(timeout)
+            else:
+                woken = self._event.wait(timeout)
+        except Exception as e:
+            logger.warning("Wake-up wait on %s failed (%s); reconnecting", self.channel, e)
+            self.close()
+            woken = self._event.wait(timeout)
+            self._open()
+        self._event.clear()
+        return woken
+
+    def close(self):
+        if self._sock is not None:
+            self._sock.close()
+            self._sock = None
+        if self._pg is not None:
+            try:
+                self._pg.close()
+            except Exception as e:
+                logger.debug("Closing LISTEN connection failed: %s", e)
+            self._pg = None
@@ -0,0 +1,85 @@
+"""
+Database lease used to elect a single active instance of each background loop across
+all processes (gunicorn workers, a dedicated `run_workers` process, other hosts).
+A holder renews its lease while working; if it dies, the lease expires and a standby
+process takes over.
+"""
+import atexit
+import logging
+import os
+import secrets
+import socket
+from datetime import timedelta
+
+logger = logging.getLogger(__name__)
+
+# A lease not renewed for this long is considered abandoned
+LEASE_TTL_SECONDS = 90
+
+# How often a process without the lease checks whether it can take over
+LEASE_STANDBY_POLL_SECONDS = 30
+
+# An idle holder renews its lease this often while waiting for work
+LEASE_RENEW_SECONDS = 30
+
+# Identifies this process as a lease holder (pid alone can repeat across containers/restarts)
+PROCESS_HOLDER_ID = f"{socket.gethostname()}:{os.getpid()}:{secrets.token_hex(4)}"
+
+LEASE_EMAIL_JOBS = 'email_jobs'
+LEASE_SIGNUP_CONFIRMATIONS = 'signup_confirmations'
+
+# Leases this process holds, handed back at interpreter exit so a short-lived process
+# (management command, recycled gunicorn worker) does not block takeover until expiry
+_held_leases = set()
+
+
+class Lease:
+    """A named lease held by this process. acquire() both takes a free/expired lease and
+    renews one already held; call it regularly (well within LEASE_TTL_SECONDS)."""
+
+    def __init__(self, name, holder=None, ttl_seconds=LEASE_TTL_SECONDS):
+        self.name = name
+        self.holder = holder or PROCESS_HOLDER_ID
+        self.ttl = timedelta(seconds=ttl_seconds)
+
+    def acquire(self):
+        """Take or renew the lease. Returns True if this process holds it afterwards."""
+        from django.db import IntegrityError, transaction
+        from django.db.models import Q
+        from django.utils import timezone
+
+        from .models import WorkerLease
+
+        now = timezone.now()
+        expires_at = now + self.ttl
+        renewed = WorkerLease.objects.filter(name=self.name).filter(
+            Q(holder=self.holder) | Q(expires_at__lt=now)
+        ).update(holder=self.holder, expires_at=expires_at)
+        if renewed:
+            _held_leases.add(self)
+            return True
+        try:
+            with transaction.atomic():
+                WorkerLease.objects.create(name=self.name, holder=self.holder, expires_at=expires_at)
+            logger.info("Acquired %s lease as %s", self.name, self.holder)
+            _held_leases.add(self)
+            return True
+        except IntegrityError:
+            _held_leases.discard(self)
+            return False
+
+    def release(self):
+        """Give the lease up immediately (e.g. on shutdown) so a standby can take over."""
+        from .models import WorkerLease
+
+        _held_leases.discard(self)
+        WorkerLease.objects.filter(name=self.name, holder=self.holder).delete()
+
+
+@atexit.register
+def _release_held_leases():
+    for lease in list(_held_leases):
+        try:
+            lease.release()
+        except Exception as e:
+            logger.debug("Releasing %s lease at exit failed: %s", lease.name, e)